@@ -0,0 +1 @@
+"""AIMS performance benchmarks."""
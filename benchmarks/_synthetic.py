@@ -0,0 +1,50 @@
+"""Synthetic manifest generators for benchmarks."""
+
+from openattribution.aims import AIManifest
+from openattribution.aims.layers import ContentAccessLayer, DeploymentLayer, FoundationLayer
+from openattribution.aims.layers.content_access import LicensedSource
+from openattribution.aims.layers.deployment import BrandAffiliation
+from openattribution.aims.layers.foundation import DatasetReference
+
+
+def make_manifest(
+    index: int = 0, sources: int = 10, datasets: int = 10, brands: int = 2
+) -> AIManifest:
+    """Build a manifest with the given number of detailed list entries."""
+    return AIManifest(
+        did=f"did:aims:web:example{index}.com:agent",
+        foundation=FoundationLayer(
+            training_datasets=[f"dataset:corpus-{i}" for i in range(datasets)],
+            dataset_details=[
+                DatasetReference(
+                    identifier=f"dataset:corpus-{i}",
+                    license="CC-BY-4.0",
+                    rsl_compliant=i % 2 == 0,
+                    merkle_root=f"sha256:{i:064x}",
+                )
+                for i in range(datasets)
+            ],
+            rsl_compliance=True,
+            licensing_summary="Licensed and public-domain corpora",
+        ),
+        deployment=DeploymentLayer(
+            operator=f"Operator {index}",
+            brand_affiliations=[
+                BrandAffiliation(brand=f"Brand {i}", relationship="partner", influence_type="boost")
+                for i in range(brands)
+            ],
+            domain_specialization=["e-commerce"],
+        ),
+        content_access=ContentAccessLayer(
+            licensed_sources=[f"source:publisher-{i}" for i in range(sources)],
+            source_details=[
+                LicensedSource(
+                    identifier=f"source:publisher-{i}",
+                    license_type="granted",
+                    scope="full",
+                    expires_at="2030-01-01T00:00:00Z",
+                )
+                for i in range(sources)
+            ],
+        ),
+    )
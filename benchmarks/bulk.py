@@ -0,0 +1,79 @@
+"""NDJSON bulk import/export throughput and peak memory as the file grows.
+
+Compares the streaming reader against loading every line and calling
+``AIManifest.model_validate`` on parsed JSON, for plain and gzip files.
+Peak memory is the traced Python heap while draining the reader, so it
+should stay flat as the manifest count grows.
+
+Usage:
+    python -m benchmarks.bulk [--sizes 1000,10000,50000] [--workers N]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+from openattribution.aims import AIManifest
+from openattribution.aims.bulk import read_manifests, write_manifests
+
+from ._synthetic import make_manifest
+
+
+def _naive(path: Path) -> int:
+    with open(path, "rb") as file:
+        manifests = [AIManifest.model_validate(json.loads(line)) for line in file]
+    return len(manifests)
+
+
+def run(
+    sizes: tuple[int, ...] = (1_000, 10_000, 50_000), workers: int = 1
+) -> dict[str, dict[str, float]]:
+    """Write and read ``size`` manifests, reporting manifests/s and peak heap."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            manifests = (make_manifest(i, sources=5, datasets=5) for i in range(size))
+            plain, packed = Path(tmp, f"{size}.ndjson"), Path(tmp, f"{size}.ndjson.gz")
+            start = time.perf_counter()
+            write_manifests(manifests, plain)
+            write_per_s = size / (time.perf_counter() - start)
+            write_manifests(read_manifests(plain), packed)
+
+            timings = {}
+            for name, path in (("plain", plain), ("gzip", packed)):
+                start = time.perf_counter()
+                deque(read_manifests(path, workers=workers), maxlen=0)
+                timings[f"read_{name}_per_s"] = size / (time.perf_counter() - start)
+            start = time.perf_counter()
+            _naive(plain)
+            timings["naive_load_per_s"] = size / (time.perf_counter() - start)
+
+            # tracemalloc slows allocation down, so peak memory gets its own read.
+            tracemalloc.start()
+            deque(read_manifests(packed, workers=workers), maxlen=0)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[str(size)] = {
+                "write_per_s": write_per_s,
+                **timings,
+                "read_peak_heap_mib": peak / 2**20,
+                "file_mib": plain.stat().st_size / 2**20,
+            }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    sizes = tuple(int(size) for size in args.sizes.split(","))
+    print(json.dumps(run(sizes, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
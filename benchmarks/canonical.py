@@ -0,0 +1,53 @@
+"""Canonical manifest encoding throughput vs. naive sorted json.dumps.
+
+Usage:
+    python -m benchmarks.canonical [--sizes 10,100,1000,5000]
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+from openattribution.aims import AIManifest
+
+from ._synthetic import make_manifest
+
+
+def _per_second(fn: Callable[[], object], min_time: float = 0.5) -> float:
+    runs = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time:
+        fn()
+        runs += 1
+    return runs / elapsed
+
+
+def _naive(manifest: AIManifest) -> bytes:
+    return json.dumps(manifest.model_dump(mode="json"), sort_keys=True).encode()
+
+
+def run(sizes: tuple[int, ...] = (10, 100, 1000, 5000)) -> dict[str, dict[str, float]]:
+    """Measure encodes per second for manifests with ``size`` sources and datasets."""
+    results = {}
+    for size in sizes:
+        manifest = make_manifest(sources=size, datasets=size)
+        _ = manifest.content_hash  # warm the memo for the memoized measurement
+        results[str(size)] = {
+            "naive_per_s": _per_second(lambda m=manifest: _naive(m)),
+            "canonical_per_s": _per_second(manifest.canonical_json),
+            "memoized_hash_per_s": _per_second(lambda m=manifest: m.content_hash),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000,5000")
+    args = parser.parse_args()
+    sizes = tuple(int(size) for size in args.sizes.split(","))
+    print(json.dumps(run(sizes), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Hot-path latency for models, DIDs, the store client and signatures.
+
+Covers ``AIManifest`` validation and serialization across manifest sizes,
+``AIMSDID.parse`` (memoized and uncached), ``ManifestStore.resolve`` and
+``publish`` over an in-process stand-in transport, and Ed25519 signing and
+verification. Each figure is the best of several timed repeats with garbage
+collection disabled, so runs on one machine are comparable.
+
+Usage:
+    python -m benchmarks.core [--sizes 1 10 100] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import timeit
+from collections.abc import Callable
+
+import httpx
+
+from openattribution.aims import AIMSDID, AIManifest, ManifestStore
+from openattribution.aims.crypto import ManifestVerifier, generate_keypair
+
+from ._synthetic import make_manifest
+
+DID = "did:aims:web:example.com:agent"
+
+
+def _us(fn: Callable[[], object], repeat: int, number: int) -> float:
+    """Best per-call time in microseconds over ``repeat`` runs of ``number`` calls."""
+    return min(timeit.repeat(fn, repeat=repeat, number=number)) / number * 1e6
+
+
+def _models(size: int, repeat: int) -> dict[str, float]:
+    manifest = make_manifest(sources=size, datasets=size, brands=size)
+    data = manifest.model_dump()
+    body = manifest.model_dump_json()
+    number = max(10, 2_000 // size)
+    return {
+        "model_validate_us": _us(lambda: AIManifest.model_validate(data), repeat, number),
+        "model_validate_json_us": _us(lambda: AIManifest.model_validate_json(body), repeat, number),
+        "model_dump_us": _us(manifest.model_dump, repeat, number),
+        "model_dump_json_us": _us(manifest.model_dump_json, repeat, number),
+        "json_bytes": len(body),
+    }
+
+
+def _dids(repeat: int) -> dict[str, float]:
+    parse = AIMSDID.parse
+    uncached = AIMSDID.parse.__func__.__wrapped__
+    dids = [f"did:aims:web:example{i}.com:agent-{i}" for i in range(1_000)]
+
+    def parse_all() -> None:
+        for did in dids:
+            uncached(AIMSDID, did)
+
+    parse(DID)
+    return {
+        "parse_cached_ns": _us(lambda: parse(DID), repeat, 100_000) * 1e3,
+        "parse_uncached_ns": _us(parse_all, repeat, 10) / len(dids) * 1e3,
+    }
+
+
+async def _store(repeat: int) -> dict[str, float]:
+    body = make_manifest(sources=10, datasets=10).model_dump_json().encode()
+    manifest = AIManifest.model_validate_json(body)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(201, json={"did": manifest.did})
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+    async def timed(call: Callable[[], object], number: int) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = timeit.default_timer()
+            for _ in range(number):
+                await call()
+            best = min(best, timeit.default_timer() - start)
+        return best / number * 1e6
+
+    async with ManifestStore("http://store.test", transport=httpx.MockTransport(handler)) as store:
+        await store.resolve(manifest.did)
+        return {
+            "resolve_us": await timed(lambda: store.resolve(manifest.did), 500),
+            "publish_us": await timed(lambda: store.publish(manifest), 500),
+        }
+
+
+def _crypto(repeat: int) -> dict[str, float]:
+    private_key, public_key = generate_keypair()
+    manifest = make_manifest(sources=10, datasets=10)
+    manifest.sign(private_key)
+
+    def verify_uncached() -> None:
+        ManifestVerifier().verify(manifest, public_key)
+
+    cached = ManifestVerifier()
+    cached.verify(manifest, public_key)
+    return {
+        "sign_us": _us(lambda: manifest.sign(private_key), repeat, 200),
+        "verify_us": _us(verify_uncached, repeat, 200),
+        "verify_cached_us": _us(lambda: cached.verify(manifest, public_key), repeat, 2_000),
+    }
+
+
+def run(sizes: tuple[int, ...] = (1, 10, 100), repeat: int = 5) -> dict[str, dict]:
+    """Measure every hot path, with models at each list ``size``."""
+    return {
+        "models": {str(size): _models(size, repeat) for size in sizes},
+        "did": _dids(repeat),
+        "store": asyncio.run(_store(repeat)),
+        "crypto": _crypto(repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(tuple(args.sizes), args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Delta publishing: bytes sent and round-trip latency, full publish vs. JSON Patch.
+
+Each update appends one licensed source and bumps ``updated_at`` on a
+manifest with ``size`` sources and datasets, then publishes it to the
+reference server over an in-process transport, once with ``publish`` and
+once with ``publish_delta``.
+
+Usage:
+    python -m benchmarks.delta [--sizes 10,100,1000] [--updates 50]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import UTC, datetime, timedelta
+
+import httpx
+
+from openattribution.aims import AIManifest, ManifestStore
+from openattribution.aims.layers.content_access import LicensedSource
+from openattribution.aims.server import create_app
+
+from ._synthetic import make_manifest
+
+
+class _Counting(httpx.AsyncBaseTransport):
+    """Counts request body bytes sent through an ASGI transport."""
+
+    def __init__(self, app):
+        self.transport = httpx.ASGITransport(app=app)
+        self.sent = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.sent += len(request.content)
+        return await self.transport.handle_async_request(request)
+
+
+def _update(manifest: AIManifest, i: int) -> None:
+    manifest.content_access.source_details.append(
+        LicensedSource(identifier=f"source:update-{i}", license_type="granted")
+    )
+    manifest.updated_at = datetime(2030, 1, 1, tzinfo=UTC) + timedelta(seconds=i)
+
+
+async def _measure(size: int, updates: int, delta: bool) -> dict[str, float]:
+    transport = _Counting(create_app())
+    manifest = make_manifest(sources=size, datasets=size)
+    async with ManifestStore("http://store.test", transport=transport) as store:
+        await store.publish(manifest)
+        transport.sent = 0
+        start = time.perf_counter()
+        for i in range(updates):
+            _update(manifest, i)
+            await (store.publish_delta(manifest) if delta else store.publish(manifest))
+        elapsed = time.perf_counter() - start
+    return {"bytes_per_update": transport.sent / updates, "update_us": elapsed / updates * 1e6}
+
+
+def run(sizes: tuple[int, ...] = (10, 100, 1000), updates: int = 50) -> dict[str, dict]:
+    """Publish ``updates`` edits per size, in full and as patches."""
+    results = {}
+    for size in sizes:
+        full = asyncio.run(_measure(size, updates, delta=False))
+        patch = asyncio.run(_measure(size, updates, delta=True))
+        results[str(size)] = {
+            "full_bytes": full["bytes_per_update"],
+            "delta_bytes": patch["bytes_per_update"],
+            "full_publish_us": full["update_us"],
+            "delta_publish_us": patch["update_us"],
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--updates", type=int, default=50)
+    args = parser.parse_args()
+    sizes = tuple(int(size) for size in args.sizes.split(","))
+    print(json.dumps(run(sizes, args.updates), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Fleet compliance queries: looping over manifests vs. a columnar snapshot.
+
+Runs two §11.3-style reports over a synthetic fleet:
+
+- ``risky``: systems with ``rsl_compliance=False`` and an unrestricted
+  redistribution policy
+- ``expiring``: licensed sources expiring in the next 30 days
+
+They run three ways: as a loop over ``AIManifest`` objects, over a
+:class:`FleetSnapshot` built in memory, and over the same snapshot
+memory-mapped from disk. The build figure includes computing each
+manifest's content hash. Memory is what ``tracemalloc`` sees still
+allocated once each representation has been built. The snapshot is built
+from a generator, so its figure does not include the manifests.
+
+Usage:
+    python -m benchmarks.fleet [--fleet 20000] [--sources 20]
+"""
+
+import argparse
+import gc
+import json
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from openattribution.aims import AIManifest
+from openattribution.aims.fleet import FleetSnapshot
+from openattribution.aims.layers.content_access import RedistributionPolicy
+from openattribution.aims.policy import parse_expiry
+
+from ._synthetic import make_manifest
+
+NOW = datetime(2029, 12, 20, tzinfo=UTC)
+SOON = NOW + timedelta(days=30)
+
+
+def _fleet(size: int, sources: int) -> Iterator[AIManifest]:
+    for i in range(size):
+        manifest = make_manifest(i, sources=sources, datasets=5)
+        for j, detail in enumerate(manifest.content_access.source_details):
+            detail.expires_at = f"{2030 + (i + j) % 20}-01-01T00:00:00Z"
+        if i % 10 == 0:
+            manifest.foundation.rsl_compliance = False
+            manifest.content_access.redistribution_policy = RedistributionPolicy.UNRESTRICTED
+        yield manifest
+
+
+def _loop(manifests: list[AIManifest]) -> tuple[int, int]:
+    risky = [
+        m.did
+        for m in manifests
+        if not m.foundation.rsl_compliance
+        and m.content_access.redistribution_policy == RedistributionPolicy.UNRESTRICTED
+    ]
+    expiring = [
+        (m.did, detail.identifier)
+        for m in manifests
+        for detail in m.content_access.source_details
+        if NOW <= parse_expiry(detail.expires_at) < SOON
+    ]
+    return len(risky), len(expiring)
+
+
+def _columnar(snapshot: FleetSnapshot) -> tuple[int, int]:
+    systems, sources = snapshot.systems, snapshot.sources
+    risky = systems.eq("rsl_compliance", False) & systems.eq(
+        "redistribution_policy", "unrestricted"
+    )
+    expiring = sources.between("expires_at", NOW, SOON)
+    return len(systems.values("did", risky)), len(sources.values("identifier", expiring))
+
+
+def _ms(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def _allocated(build: Callable[[], object]) -> tuple[object, float]:
+    """Build something and return it with the MiB still allocated afterwards."""
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, current / 2**20
+
+
+def run(fleet: int = 20_000, sources: int = 20) -> dict[str, float | bool]:
+    """Build both representations of a fleet and time the reports over each."""
+    manifests, manifests_mib = _allocated(lambda: list(_fleet(fleet, sources)))
+    _, snapshot_mib = _allocated(lambda: FleetSnapshot.from_manifests(_fleet(fleet, sources)))
+    start = time.perf_counter()
+    snapshot = FleetSnapshot.from_manifests(manifests)
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fleet.snap"
+        save_ms = _ms(lambda: snapshot.save(path), repeat=1)
+        load_ms = _ms(lambda: FleetSnapshot.load(path).close())
+        with FleetSnapshot.load(path) as loaded:
+            results = {
+                "loop_query_ms": _ms(lambda: _loop(manifests)),
+                "columnar_query_ms": _ms(lambda: _columnar(snapshot)),
+                "mapped_query_ms": _ms(lambda: _columnar(loaded)),
+                "agree": _loop(manifests) == _columnar(snapshot) == _columnar(loaded),
+                "manifests_mib": round(manifests_mib, 2),
+                "snapshot_mib": round(snapshot_mib, 2),
+                "file_mib": round(path.stat().st_size / 2**20, 2),
+                "build_us_per_manifest": build_s / fleet * 1e6,
+                "save_ms": save_ms,
+                "load_ms": load_ms,
+            }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet", type=int, default=20_000)
+    parser.add_argument("--sources", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.fleet, args.sources), indent=2))
+
+
+if __name__ == "__main__":
+    main()
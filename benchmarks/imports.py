@@ -0,0 +1,162 @@
+"""Import time and first-use latency of the public API, against a budget.
+
+Each measurement runs in a fresh interpreter so nothing is already cached:
+
+- ``import_us``: cumulative microseconds ``python -X importtime`` reports
+  for each module, the best of ``--repeat`` runs.
+- ``first_use_ms``: wall time from a cold interpreter to the first useful
+  call (importing the name, then constructing or calling it once).
+- ``loaded``: which heavy dependencies the first use pulled in.
+
+With ``--check`` the process exits with status 1 when a first use exceeds
+its budget or loads a dependency it should not, so CI catches regressions.
+Budgets are deliberately loose (several times a warm local run) to absorb
+slow CI machines; the dependency checks are exact.
+
+Usage:
+    python -m benchmarks.imports [--repeat 5] [--check] [--scale 1.0]
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+HEAVY = ("pydantic", "httpx", "cryptography")
+
+# name: (statement run cold, budget in ms, heavy modules it may load)
+CASES: dict[str, tuple[str, float, tuple[str, ...]]] = {
+    "package": ("import openattribution.aims", 20.0, ()),
+    "AIMSDID": (
+        "from openattribution.aims import AIMSDID\nAIMSDID.parse('did:aims:web:example.com:agent')",
+        40.0,
+        (),
+    ),
+    "FoundationLayer": (
+        "from openattribution.aims.layers import FoundationLayer\nFoundationLayer()",
+        400.0,
+        ("pydantic",),
+    ),
+    "AIManifest": (
+        "from openattribution.aims import AIManifest\n"
+        "AIManifest(did='did:aims:web:example.com:agent').content_hash",
+        500.0,
+        ("pydantic",),
+    ),
+    "ManifestCache": (
+        "from openattribution.aims import ManifestCache\nManifestCache()",
+        500.0,
+        ("pydantic",),
+    ),
+    "ManifestStoreConfig": (
+        "from openattribution.aims import ManifestStoreConfig\n"
+        "ManifestStoreConfig(url='http://store.test')",
+        800.0,
+        ("pydantic", "httpx"),
+    ),
+    "ManifestStore": (
+        "from openattribution.aims import ManifestStore\nManifestStore('http://store.test')",
+        800.0,
+        ("pydantic", "httpx"),
+    ),
+    "FederatedResolver": (
+        "from openattribution.aims import FederatedResolver, ManifestStoreConfig\n"
+        "FederatedResolver([ManifestStoreConfig(url='http://store.test')])",
+        800.0,
+        ("pydantic", "httpx"),
+    ),
+    "DIDResolver": (
+        "from openattribution.aims import DIDResolver\nDIDResolver()",
+        900.0,
+        HEAVY,
+    ),
+    "sign": (
+        "from openattribution.aims import AIManifest\n"
+        "from openattribution.aims.crypto import generate_keypair\n"
+        "AIManifest(did='did:aims:web:example.com:agent').sign(generate_keypair()[0])",
+        700.0,
+        ("pydantic", "cryptography"),
+    ),
+}
+
+_PROBE = """\
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, *[m for m in {heavy!r} if m in sys.modules])
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)")
+
+
+def _import_us(module: str) -> int:
+    """Cumulative microseconds ``-X importtime`` reports for ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in reversed(result.stderr.splitlines()):
+        match = _IMPORTTIME.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1))
+    raise RuntimeError(f"No importtime line for {module}")
+
+
+def _first_use(statement: str) -> tuple[float, list[str]]:
+    """Seconds from a cold interpreter to ``statement`` finishing, and heavy modules loaded."""
+    code = _PROBE.format(statement=statement, heavy=HEAVY)
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    elapsed, *loaded = result.stdout.split()
+    return float(elapsed), loaded
+
+
+def run(repeat: int = 5, scale: float = 1.0) -> dict[str, dict]:
+    """Measure every case, the best of ``repeat`` cold runs each."""
+    results: dict[str, dict] = {
+        "import_us": {
+            module: min(_import_us(module) for _ in range(repeat))
+            for module in (
+                "openattribution.aims",
+                "openattribution.aims.did",
+                "openattribution.aims.layers",
+                "openattribution.aims.manifest",
+                "openattribution.aims.store",
+            )
+        },
+        "first_use": {},
+    }
+    for name, (statement, budget_ms, allowed) in CASES.items():
+        runs = [_first_use(statement) for _ in range(repeat)]
+        elapsed = min(seconds for seconds, _ in runs)
+        loaded = runs[0][1]
+        unexpected = sorted(set(loaded) - set(allowed))
+        results["first_use"][name] = {
+            "first_use_ms": round(elapsed * 1e3, 2),
+            "budget_ms": budget_ms * scale,
+            "loaded": loaded,
+            "ok": elapsed * 1e3 <= budget_ms * scale and not unexpected,
+            **({"unexpected": unexpected} if unexpected else {}),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a budget is exceeded")
+    args = parser.parse_args()
+    results = run(args.repeat, args.scale)
+    print(json.dumps(results, indent=2))
+    if args.check and not all(case["ok"] for case in results["first_use"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
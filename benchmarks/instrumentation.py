@@ -0,0 +1,90 @@
+"""Cost of the instrumentation hooks with and without a sink registered.
+
+Times the bare hooks (``span`` and ``count``) against an empty loop, and a
+cached ``ManifestStore.resolve`` plus a fresh network resolve (over an
+in-memory transport) with no sink versus an ``InMemorySink``.
+
+Usage:
+    python -m benchmarks.instrumentation [--iterations 200000]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from openattribution.aims import ManifestCache, ManifestStore, instrumentation
+from openattribution.aims.instrumentation import CACHE_HIT, DECODE, InMemorySink
+
+from ._synthetic import make_manifest
+
+DID = "did:aims:web:example0.com:agent"
+
+
+def _hooks(iterations: int) -> dict[str, float]:
+    span, count = instrumentation.span, instrumentation.count
+    start = time.perf_counter()
+    for _ in range(iterations):
+        pass
+    empty = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with span(DECODE):
+            pass
+    spans = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(iterations):
+        count(CACHE_HIT)
+    counts = time.perf_counter() - start
+    return {
+        "span_ns": (spans - empty) / iterations * 1e9,
+        "count_ns": (counts - empty) / iterations * 1e9,
+    }
+
+
+async def _resolves(iterations: int) -> dict[str, float]:
+    body = make_manifest(0).model_dump_json().encode()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    cache = ManifestCache()
+    async with ManifestStore("http://store.test", transport=transport, cache=cache) as store:
+        await store.resolve(DID)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await store.resolve(DID)
+        cached = (time.perf_counter() - start) / iterations
+
+        fetches = max(iterations // 100, 10)
+        start = time.perf_counter()
+        for _ in range(fetches):
+            cache.invalidate(DID)
+            await store.resolve(DID)
+        fetched = (time.perf_counter() - start) / fetches
+    return {"cached_resolve_us": cached * 1e6, "network_resolve_us": fetched * 1e6}
+
+
+def run(iterations: int = 200_000) -> dict[str, dict[str, float]]:
+    """Measure hook and resolve costs, disabled and then enabled."""
+    results = {"disabled": {**_hooks(iterations), **asyncio.run(_resolves(iterations // 10))}}
+    sink = InMemorySink()
+    instrumentation.add_sink(sink)
+    try:
+        results["in_memory_sink"] = {
+            **_hooks(iterations),
+            **asyncio.run(_resolves(iterations // 10)),
+        }
+    finally:
+        instrumentation.remove_sink(sink)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Lazy manifest views vs. full validation for a large in-memory cache.
+
+Loads ``count`` manifest bodies three ways: full ``AIManifest`` validation,
+``LazyManifest`` reading only ``did`` and the redistribution policy (the
+router hot path), and ``LazyManifest`` with every layer touched through a
+shared ``InternPool``. Reports load latency per manifest and the traced
+Python heap held per manifest, excluding the bodies themselves (a cache
+keeps those in every case).
+
+Usage:
+    python -m benchmarks.lazy [--count 100000]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from openattribution.aims import AIManifest
+from openattribution.aims.lazy import InternPool, LazyManifest
+
+from ._synthetic import make_manifest
+
+
+def _full(body: bytes) -> object:
+    manifest = AIManifest.model_validate_json(body)
+    return manifest.did, manifest.content_access.redistribution_policy, manifest
+
+
+def _hot_path(body: bytes) -> object:
+    view = LazyManifest(body)
+    return view.did, view.redistribution_policy, view
+
+
+def _all_layers(pool: InternPool) -> Callable[[bytes], object]:
+    def load(body: bytes) -> object:
+        view = LazyManifest(body, pool=pool)
+        return view.foundation, view.deployment, view.content_access, view
+
+    return load
+
+
+def _measure(load: Callable[[bytes], object], bodies: list[bytes]) -> dict[str, float]:
+    gc.collect()
+    start = time.perf_counter()
+    held = [load(body) for body in bodies]
+    elapsed = time.perf_counter() - start
+    del held
+    gc.collect()
+    # tracemalloc slows allocation down, so memory gets its own pass.
+    tracemalloc.start()
+    held = [load(body) for body in bodies]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return {
+        "load_us": elapsed / len(bodies) * 1e6,
+        "heap_bytes_per_manifest": retained / len(bodies),
+    }
+
+
+def run(count: int = 100_000) -> dict[str, dict[str, float]]:
+    """Load ``count`` manifests with each strategy."""
+    bodies = [
+        make_manifest(i, sources=5, datasets=5).model_dump_json().encode() for i in range(count)
+    ]
+    pool = InternPool()
+    results = {
+        "full": _measure(_full, bodies),
+        "lazy_hot_path": _measure(_hot_path, bodies),
+        "lazy_all_layers_pooled": _measure(_all_layers(pool), bodies),
+    }
+    results["lazy_all_layers_pooled"]["pool_hits"] = pool.hits
+    results["body_bytes_per_manifest"] = {"mean": sum(map(len, bodies)) / count}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.count), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Lineage queries through the inverted index vs. scanning every manifest.
+
+Builds a forest of base models, each with a chain of fine-tunes, then asks
+which systems used a base dataset directly or through a parent model.
+
+Usage:
+    python -m benchmarks.lineage [--systems 50000] [--depth 4]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from openattribution.aims import AIManifest
+from openattribution.aims.layers import FoundationLayer
+from openattribution.aims.lineage import LineageIndex, manifest_datasets
+
+
+def _manifests(systems: int, depth: int) -> list[AIManifest]:
+    manifests = []
+    for i in range(systems):
+        parent = None if i % depth == 0 else f"did:aims:web:example{i - 1}.com:agent"
+        manifests.append(
+            AIManifest(
+                did=f"did:aims:web:example{i}.com:agent",
+                foundation=FoundationLayer(
+                    training_datasets=[f"dataset:corpus-{i % 500}", f"dataset:private-{i}"],
+                    parent_model=parent,
+                ),
+            )
+        )
+    return manifests
+
+
+def _scan(manifests: list[AIManifest], dataset: str) -> set[str]:
+    """Transitive users by repeated full scans, as without an index."""
+    by_did = {m.did: m for m in manifests}
+    found = set()
+    for manifest in manifests:
+        current: AIManifest | None = manifest
+        seen = set()
+        while current is not None and current.did not in seen:
+            seen.add(current.did)
+            if dataset in manifest_datasets(current):
+                found.add(manifest.did)
+                break
+            parent = current.foundation.parent_model
+            current = by_did.get(parent) if parent else None
+    return found
+
+
+def run(systems: int = 50_000, depth: int = 4) -> dict[str, float]:
+    """Index ``systems`` manifests and time transitive queries."""
+    manifests = _manifests(systems, depth)
+    dataset = "dataset:corpus-0"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "lineage.db")
+        start = time.perf_counter()
+        with LineageIndex(path) as index:
+            index.add_many(manifests)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = LineageIndex(path)
+        reopen_s = time.perf_counter() - start
+
+        queries = 1000
+        start = time.perf_counter()
+        for _ in range(queries):
+            result = index.systems_using(dataset)
+        query_us = (time.perf_counter() - start) / queries * 1e6
+        index.close()
+
+    start = time.perf_counter()
+    assert _scan(manifests, dataset) == result
+    scan_ms = (time.perf_counter() - start) * 1e3
+    return {
+        "systems": systems,
+        "matches": len(result),
+        "build_s": build_s,
+        "reopen_s": reopen_s,
+        "indexed_query_us": query_us,
+        "scan_query_ms": scan_ms,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--systems", type=int, default=50_000)
+    parser.add_argument("--depth", type=int, default=4)
+    args = parser.parse_args()
+    print(json.dumps(run(args.systems, args.depth), indent=2))
+
+
+if __name__ == "__main__":
+    main()
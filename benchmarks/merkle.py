@@ -0,0 +1,70 @@
+"""Merkle index build throughput and peak memory as the leaf count grows.
+
+Peak memory is the parent process's traced Python heap; record files are
+read through mmap and leaf digests stream straight to the index file, so it
+should stay flat as the corpus grows.
+
+Usage:
+    python -m benchmarks.merkle [--sizes 10000,100000,1000000] [--workers N]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from openattribution.aims.crypto import build_index
+
+
+def _write_records(path: Path, count: int) -> None:
+    with open(path, "wb") as file:
+        for start in range(0, count, 100_000):
+            stop = min(count, start + 100_000)
+            file.write(b"".join(b"record-%d:training-text\n" % i for i in range(start, stop)))
+
+
+def run(
+    sizes: tuple[int, ...] = (10_000, 100_000, 1_000_000), workers: int | None = None
+) -> dict[str, dict[str, float]]:
+    """Build an index per size, reporting records/s, peak heap and proof latency."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            records = Path(tmp, f"records-{size}.txt")
+            _write_records(records, size)
+            start = time.perf_counter()
+            index = build_index([records], Path(tmp, f"tree-{size}.idx"), workers=workers)
+            elapsed = time.perf_counter() - start
+            index.close()
+            # tracemalloc slows allocation down, so peak memory gets its own build.
+            tracemalloc.start()
+            index = build_index([records], Path(tmp, f"tree-{size}.idx"), workers=workers)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with index:
+                proof_start = time.perf_counter()
+                for i in range(0, size, max(1, size // 1000)):
+                    index.proof(i)
+                proofs = len(range(0, size, max(1, size // 1000)))
+                proof_us = (time.perf_counter() - proof_start) / proofs * 1e6
+            results[str(size)] = {
+                "records_per_s": size / elapsed,
+                "peak_heap_mib": peak / 2**20,
+                "proof_us": proof_us,
+            }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    sizes = tuple(int(size) for size in args.sizes.split(","))
+    print(json.dumps(run(sizes, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
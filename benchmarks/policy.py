@@ -0,0 +1,93 @@
+"""Trust-policy decisions per second over a fleet of manifests.
+
+Compares a hand-written scan of the manifest lists (the pre-policy-engine
+approach) with the compiled policy over precomputed facts.
+
+Usage:
+    python -m benchmarks.policy [--fleet 10000] [--sources 50]
+"""
+
+import argparse
+import json
+import time
+from datetime import UTC, datetime
+
+from openattribution.aims import AIManifest
+from openattribution.aims.layers.content_access import RedistributionPolicy
+from openattribution.aims.policy import (
+    HoldsLicense,
+    MinRedistribution,
+    NoBrandAffiliation,
+    Policy,
+)
+
+from ._synthetic import make_manifest
+
+SOURCE = "source:publisher-7"
+ALLOWED = {RedistributionPolicy.ATTRIBUTED, RedistributionPolicy.UNRESTRICTED}
+
+
+def _naive(manifest: AIManifest, now: datetime) -> bool:
+    access = manifest.content_access
+    if access.redistribution_policy not in ALLOWED:
+        return False
+    licensed = SOURCE in access.licensed_sources
+    for detail in access.source_details:
+        if detail.identifier == SOURCE and detail.expires_at is not None:
+            licensed = datetime.fromisoformat(detail.expires_at) > now
+    if not licensed:
+        return False
+    return not any(a.influence_type == "exclusive" for a in manifest.deployment.brand_affiliations)
+
+
+def run(fleet: int = 10_000, sources: int = 50) -> dict[str, float]:
+    """Measure decisions per second for each approach."""
+    manifests = [make_manifest(i, sources=sources, datasets=5) for i in range(fleet)]
+    for manifest in manifests:
+        manifest.content_access.redistribution_policy = RedistributionPolicy.ATTRIBUTED
+    now = datetime.now(UTC)
+    policy = Policy(
+        rules=[
+            MinRedistribution(policy="attributed"),
+            HoldsLicense(source=SOURCE),
+            NoBrandAffiliation(influence_type="exclusive"),
+        ]
+    ).compile()
+
+    start = time.perf_counter()
+    naive = [_naive(manifest, now) for manifest in manifests]
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    policy.evaluate_many(manifests, now)
+    cold_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decisions = policy.evaluate_many(manifests, now)
+    warm_time = time.perf_counter() - start
+
+    facts = [policy.facts(manifest) for manifest in manifests]
+    start = time.perf_counter()
+    for item in facts:
+        policy.allows(item, now)
+    facts_time = time.perf_counter() - start
+
+    assert naive == [d.allowed for d in decisions]
+    return {
+        "naive_per_s": fleet / naive_time,
+        "compiled_cold_per_s": fleet / cold_time,
+        "compiled_warm_per_s": fleet / warm_time,
+        "compiled_facts_allows_per_s": fleet / facts_time,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fleet", type=int, default=10_000)
+    parser.add_argument("--sources", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.fleet, args.sources), indent=2))
+
+
+if __name__ == "__main__":
+    main()
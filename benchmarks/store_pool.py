@@ -0,0 +1,97 @@
+"""Per-resolve latency: pooled ManifestStore client vs. a client per call.
+
+Runs a local stand-in manifest store over real TCP so connection setup is
+included in the measurement.
+
+Usage:
+    python -m benchmarks.store_pool [--requests N]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from openattribution.aims import AIManifest, ManifestStore
+
+DID = "did:aims:web:example.com:agent"
+BODY = AIManifest(did=DID).model_dump_json().encode()
+
+
+class _StandInStore(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+async def _per_call(base_url: str) -> AIManifest:
+    """The pre-pooling behaviour: a fresh AsyncClient for every resolve."""
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.get(f"{base_url}/manifests/{DID}")
+        response.raise_for_status()
+        return AIManifest.model_validate(response.json())
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p99_ms": samples[int(len(samples) * 0.99) - 1] * 1000,
+    }
+
+
+async def _measure(base_url: str, requests: int) -> dict[str, dict[str, float]]:
+    per_call: list[float] = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await _per_call(base_url)
+        per_call.append(time.perf_counter() - start)
+
+    pooled: list[float] = []
+    async with ManifestStore(base_url) as store:
+        await store.resolve(DID)  # warm the pool
+        for _ in range(requests):
+            start = time.perf_counter()
+            await store.resolve(DID)
+            pooled.append(time.perf_counter() - start)
+
+    return {"per_call": _summary(per_call), "pooled": _summary(pooled)}
+
+
+def run(requests: int = 500) -> dict[str, dict[str, float]]:
+    """Run the benchmark against a local stand-in store."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInStore)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        return asyncio.run(_measure(f"http://{host}:{port}", requests))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
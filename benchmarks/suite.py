@@ -0,0 +1,222 @@
+"""Run the benchmark suite to a JSON file, or compare two runs for regressions.
+
+``run`` executes every benchmark module (or those named with ``--only``)
+with parameters sized to finish in a few minutes on a laptop, and writes
+one JSON document holding the results plus the environment they were
+measured in. Everything runs offline: stores are in-process or on
+loopback, and inputs come from the synthetic generators.
+
+``compare`` flattens two such documents to ``benchmark.path.metric`` keys
+and reports each metric that moved by more than ``--threshold`` in the
+wrong direction. The direction comes from the metric's unit suffix:
+``*_per_s`` is higher-is-better; ``*_ns``, ``*_us``, ``*_ms``, ``*_s``,
+``*_bytes`` and ``*_mib`` are lower-is-better; a boolean going from true
+to false is always a regression. Other values (counts, settings) are not
+compared. The exit status is 1 if anything regressed.
+
+Timings are only comparable between runs on the same idle machine and
+interpreter; ``compare`` warns when the recorded machine types differ.
+
+Usage:
+    python -m benchmarks.suite run [--only core wire] [--output results.json]
+    python -m benchmarks.suite compare base.json new.json [--threshold 0.1]
+"""
+
+import argparse
+import fnmatch
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+# Benchmark module -> keyword arguments for a suite-sized run
+BENCHMARKS: dict[str, dict[str, Any]] = {
+    "core": {},
+    "canonical": {"sizes": (10, 100, 1000)},
+    "wire": {"sizes": (10, 100)},
+    "delta": {"sizes": (10, 100), "updates": 20},
+    "lazy": {"count": 10_000},
+    "store_pool": {"requests": 200},
+    "instrumentation": {"iterations": 100_000},
+    "imports": {"repeat": 3},
+    "policy": {"fleet": 2_000},
+    "lineage": {"systems": 5_000},
+    "fleet": {"fleet": 5_000},
+    "bulk": {"sizes": (2_000,)},
+    "merkle": {"sizes": (10_000, 100_000)},
+    "attestation": {"count": 2_000},
+}
+
+HIGHER_IS_BETTER = ("_per_s",)
+LOWER_IS_BETTER = ("_ns", "_us", "_ms", "_s", "_bytes", "_mib")
+
+
+def environment() -> dict[str, Any]:
+    """Describe the interpreter and machine a run was measured on."""
+    from openattribution.aims import __version__
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count()
+    return {
+        "aims_version": __version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": cpus,
+        "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+    }
+
+
+def run(only: list[str] | None = None, progress: bool = False) -> dict[str, Any]:
+    """Run the selected benchmarks and return the suite document."""
+    names = only or list(BENCHMARKS)
+    unknown = sorted(set(names) - set(BENCHMARKS))
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+    document: dict[str, Any] = {"environment": environment(), "seconds": {}, "results": {}}
+    for name in names:
+        if progress:
+            print(f"running {name}...", file=sys.stderr, flush=True)
+        module = importlib.import_module(f".{name}", __package__)
+        start = time.perf_counter()
+        document["results"][name] = module.run(**BENCHMARKS[name])
+        document["seconds"][name] = round(time.perf_counter() - start, 2)
+    return document
+
+
+def flatten(results: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten nested results to ``a.b.metric`` keys, keeping only leaf values."""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def direction(metric: str) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if not compared.
+
+    The unit is taken from the innermost key that has one, so a mapping such
+    as ``import_us.<module>`` applies to each of its entries.
+    """
+    for name in reversed(metric.split(".")):
+        if name.startswith("budget_"):
+            return 0
+        if any(suffix in name for suffix in HIGHER_IS_BETTER):
+            return 1
+        if name.endswith(LOWER_IS_BETTER):
+            return -1
+    return 0
+
+
+def compare(
+    base: dict[str, Any],
+    new: dict[str, Any],
+    threshold: float = 0.1,
+    ignore: list[str] | None = None,
+) -> dict[str, Any]:
+    """Compare two suite documents metric by metric.
+
+    Args:
+        base: The reference run
+        new: The run under test
+        threshold: Relative change tolerated before a metric is flagged
+        ignore: ``fnmatch`` patterns of metrics to skip
+
+    Returns:
+        Regressions and improvements (each with base, new and relative
+        change), the number of unchanged metrics, and benchmarks present in
+        only one run
+    """
+    shared = base["results"].keys() & new["results"].keys()
+    before = flatten({name: base["results"][name] for name in shared})
+    after = flatten({name: new["results"][name] for name in shared})
+    report: dict[str, Any] = {
+        "regressions": {},
+        "improvements": {},
+        "unchanged": 0,
+        "only_in_base": sorted(base["results"].keys() - shared),
+        "only_in_new": sorted(new["results"].keys() - shared),
+    }
+    if base.get("environment", {}).get("machine") != new.get("environment", {}).get("machine"):
+        report["warning"] = "Runs were measured on different machine types"
+    for metric in sorted(before.keys() & after.keys()):
+        if ignore and any(fnmatch.fnmatchcase(metric, pattern) for pattern in ignore):
+            continue
+        old, value = before[metric], after[metric]
+        if isinstance(old, bool) or isinstance(value, bool):
+            if old is True and value is False:
+                report["regressions"][metric] = {"base": old, "new": value}
+            continue
+        sign = direction(metric)
+        if not sign or not isinstance(old, int | float) or not isinstance(value, int | float):
+            continue
+        if old <= 0:
+            continue
+        change = (value - old) / old
+        entry = {"base": old, "new": value, "change": round(change, 4)}
+        if change * sign < -threshold:
+            report["regressions"][metric] = entry
+        elif change * sign > threshold:
+            report["improvements"][metric] = entry
+        else:
+            report["unchanged"] += 1
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the suite")
+    run_parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), metavar="NAME")
+    run_parser.add_argument("--output", type=Path, help="Write JSON here instead of stdout")
+    compare_parser = commands.add_parser("compare", help="Flag regressions between two runs")
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("new", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    compare_parser.add_argument("--ignore", nargs="+", metavar="PATTERN")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        document = json.dumps(run(args.only, progress=True), indent=2)
+        if args.output is None:
+            print(document)
+        else:
+            args.output.write_text(document + "\n")
+        return
+    report = compare(
+        json.loads(args.base.read_text()),
+        json.loads(args.new.read_text()),
+        args.threshold,
+        args.ignore,
+    )
+    print(json.dumps(report, indent=2))
+    if report["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Binary wire format vs. JSON: bytes on the wire and encode/decode latency.
+
+Usage:
+    python -m benchmarks.wire [--sizes 10,100,1000]
+"""
+
+import argparse
+import gzip
+import json
+import time
+from collections.abc import Callable
+
+from openattribution.aims import AIManifest
+from openattribution.aims.wire import decode_manifest, encode_manifest
+
+from ._synthetic import make_manifest
+
+
+def _microseconds(fn: Callable[[], object], min_time: float = 0.3) -> float:
+    runs = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time:
+        fn()
+        runs += 1
+    return elapsed / runs * 1e6
+
+
+def run(sizes: tuple[int, ...] = (10, 100, 1000)) -> dict[str, dict[str, float]]:
+    """Compare formats for manifests with ``size`` sources and datasets."""
+    results = {}
+    for size in sizes:
+        manifest = make_manifest(sources=size, datasets=size)
+        json_body = manifest.model_dump_json().encode()
+        binary_body = encode_manifest(manifest)
+        assert decode_manifest(binary_body).content_hash == manifest.content_hash
+        results[str(size)] = {
+            "json_bytes": len(json_body),
+            "binary_bytes": len(binary_body),
+            "json_gzip_bytes": len(gzip.compress(json_body)),
+            "binary_gzip_bytes": len(gzip.compress(binary_body)),
+            "json_encode_us": _microseconds(manifest.model_dump_json),
+            "binary_encode_us": _microseconds(lambda m=manifest: encode_manifest(m)),
+            "json_decode_us": _microseconds(lambda b=json_body: AIManifest.model_validate_json(b)),
+            "binary_decode_us": _microseconds(lambda b=binary_body: decode_manifest(b)),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000")
+    args = parser.parse_args()
+    sizes = tuple(int(size) for size in args.sizes.split(","))
+    print(json.dumps(run(sizes), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,52 @@ Licensing provenance, runtime access rights, and agent-to-agent trust for AI sys
 Usage:
     from openattribution.aims import AIManifest, AIMSDID, ManifestStore
     from openattribution.aims.layers import FoundationLayer, ContentAccessLayer
+
+Exports are imported on first use, so ``AIMSDID`` does not pull in pydantic
+and ``AIManifest`` does not pull in httpx or the crypto backend.
 """
 
-from .manifest import AIManifest
-from .store import ManifestStore
-from .did import AIMSDID
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cache import ManifestCache
+    from .did import AIMSDID
+    from .federation import FederatedResolver
+    from .manifest import AIManifest
+    from .resolution import DIDResolver
+    from .store import ManifestStore, ManifestStoreConfig
 
 __version__ = "0.1.0"
-__all__ = ["AIManifest", "ManifestStore", "AIMSDID"]
+__all__ = [
+    "AIManifest",
+    "ManifestStore",
+    "ManifestStoreConfig",
+    "ManifestCache",
+    "FederatedResolver",
+    "AIMSDID",
+    "DIDResolver",
+]
+
+_EXPORTS = {
+    "AIManifest": ".manifest",
+    "ManifestStore": ".store",
+    "ManifestStoreConfig": ".store",
+    "ManifestCache": ".cache",
+    "FederatedResolver": ".federation",
+    "AIMSDID": ".did",
+    "DIDResolver": ".resolution",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
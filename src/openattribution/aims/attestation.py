@@ -0,0 +1,393 @@
+"""Attestations - Signed identity proofs for the agent handshake.
+
+SPECIFICATION.md §8.2: during a handshake an agent presents an attestation
+signed with its DID key, carrying its DID, the current time, the hash of
+its current manifest and a nonce. The verifier checks the signature, the
+freshness of the timestamp and that the nonce has not been seen before.
+
+§8.6 Q4 leaves open whether to verify per request, per session or per
+time window. :class:`AttestationVerifier` supports all three: every call to
+:meth:`~AttestationVerifier.verify` is a full check, and the resulting
+:class:`Session` is cached so callers that verify per session or window can
+reuse it via :meth:`~AttestationVerifier.session` or
+:meth:`~AttestationVerifier.authenticate` until the attestation's freshness
+window ends.
+
+Example:
+    attestation = create_attestation(manifest, private_key)
+    session = verifier.verify(attestation, public_key)
+    manifest = await resolve_attested(store, session)
+"""
+
+import base64
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+from pydantic_core import to_json
+
+from .crypto import PublicKeyCache, default_verifier, sign_bytes, verify_bytes
+from .manifest import AIManifest
+
+if TYPE_CHECKING:
+    from .resolution import DIDResolver
+    from .store import ManifestStore
+
+NONCE_BYTES = 16
+
+
+class AttestationError(ValueError):
+    """An attestation failed verification."""
+
+
+class ReplayCacheFullError(AttestationError):
+    """The replay cache is full, so a fresh nonce could not be recorded.
+
+    The attestation itself may be valid; retrying once older nonces have
+    left the freshness window can succeed.
+    """
+
+
+class Attestation(BaseModel):
+    """A signed identity proof presented during a handshake."""
+
+    did: str = Field(..., description="DID of the attesting AI system")
+    timestamp: int = Field(..., description="Creation time (whole seconds since epoch)")
+    manifest_hash: str = Field(..., description="Content hash of the current manifest")
+    nonce: str = Field(..., description="Single-use value, base64url")
+    signature: str = Field(..., description="Ed25519 signature over the other fields")
+
+    def signing_payload(self) -> bytes:
+        """Return the bytes covered by the signature."""
+        return _payload(self.did, self.timestamp, self.manifest_hash, self.nonce)
+
+
+def _payload(did: str, timestamp: int, manifest_hash: str, nonce: str) -> bytes:
+    # Keys are written in sorted order and every value is a string or an int,
+    # so plain to_json already yields the canonical encoding.
+    return to_json(
+        {"did": did, "manifest_hash": manifest_hash, "nonce": nonce, "timestamp": timestamp}
+    )
+
+
+def new_nonce() -> str:
+    """Generate a random base64url nonce."""
+    return base64.urlsafe_b64encode(os.urandom(NONCE_BYTES)).rstrip(b"=").decode()
+
+
+def create_attestation(
+    manifest: AIManifest,
+    private_key: bytes,
+    *,
+    nonce: str | None = None,
+    timestamp: float | None = None,
+) -> Attestation:
+    """Create a signed attestation for a manifest's DID.
+
+    Args:
+        manifest: The attesting system's current manifest
+        private_key: Raw Ed25519 private key for the manifest's DID
+        nonce: A challenge supplied by the verifier (a random one if None)
+        timestamp: Creation time (defaults to now)
+
+    Returns:
+        The signed attestation
+    """
+    nonce = nonce if nonce is not None else new_nonce()
+    seconds = int(timestamp if timestamp is not None else time.time())
+    payload = _payload(manifest.did, seconds, manifest.content_hash, nonce)
+    return Attestation(
+        did=manifest.did,
+        timestamp=seconds,
+        manifest_hash=manifest.content_hash,
+        nonce=nonce,
+        signature=sign_bytes(payload, private_key),
+    )
+
+
+class ReplayCache:
+    """Nonces seen within the freshness window, expiring by time bucket.
+
+    Nonces are filed in fixed-width buckets by attestation timestamp; a
+    whole bucket is dropped once it falls out of the window, so expiry costs
+    nothing per nonce. Lookups touch one set per live bucket, a small
+    constant. The cache is thread-safe and holds at most ``max_entries``
+    nonces; when full it refuses new ones, raising
+    :class:`ReplayCacheFullError`, rather than forget live ones.
+    """
+
+    def __init__(self, window: float = 60.0, buckets: int = 6, max_entries: int = 1_000_000):
+        """Initialize the cache.
+
+        Args:
+            window: Seconds a nonce must be remembered for (the freshness window)
+            buckets: Number of buckets the window is split into
+            max_entries: Maximum number of nonces held
+        """
+        self.window = window
+        self.width = window / buckets
+        self.max_entries = max_entries
+        self._buckets: dict[int, set[tuple[str, str]]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, did: str, nonce: str, timestamp: float, now: float) -> bool:
+        """Record a nonce, returning False if it was already seen.
+
+        Raises:
+            ReplayCacheFullError: If the nonce is new but the cache is full
+        """
+        key = (did, nonce)
+        index = int(timestamp // self.width)
+        with self._lock:
+            self._expire(now)
+            for bucket in self._buckets.values():
+                if key in bucket:
+                    return False
+            if self._size >= self.max_entries:
+                raise ReplayCacheFullError("Replay cache is full; try again later")
+            self._buckets.setdefault(index, set()).add(key)
+            self._size += 1
+            return True
+
+    def _expire(self, now: float) -> None:
+        # A bucket is dead once its newest possible timestamp has left the window.
+        oldest_live = int((now - self.window) // self.width)
+        for index in [i for i in self._buckets if i < oldest_live]:
+            self._size -= len(self._buckets.pop(index))
+
+
+@dataclass(frozen=True)
+class Session:
+    """A counterparty identity established by a verified attestation.
+
+    Attributes:
+        did: The counterparty's DID
+        manifest_hash: Content hash of the manifest it attested to
+        public_key: The key its attestation verified against
+        expires_at: End of the attestation's freshness window
+    """
+
+    did: str
+    manifest_hash: str
+    public_key: bytes
+    expires_at: float
+
+
+class SessionCache:
+    """LRU of verified sessions by DID, dropped when their window ends."""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, did: str, now: float) -> Session | None:
+        """Return the live session for a DID, if any."""
+        with self._lock:
+            session = self._sessions.get(did)
+            if session is None:
+                return None
+            if session.expires_at <= now:
+                del self._sessions[did]
+                return None
+            self._sessions.move_to_end(did)
+            return session
+
+    def put(self, session: Session) -> None:
+        """Store a session, replacing any earlier one for the DID."""
+        with self._lock:
+            self._sessions[session.did] = session
+            self._sessions.move_to_end(session.did)
+            if len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+
+    def invalidate(self, did: str) -> None:
+        """End a DID's session, e.g. after its key is rotated or revoked."""
+        with self._lock:
+            self._sessions.pop(did, None)
+
+
+class AttestationVerifier:
+    """Verifies attestations and tracks the resulting sessions.
+
+    Attributes:
+        max_age: Seconds an attestation stays fresh after its timestamp
+        max_skew: Seconds a timestamp may lie in the future
+        replays: Nonces seen within the freshness window
+        sessions: Sessions established by verified attestations
+        keys: Public keys registered per DID
+    """
+
+    def __init__(
+        self,
+        *,
+        max_age: float = 60.0,
+        max_skew: float = 5.0,
+        replays: ReplayCache | None = None,
+        sessions: SessionCache | None = None,
+        keys: PublicKeyCache | None = None,
+        resolver: "DIDResolver | None" = None,
+        max_workers: int | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the verifier.
+
+        Args:
+            max_age: Freshness window in seconds
+            max_skew: Tolerated clock skew for timestamps in the future
+            replays: Replay cache (a new one covering the window if None)
+            sessions: Session cache (a new one if None)
+            keys: Per-DID keys (defaults to ``crypto.default_verifier.keys``)
+            resolver: DID resolver used by :meth:`averify` for unknown keys
+            max_workers: Thread pool size for batch verification
+            clock: Time source (seconds since epoch)
+        """
+        self.max_age = max_age
+        self.max_skew = max_skew
+        self.replays = replays if replays is not None else ReplayCache(max_age + max_skew)
+        self.sessions = sessions if sessions is not None else SessionCache()
+        self.keys = keys if keys is not None else default_verifier.keys
+        self.resolver = resolver
+        self.max_workers = max_workers
+        self.clock = clock
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def verify(self, attestation: Attestation, public_key: bytes | None = None) -> Session:
+        """Fully verify an attestation and start (or renew) a session.
+
+        Args:
+            attestation: The attestation presented by the counterparty
+            public_key: Raw key to check against (defaults to the key registered for the DID)
+
+        Returns:
+            The established session
+
+        Raises:
+            AttestationError: If the attestation is stale, from the future,
+                replayed, signed with the wrong key, or no key is known
+            ReplayCacheFullError: If the attestation is valid but its nonce
+                cannot be recorded because the replay cache is full
+        """
+        now = self.clock()
+        if attestation.timestamp < now - self.max_age:
+            raise AttestationError("Attestation has expired")
+        if attestation.timestamp > now + self.max_skew:
+            raise AttestationError("Attestation timestamp is in the future")
+        if public_key is None:
+            public_key = self.keys.get(attestation.did)
+            if public_key is None:
+                raise AttestationError(f"No public key known for {attestation.did}")
+        if not verify_bytes(attestation.signing_payload(), attestation.signature, public_key):
+            raise AttestationError("Invalid attestation signature")
+        # Only signed nonces are recorded, so forged traffic cannot fill the cache.
+        if not self.replays.add(attestation.did, attestation.nonce, attestation.timestamp, now):
+            raise AttestationError("Attestation nonce has already been used")
+        session = Session(
+            did=attestation.did,
+            manifest_hash=attestation.manifest_hash,
+            public_key=public_key,
+            expires_at=attestation.timestamp + self.max_age,
+        )
+        self.sessions.put(session)
+        return session
+
+    async def averify(self, attestation: Attestation) -> Session:
+        """Verify an attestation, resolving the DID's key if it is not registered.
+
+        Raises:
+            AttestationError: As for :meth:`verify`
+        """
+        public_key = self.keys.get(attestation.did)
+        if public_key is None and self.resolver is not None:
+            public_key = await self.resolver.public_key(attestation.did)
+        return self.verify(attestation, public_key)
+
+    def session(self, did: str) -> Session | None:
+        """Return the live session for a counterparty, if one was verified."""
+        return self.sessions.get(did, self.clock())
+
+    async def authenticate(
+        self, did: str, handshake: Callable[[], Awaitable[Attestation]]
+    ) -> Session:
+        """Reuse a live session for ``did`` or perform a handshake to establish one.
+
+        Args:
+            did: The counterparty's DID
+            handshake: Requests a fresh attestation from the counterparty
+
+        Raises:
+            AttestationError: If the handshake's attestation fails or is for another DID
+        """
+        session = self.session(did)
+        if session is not None:
+            return session
+        attestation = await handshake()
+        if attestation.did != did:
+            raise AttestationError(f"Attestation is for {attestation.did}, not {did}")
+        return await self.averify(attestation)
+
+    def verify_batch(
+        self, items: Iterable[tuple[Attestation, bytes | None]]
+    ) -> list[Session | AttestationError]:
+        """Verify many attestations across the thread pool.
+
+        Returns:
+            One session or error per attestation, in input order
+        """
+
+        def verify_one(item: tuple[Attestation, bytes | None]) -> Session | AttestationError:
+            try:
+                return self.verify(*item)
+            except AttestationError as exc:
+                return exc
+
+        items = list(items)
+        if len(items) <= 1:
+            return [verify_one(item) for item in items]
+        return list(self._pool().map(verify_one, items))
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="aims-attest"
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the batch verification thread pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+async def resolve_attested(store: "ManifestStore", session: Session) -> AIManifest:
+    """Fetch the manifest a session attested to (SPECIFICATION.md §8.3).
+
+    A cached copy with the attested hash is used as is; otherwise the
+    manifest is fetched and its hash checked against the attestation.
+
+    Raises:
+        AttestationError: If the store has no manifest or a different version
+    """
+    manifest = await store.resolve(session.did, expected_hash=session.manifest_hash)
+    if manifest is None:
+        raise AttestationError(f"No manifest published for {session.did}")
+    if manifest.content_hash != session.manifest_hash:
+        raise AttestationError(f"Manifest for {session.did} does not match its attestation")
+    return manifest
@@ -0,0 +1,358 @@
+"""Bulk import and export of manifests as NDJSON.
+
+One manifest per line, optionally gzip-compressed (detected from the
+``.gz`` suffix on write and from the gzip magic bytes on read). Files are
+processed as streams: reading holds one chunk of lines at a time and
+writing encodes one manifest at a time, so memory stays flat however many
+manifests a snapshot holds.
+
+Records are validated with a shared :class:`pydantic.TypeAdapter` straight
+from JSON bytes. Invalid lines do not stop a read; they come back as
+:class:`BulkRecord` errors carrying their line number and byte offset.
+Validation can be spread over a process pool for large imports.
+
+Example:
+    write_manifests(registry_dump, "registry.ndjson.gz")
+    for record in iter_records("registry.ndjson.gz"):
+        if not record.ok:
+            print(f"line {record.line}: {record.error}")
+"""
+
+import asyncio
+import gzip
+import io
+import itertools
+import os
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, BinaryIO
+
+from pydantic import TypeAdapter, ValidationError
+
+from .manifest import AIManifest
+
+GZIP_MAGIC = b"\x1f\x8b"
+DEFAULT_CHUNK_LINES = 1000
+
+MANIFEST_ADAPTER: TypeAdapter[AIManifest] = TypeAdapter(AIManifest)
+"""Reusable validator/serializer for manifests."""
+
+StrPath = str | os.PathLike[str]
+Source = StrPath | BinaryIO
+
+
+class BulkValidationError(ValueError):
+    """An NDJSON record failed validation.
+
+    Attributes:
+        line: 1-based line number of the record
+        offset: Byte offset of the line in the uncompressed stream
+    """
+
+    def __init__(self, line: int, offset: int, error: str):
+        super().__init__(f"line {line} (offset {offset}): {error}")
+        self.line = line
+        self.offset = offset
+
+
+@dataclass(frozen=True)
+class BulkRecord:
+    """Outcome of reading one NDJSON line.
+
+    Attributes:
+        line: 1-based line number
+        offset: Byte offset of the line in the uncompressed stream
+        manifest: The validated manifest, if the line was valid
+        error: Why validation failed, if it did
+    """
+
+    line: int
+    offset: int
+    manifest: AIManifest | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the line held a valid manifest."""
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class BulkReport:
+    """Summary of validating an NDJSON file.
+
+    Attributes:
+        valid: Number of valid manifests
+        errors: Invalid records (without manifests)
+    """
+
+    valid: int
+    errors: tuple[BulkRecord, ...]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every record was valid."""
+        return not self.errors
+
+
+@contextmanager
+def _open_read(source: Source) -> Iterator[IO[bytes]]:
+    if isinstance(source, str | os.PathLike):
+        with open(source, "rb") as raw, _maybe_decompress(raw) as stream:
+            yield stream
+    else:
+        with _maybe_decompress(source) as stream:
+            yield stream
+
+
+@contextmanager
+def _maybe_decompress(raw: BinaryIO) -> Iterator[IO[bytes]]:
+    buffered = raw if hasattr(raw, "peek") else io.BufferedReader(raw)  # type: ignore[arg-type]
+    if buffered.peek(2)[:2] == GZIP_MAGIC:  # type: ignore[attr-defined]
+        with gzip.GzipFile(fileobj=buffered, mode="rb") as stream:
+            yield stream
+    else:
+        yield buffered
+
+
+@contextmanager
+def _open_write(destination: Source, compress: bool | None) -> Iterator[IO[bytes]]:
+    if isinstance(destination, str | os.PathLike):
+        if compress is None:
+            compress = os.fspath(destination).endswith(".gz")
+        with open(destination, "wb") as raw:
+            if compress:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as stream:
+                    yield stream
+            else:
+                yield raw
+    elif compress:
+        with gzip.GzipFile(fileobj=destination, mode="wb", compresslevel=6) as stream:
+            yield stream
+    else:
+        yield destination
+
+
+def write_manifests(
+    manifests: Iterable[AIManifest], destination: Source, *, compress: bool | None = None
+) -> int:
+    """Write manifests as NDJSON.
+
+    Args:
+        manifests: Manifests to write, consumed lazily
+        destination: File path or binary file object
+        compress: Gzip the output (defaults to whether the path ends in ``.gz``)
+
+    Returns:
+        The number of manifests written
+    """
+    count = 0
+    with _open_write(destination, compress) as stream:
+        for manifest in manifests:
+            stream.write(MANIFEST_ADAPTER.dump_json(manifest) + b"\n")
+            count += 1
+    return count
+
+
+Chunk = list[tuple[int, int, bytes]]
+
+
+def _chunks(stream: IO[bytes], chunk_lines: int) -> Iterator[Chunk]:
+    """Yield chunks of (line number, byte offset, line) for the non-blank lines."""
+    offset = 0
+    numbered = enumerate(stream, start=1)
+    while True:
+        chunk = []
+        read = 0
+        for number, line in itertools.islice(numbered, chunk_lines):
+            read += 1
+            if line.strip():
+                chunk.append((number, offset, line))
+            offset += len(line)
+        if not read:
+            return
+        yield chunk
+
+
+def _validate_chunk(chunk: Chunk, keep: bool) -> list[BulkRecord]:
+    """Validate a chunk of lines; with ``keep=False`` only errors are returned."""
+    records = []
+    for number, offset, line in chunk:
+        try:
+            manifest = MANIFEST_ADAPTER.validate_json(line)
+        except ValidationError as exc:
+            records.append(BulkRecord(line=number, offset=offset, error=describe(exc)))
+            continue
+        if keep:
+            records.append(BulkRecord(line=number, offset=offset, manifest=manifest))
+    return records
+
+
+def describe(exc: ValidationError) -> str:
+    """Summarize a validation error on one line, as in :attr:`BulkRecord.error`."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or '<record>'}: {error['msg']}"
+        for error in exc.errors(include_url=False)
+    )
+
+
+def _validated(
+    stream: IO[bytes], chunk_lines: int, workers: int, keep: bool
+) -> Iterator[tuple[int, list[BulkRecord]]]:
+    """Yield (line count, records) per chunk in input order.
+
+    With ``workers`` > 1 chunks are validated on a process pool, keeping at
+    most two chunks per worker in flight.
+    """
+    chunks = _chunks(stream, chunk_lines)
+    if workers <= 1:
+        for chunk in chunks:
+            yield len(chunk), _validate_chunk(chunk, keep)
+        return
+    executor: Executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending: deque[tuple[int, Future[list[BulkRecord]]]] = deque()
+        for chunk in chunks:
+            pending.append((len(chunk), executor.submit(_validate_chunk, chunk, keep)))
+            if len(pending) >= 2 * workers:
+                count, future = pending.popleft()
+                yield count, future.result()
+        while pending:
+            count, future = pending.popleft()
+            yield count, future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def iter_records(
+    source: Source, *, workers: int = 1, chunk_lines: int = DEFAULT_CHUNK_LINES
+) -> Iterator[BulkRecord]:
+    """Stream every record of an NDJSON file, valid or not, in file order.
+
+    Blank lines are skipped but still counted in line numbers.
+
+    Args:
+        source: File path or binary file object (plain or gzip NDJSON)
+        workers: Validation processes; 1 validates inline
+        chunk_lines: Lines per work unit
+
+    Yields:
+        One BulkRecord per non-blank line
+    """
+    with _open_read(source) as stream:
+        for _, records in _validated(stream, chunk_lines, workers, keep=True):
+            yield from records
+
+
+def read_manifests(
+    source: Source, *, workers: int = 1, chunk_lines: int = DEFAULT_CHUNK_LINES
+) -> Iterator[AIManifest]:
+    """Stream the manifests of an NDJSON file, stopping at the first invalid record.
+
+    Args:
+        source: File path or binary file object (plain or gzip NDJSON)
+        workers: Validation processes; 1 validates inline
+        chunk_lines: Lines per work unit
+
+    Raises:
+        BulkValidationError: At the first invalid record
+    """
+    for record in iter_records(source, workers=workers, chunk_lines=chunk_lines):
+        if record.manifest is None:
+            raise BulkValidationError(record.line, record.offset, record.error or "")
+        yield record.manifest
+
+
+def validate_file(
+    source: Source, *, workers: int = 1, chunk_lines: int = DEFAULT_CHUNK_LINES
+) -> BulkReport:
+    """Validate an NDJSON file without keeping the manifests.
+
+    Cheaper than :func:`iter_records` with a process pool, since only
+    errors travel back from the workers.
+    """
+    valid = 0
+    errors: list[BulkRecord] = []
+    with _open_read(source) as stream:
+        for count, chunk_errors in _validated(stream, chunk_lines, workers, keep=False):
+            valid += count - len(chunk_errors)
+            errors.extend(chunk_errors)
+    return BulkReport(valid=valid, errors=tuple(errors))
+
+
+async def aiter_records(
+    source: Source,
+    *,
+    workers: int = 1,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+) -> AsyncIterator[BulkRecord]:
+    """Async version of :func:`iter_records`.
+
+    File reads and validation run in a worker thread one chunk at a time,
+    so the event loop is never blocked on I/O.
+    """
+    records = iter_records(source, workers=workers, chunk_lines=chunk_lines)
+    try:
+        while batch := await asyncio.to_thread(_take, records, chunk_lines):
+            for record in batch:
+                yield record
+    finally:
+        await asyncio.to_thread(records.close)
+
+
+async def aread_manifests(
+    source: Source, *, workers: int = 1, chunk_lines: int = DEFAULT_CHUNK_LINES
+) -> AsyncIterator[AIManifest]:
+    """Async version of :func:`read_manifests`.
+
+    Raises:
+        BulkValidationError: At the first invalid record
+    """
+    async for record in aiter_records(source, workers=workers, chunk_lines=chunk_lines):
+        if record.manifest is None:
+            raise BulkValidationError(record.line, record.offset, record.error or "")
+        yield record.manifest
+
+
+async def awrite_manifests(
+    manifests: AsyncIterable[AIManifest] | Iterable[AIManifest],
+    destination: Source,
+    *,
+    compress: bool | None = None,
+    batch_size: int = DEFAULT_CHUNK_LINES,
+) -> int:
+    """Async version of :func:`write_manifests`, accepting an async iterable.
+
+    Manifests are encoded on the event loop and written in batches from a
+    worker thread.
+    """
+    count = 0
+    with _open_write(destination, compress) as stream:
+        batch: list[bytes] = []
+        async for manifest in _aiter(manifests):
+            batch.append(MANIFEST_ADAPTER.dump_json(manifest) + b"\n")
+            if len(batch) >= batch_size:
+                await asyncio.to_thread(stream.writelines, batch)
+                count += len(batch)
+                batch = []
+        await asyncio.to_thread(stream.writelines, batch)
+        count += len(batch)
+    return count
+
+
+def _take(records: Iterator[BulkRecord], size: int) -> list[BulkRecord]:
+    return list(itertools.islice(records, size))
+
+
+async def _aiter(
+    items: AsyncIterable[AIManifest] | Iterable[AIManifest],
+) -> AsyncIterator[AIManifest]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -0,0 +1,309 @@
+"""Manifest Cache - Bounded TTL/LRU cache for resolved manifests.
+
+Implements the client-side caching described in SPECIFICATION.md §4.2 and
+§8.3: resolved manifests are kept in memory, keyed by DID, and reused while
+fresh or while their content hash matches the one a counterparty attested to.
+Expired entries are kept around so they can be revalidated with a
+conditional request instead of being downloaded and parsed again.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .instrumentation import CACHE_HIT, CACHE_MISS, count
+from .manifest import AIManifest
+from .wire import JSON_MEDIA_TYPE, parse_manifest
+
+if TYPE_CHECKING:
+    import httpx
+
+    from .lazy import LazyManifest
+
+
+def _cache_directives(response: "httpx.Response") -> dict[str, str]:
+    directives = {}
+    for part in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def max_age(response: "httpx.Response") -> float | None:
+    """Freshness lifetime from a response's ``Cache-Control: max-age``, if present."""
+    try:
+        return float(_cache_directives(response)["max-age"])
+    except (KeyError, ValueError):
+        return None
+
+
+def no_store(response: "httpx.Response") -> bool:
+    """Whether a response's ``Cache-Control`` asks for it not to be cached."""
+    return "no-store" in _cache_directives(response)
+
+
+@dataclass
+class CacheEntry:
+    """A cached manifest together with the data needed to revalidate it.
+
+    The body is only validated into an :class:`AIManifest` when
+    :attr:`manifest` or :attr:`content_hash` is first read, so an entry
+    that is only ever read through a :class:`~openattribution.aims.lazy.LazyManifest`
+    view never pays for a full validation.
+
+    Attributes:
+        did: The DID the manifest was resolved for
+        body: Raw payload as received from the store
+        etag: Entity tag returned by the store, if any
+        expires_at: Wall-clock time (seconds since epoch) after which the entry is stale
+        media_type: Media type of ``body`` (JSON or the binary wire format)
+        parsed: The validated manifest, once something has asked for it
+        view: A lazy view over ``body``, once something has asked for one
+    """
+
+    did: str
+    body: bytes
+    etag: str | None
+    expires_at: float
+    media_type: str = JSON_MEDIA_TYPE
+    parsed: AIManifest | None = field(default=None, repr=False)
+    view: "LazyManifest | None" = field(default=None, repr=False)
+
+    @property
+    def manifest(self) -> AIManifest:
+        """The validated manifest (shared by all readers; treat as read-only)."""
+        if self.parsed is None:
+            self.parsed = parse_manifest(self.body, self.media_type)
+        return self.parsed
+
+    @property
+    def content_hash(self) -> str:
+        """Canonical content hash of the manifest (see ``AIManifest.content_hash``)."""
+        return self.manifest.content_hash
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes, measured by payload size."""
+        return len(self.body)
+
+    def is_fresh(self, now: float) -> bool:
+        """Whether the entry can be served without revalidation."""
+        return now < self.expires_at
+
+    @property
+    def validator(self) -> str:
+        """Value for an ``If-None-Match`` header revalidating this entry."""
+        return self.etag or f'"{self.content_hash}"'
+
+
+class ManifestCache:
+    """In-process TTL + LRU manifest cache with an optional on-disk tier.
+
+    Entries are evicted least-recently-used first whenever either
+    ``max_entries`` or ``max_bytes`` is exceeded. Stale entries are not
+    dropped on expiry; :meth:`get` keeps returning them so the caller can
+    revalidate and then :meth:`refresh` them.
+
+    When ``disk_path`` is set, every stored entry is also written to that
+    directory and memory misses fall back to it, so a restarted worker
+    starts warm.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 300.0,
+        disk_path: str | os.PathLike[str] | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of manifests held in memory
+            max_bytes: Maximum total payload size held in memory
+            ttl: Default freshness lifetime in seconds
+            disk_path: Directory for the persistent tier (disabled if None)
+            clock: Wall-clock source, overridable for testing
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_path = Path(disk_path) if disk_path is not None else None
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+        if self.disk_path is not None:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, did: object) -> bool:
+        return did in self._entries
+
+    @property
+    def size(self) -> int:
+        """Total payload bytes currently held in memory."""
+        return self._size
+
+    def get(self, did: str) -> CacheEntry | None:
+        """Look up a DID, returning fresh and stale entries alike.
+
+        Args:
+            did: The DID to look up
+
+        Returns:
+            The cache entry, or None if the DID is not cached in memory or on disk
+        """
+        entry = self._entries.get(did)
+        if entry is not None:
+            self._entries.move_to_end(did)
+        else:
+            entry = self._load(did)
+            if entry is not None:
+                self._insert(entry)
+        if entry is None:
+            self.misses += 1
+            count(CACHE_MISS)
+        else:
+            self.hits += 1
+            count(CACHE_HIT)
+        return entry
+
+    def peek(self, did: str) -> CacheEntry | None:
+        """Look up a DID in memory without affecting LRU order or hit counts."""
+        return self._entries.get(did)
+
+    def put(
+        self,
+        did: str,
+        manifest: AIManifest | None,
+        body: bytes,
+        etag: str | None = None,
+        ttl: float | None = None,
+        media_type: str = JSON_MEDIA_TYPE,
+    ) -> CacheEntry:
+        """Store a freshly fetched manifest.
+
+        Args:
+            did: The DID the manifest was resolved for
+            manifest: The parsed manifest, or None to parse ``body`` when first needed
+            body: Raw payload as received from the store
+            etag: Entity tag returned by the store
+            ttl: Freshness lifetime in seconds (defaults to the cache TTL)
+            media_type: Media type of ``body``
+
+        Returns:
+            The new cache entry
+        """
+        entry = CacheEntry(
+            did=did,
+            body=body,
+            etag=etag,
+            expires_at=self.clock() + (self.ttl if ttl is None else ttl),
+            media_type=media_type,
+            parsed=manifest,
+        )
+        self._insert(entry)
+        self._save(entry)
+        return entry
+
+    def refresh(self, did: str, ttl: float | None = None) -> CacheEntry | None:
+        """Extend the lifetime of an entry after a successful revalidation.
+
+        Args:
+            did: The DID whose entry was revalidated
+            ttl: New freshness lifetime in seconds (defaults to the cache TTL)
+
+        Returns:
+            The refreshed entry, or None if it is no longer cached
+        """
+        entry = self._entries.get(did)
+        if entry is None:
+            return None
+        entry.expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        self._entries.move_to_end(did)
+        self._save(entry)
+        return entry
+
+    def invalidate(self, did: str) -> None:
+        """Drop a DID from memory and disk."""
+        entry = self._entries.pop(did, None)
+        if entry is not None:
+            self._size -= entry.size
+        if self.disk_path is not None:
+            self._disk_file(did).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry. The disk tier is left untouched."""
+        self._entries.clear()
+        self._size = 0
+
+    def _insert(self, entry: CacheEntry) -> None:
+        previous = self._entries.pop(entry.did, None)
+        if previous is not None:
+            self._size -= previous.size
+        self._entries[entry.did] = entry
+        self._size += entry.size
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._size > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+
+    def _disk_file(self, did: str) -> Path:
+        assert self.disk_path is not None
+        return self.disk_path / f"{hashlib.sha256(did.encode()).hexdigest()}.json"
+
+    def _save(self, entry: CacheEntry) -> None:
+        if self.disk_path is None:
+            return
+        record = {
+            "did": entry.did,
+            "etag": entry.etag,
+            "expires_at": entry.expires_at,
+        }
+        if entry.media_type == JSON_MEDIA_TYPE:
+            record["body"] = entry.body.decode()
+        else:
+            record["media_type"] = entry.media_type
+            record["body_b64"] = base64.b64encode(entry.body).decode()
+        path = self._disk_file(entry.did)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(record))
+        os.replace(tmp, path)
+
+    def _load(self, did: str) -> CacheEntry | None:
+        if self.disk_path is None:
+            return None
+        try:
+            record = json.loads(self._disk_file(did).read_text())
+            media_type = record.get("media_type", JSON_MEDIA_TYPE)
+            if "body_b64" in record:
+                body = base64.b64decode(record["body_b64"])
+            else:
+                body = record["body"].encode()
+            manifest = parse_manifest(body, media_type)
+        except (OSError, ValueError, KeyError):
+            return None
+        if record.get("did") != did:
+            return None
+        return CacheEntry(
+            did=did,
+            body=body,
+            etag=record.get("etag"),
+            expires_at=float(record.get("expires_at", 0.0)),
+            media_type=media_type,
+            parsed=manifest,
+        )
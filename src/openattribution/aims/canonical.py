@@ -0,0 +1,135 @@
+"""Canonical JSON encoding and content hashing.
+
+AIMS manifests are content-addressed (SPECIFICATION.md §4.2, §8.3), so every
+party must derive the same bytes, and hence the same hash, from the same
+manifest. The canonical form follows RFC 8785 (JCS): object keys sorted by
+UTF-16 code units, no insignificant whitespace, strings as raw UTF-8 with
+only mandatory escapes.
+
+Numbers are limited to integers. AIMS manifests contain no fractional
+numbers, and this keeps the encoder free of JCS's floating-point formatting
+rules. Integral floats are encoded as integers.
+"""
+
+import hashlib
+from collections.abc import Callable
+from functools import cache
+from types import NoneType, UnionType
+from typing import Any, Union, get_args, get_origin
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+HASH_ALGORITHM = "sha256"
+
+_Reorder = Callable[[Any], Any]
+
+
+def content_hash(data: bytes) -> str:
+    """Return the ``sha256:<hex>`` content hash of canonical bytes."""
+    return f"{HASH_ALGORITHM}:{hashlib.sha256(data).hexdigest()}"
+
+
+def _utf16_key(key: str) -> bytes:
+    return key.encode("utf-16-be")
+
+
+def _sort_value(value: Any) -> Any:
+    """Recursively rebuild JSON containers with keys in canonical order."""
+    if isinstance(value, dict):
+        return {key: _sort_value(value[key]) for key in sorted(value, key=_utf16_key)}
+    if isinstance(value, list | tuple):
+        return [_sort_value(item) for item in value]
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"Non-integral number not supported in canonical JSON: {value!r}")
+        return int(value)
+    return value
+
+
+def canonical_json(value: Any) -> bytes:
+    """Encode a JSON-compatible value in canonical form.
+
+    Args:
+        value: Dicts, lists, strings, integers, booleans and None
+
+    Returns:
+        Canonical UTF-8 JSON bytes
+
+    Raises:
+        ValueError: If the value contains a non-integral number
+    """
+    return to_json(_sort_value(value))
+
+
+def _model_type(annotation: Any) -> type[BaseModel] | None:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _field_reorder(annotation: Any) -> _Reorder | None:
+    """Build the reorder step for one field, or None if its value needs none."""
+    model = _model_type(annotation)
+    if model is not None:
+        return _model_reorder(model)
+
+    origin = get_origin(annotation)
+    args = [arg for arg in get_args(annotation) if arg is not NoneType]
+    if origin in (Union, UnionType) and len(args) == 1:
+        return _field_reorder(args[0])
+    if origin is list and len(args) == 1:
+        item = _field_reorder(args[0])
+        if item is None:
+            return None
+        return lambda items: [item(value) for value in items]
+    if annotation in (str, bool, int, NoneType) or (
+        isinstance(annotation, type) and issubclass(annotation, str)
+    ):
+        return None
+    if origin in (Union, UnionType) or origin is list:
+        if all(_field_reorder(arg) is None for arg in args):
+            return None
+    # Anything the plan doesn't understand falls back to the generic encoder.
+    return _sort_value
+
+
+@cache
+def _model_reorder(model: type[BaseModel]) -> _Reorder:
+    """Compile a function reordering ``model.model_dump(mode="json")`` output.
+
+    Every dump of a given model class has the same keys, so the canonical key
+    order and the fields needing recursion are worked out once per class.
+    """
+    steps = [
+        (name, _field_reorder(field.annotation))
+        for name, field in sorted(model.model_fields.items(), key=lambda item: _utf16_key(item[0]))
+    ]
+
+    def reorder(data: dict[str, Any]) -> dict[str, Any]:
+        ordered = {}
+        for name, step in steps:
+            if name in data:
+                value = data[name]
+                ordered[name] = value if step is None or value is None else step(value)
+        return ordered
+
+    return reorder
+
+
+def canonical_model_json(model: BaseModel, exclude: set[str] | None = None) -> bytes:
+    """Encode a pydantic model in canonical form.
+
+    Equivalent to ``canonical_json(model.model_dump(mode="json"))`` but
+    avoids re-sorting every object: key order is precompiled per model class
+    and the encoding itself runs in pydantic-core.
+
+    Args:
+        model: The model to encode
+        exclude: Top-level fields to leave out
+
+    Returns:
+        Canonical UTF-8 JSON bytes
+    """
+    data = model.model_dump(mode="json", exclude=exclude)
+    return to_json(_model_reorder(type(model))(data))
@@ -0,0 +1,304 @@
+"""Command line interface - Bulk validate, hash, canonicalize, sign and verify.
+
+Every subcommand takes manifest files and directories (searched
+recursively for ``*.json``) and processes them in chunks across a process
+pool. One NDJSON record per file is written to stdout, in input order:
+
+    {"path": "m/a.json", "ok": true, "did": "did:aims:...", "hash": "sha256:..."}
+    {"path": "m/b.json", "ok": false, "error": "did: Field required"}
+
+Exit codes:
+    0  every file succeeded
+    1  at least one file was invalid, failed to verify or could not be read
+    2  bad usage (unknown option, unreadable key, no input files)
+
+Start-up stays fast because this module imports only the standard library;
+pydantic, the manifest model and the crypto backend are imported in the
+process that handles a chunk, when it first needs them.
+
+Examples:
+    aims validate manifests/ --progress
+    aims hash manifests/ | jq -r .hash
+    aims sign manifests/ --key signing.key --in-place
+    aims verify manifests/ --public-key z6Mk...
+"""
+
+import argparse
+import base64
+import binascii
+import json
+import os
+import sys
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+DEFAULT_CHUNK_SIZE = 64
+
+# (source path, destination path or None)
+Job = tuple[str, str | None]
+
+
+class UsageError(Exception):
+    """A problem with the command line rather than with a manifest."""
+
+
+def load_key(value: str) -> bytes:
+    """Load a raw 32-byte Ed25519 key from a file or an inline value.
+
+    Files may hold the raw 32 bytes or a text encoding. Text is read as
+    hex, as a ``z6Mk`` multikey, or as base64/base64url.
+
+    Raises:
+        UsageError: If no 32-byte key can be decoded
+    """
+    path = Path(value)
+    if path.is_file():
+        raw = path.read_bytes()
+        if len(raw) == 32:
+            return raw
+    else:
+        raw = value.encode()
+    text = raw.decode("ascii", errors="replace").strip()
+    if len(text) == 64:
+        try:
+            return bytes.fromhex(text)
+        except ValueError:
+            pass
+    if text.startswith("z6Mk"):
+        from .resolution import decode_ed25519_multikey
+
+        try:
+            return decode_ed25519_multikey(text)
+        except ValueError as exc:
+            raise UsageError(f"Invalid multikey: {exc}") from None
+    try:
+        key = base64.urlsafe_b64decode(text.replace("+", "-").replace("/", "_") + "==")
+    except (binascii.Error, ValueError):
+        key = b""
+    if len(key) != 32:
+        raise UsageError(f"Could not read a 32-byte Ed25519 key from {value!r}")
+    return key
+
+
+def find_manifests(paths: Sequence[str], output_dir: str | None = None) -> list[Job]:
+    """Expand files and directories into jobs, mirroring layout under ``output_dir``.
+
+    Raises:
+        UsageError: If a path does not exist
+    """
+    jobs: list[Job] = []
+    for name in paths:
+        root = Path(name)
+        if root.is_dir():
+            files = sorted(p for p in root.rglob("*.json") if p.is_file())
+            relative = [p.relative_to(root) for p in files]
+        elif root.exists():
+            files, relative = [root], [Path(root.name)]
+        else:
+            raise UsageError(f"No such file or directory: {name}")
+        for source, rel in zip(files, relative, strict=True):
+            target = str(Path(output_dir, rel)) if output_dir is not None else None
+            jobs.append((str(source), target))
+    return jobs
+
+
+def _write(path: str, data: bytes) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f"{target.suffix}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
+
+
+def _process(command: str, job: Job, options: dict[str, Any]) -> dict[str, Any]:
+    """Handle one file; runs in a worker process."""
+    from pydantic import ValidationError
+
+    from .bulk import describe
+    from .canonical import canonical_model_json
+    from .manifest import AIManifest
+
+    source, destination = job
+    record: dict[str, Any] = {"path": source}
+    try:
+        manifest = AIManifest.model_validate_json(Path(source).read_bytes())
+    except OSError as exc:
+        return {**record, "ok": False, "error": exc.strerror or str(exc)}
+    except ValidationError as exc:
+        return {**record, "ok": False, "error": describe(exc)}
+    record.update(ok=True, did=manifest.did)
+
+    if command == "sign":
+        manifest.sign(options["key"])
+        record["signature"] = manifest.signature
+    if command in ("hash", "sign", "canonicalize"):
+        record["hash"] = manifest.content_hash
+    if command == "verify":
+        if manifest.signature is None:
+            record.update(ok=bool(options["allow_unsigned"]), signed=False)
+            if not record["ok"]:
+                record["error"] = "Manifest is not signed"
+        elif not manifest.verify(options["key"]):
+            record.update(ok=False, signed=True, error="Invalid signature")
+        else:
+            record["signed"] = True
+
+    if command == "canonicalize":
+        body = canonical_model_json(manifest)
+    elif command == "sign":
+        body = manifest.model_dump_json(indent=2).encode() + b"\n"
+    else:
+        return record
+    if destination is None:
+        if command == "canonicalize":
+            record["canonical"] = body.decode()
+        return record
+    try:
+        _write(destination, body)
+    except OSError as exc:
+        return {**record, "ok": False, "error": exc.strerror or str(exc)}
+    record["written"] = destination
+    return record
+
+
+def _process_chunk(command: str, jobs: list[Job], options: dict[str, Any]) -> list[dict[str, Any]]:
+    return [_process(command, job, options) for job in jobs]
+
+
+def _chunks(jobs: list[Job], size: int) -> Iterator[list[Job]]:
+    for start in range(0, len(jobs), size):
+        yield jobs[start : start + size]
+
+
+def run(
+    command: str,
+    jobs: list[Job],
+    options: dict[str, Any],
+    *,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """Process jobs in chunks, yielding each chunk's records in input order.
+
+    With ``workers`` > 1 chunks run on a process pool, keeping at most two
+    chunks per worker in flight.
+    """
+    chunks = _chunks(jobs, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield _process_chunk(command, chunk, options)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[list[dict[str, Any]]]] = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(_process_chunk, command, chunk, options))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def default_workers() -> int:
+    """Number of CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="aims", description="Bulk tools for AIMS manifest files (NDJSON output)."
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("paths", nargs="+", metavar="PATH", help="Manifest files or directories")
+    common.add_argument(
+        "-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)"
+    )
+    common.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Files per work unit"
+    )
+    common.add_argument("--progress", action="store_true", help="Report progress on stderr")
+
+    writes = argparse.ArgumentParser(add_help=False)
+    target = writes.add_mutually_exclusive_group()
+    target.add_argument("-o", "--output-dir", help="Write results under this directory")
+    target.add_argument("--in-place", action="store_true", help="Overwrite the input files")
+
+    commands.add_parser("validate", parents=[common], help="Check files are valid manifests")
+    commands.add_parser("hash", parents=[common], help="Print each manifest's content hash")
+    commands.add_parser(
+        "canonicalize", parents=[common, writes], help="Rewrite manifests in canonical JSON"
+    )
+    sign = commands.add_parser("sign", parents=[common, writes], help="Sign manifests")
+    sign.add_argument("--key", required=True, help="Ed25519 private key (file or value)")
+    verify = commands.add_parser("verify", parents=[common], help="Verify manifest signatures")
+    verify.add_argument("--public-key", required=True, help="Ed25519 public key (file or value)")
+    verify.add_argument(
+        "--allow-unsigned", action="store_true", help="Treat unsigned manifests as passing"
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the ``aims`` command line tool.
+
+    Returns:
+        The process exit code
+    """
+    args = _parser().parse_args(argv)
+    try:
+        options: dict[str, Any] = {}
+        if args.command == "sign":
+            options["key"] = load_key(args.key)
+        elif args.command == "verify":
+            options["key"] = load_key(args.public_key)
+            options["allow_unsigned"] = args.allow_unsigned
+        output_dir = getattr(args, "output_dir", None)
+        jobs = find_manifests(args.paths, output_dir)
+        if getattr(args, "in_place", False):
+            jobs = [(source, source) for source, _ in jobs]
+        if not jobs:
+            raise UsageError("No manifest files found")
+        if args.chunk_size < 1 or (args.workers is not None and args.workers < 1):
+            raise UsageError("--workers and --chunk-size must be at least 1")
+    except (UsageError, OSError) as exc:
+        print(f"aims: error: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+
+    workers = min(args.workers or default_workers(), -(-len(jobs) // args.chunk_size))
+    done = failed = 0
+    out = sys.stdout
+    for records in run(args.command, jobs, options, workers=workers, chunk_size=args.chunk_size):
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            failed += not record["ok"]
+        done += len(records)
+        out.flush()
+        if args.progress:
+            print(
+                f"\raims {args.command}: {done}/{len(jobs)} files, {failed} failed",
+                end="",
+                file=sys.stderr,
+                flush=True,
+            )
+    if args.progress:
+        print(file=sys.stderr)
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,80 @@
 """Cryptographic utilities for AIMS.
 
 Handles signing, verification, and key management for manifests.
+
+The Ed25519 helpers are imported, together with the ``cryptography``
+backend, when one of them is first used.
 """
 
-# TODO: Implement Ed25519 signing and verification
-# TODO: Implement Merkle tree utilities for selective disclosure
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ed25519 import (
+        ManifestVerifier,
+        PublicKeyCache,
+        VerifiedDigestCache,
+        default_verifier,
+        generate_keypair,
+        load_public_key,
+        public_key_from_private,
+        sign_bytes,
+        verify_bytes,
+    )
+    from .merkle import (
+        MerkleIndex,
+        MerkleProof,
+        build_index,
+        merkle_root,
+        verify_proof,
+    )
+
+__all__ = [
+    "ManifestVerifier",
+    "MerkleIndex",
+    "MerkleProof",
+    "PublicKeyCache",
+    "VerifiedDigestCache",
+    "build_index",
+    "default_verifier",
+    "generate_keypair",
+    "load_public_key",
+    "merkle_root",
+    "public_key_from_private",
+    "sign_bytes",
+    "verify_bytes",
+    "verify_proof",
+]
+
+_EXPORTS = {
+    **dict.fromkeys(
+        [
+            "ManifestVerifier",
+            "PublicKeyCache",
+            "VerifiedDigestCache",
+            "default_verifier",
+            "generate_keypair",
+            "load_public_key",
+            "public_key_from_private",
+            "sign_bytes",
+            "verify_bytes",
+        ],
+        ".ed25519",
+    ),
+    **dict.fromkeys(
+        ["MerkleIndex", "MerkleProof", "build_index", "merkle_root", "verify_proof"], ".merkle"
+    ),
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,246 @@
+"""Ed25519 signing and verification for AIMS manifests.
+
+Signatures are encoded as ``ed25519:<base64url>`` over the manifest's
+signing payload. Keys are raw 32-byte Ed25519 private seeds and public keys.
+
+Verification is cached at two levels: loaded public key objects are kept per
+DID (and per raw key), and every (digest, key, signature) triple that has
+passed verification is remembered so a manifest verified once is never
+checked again. The ``cryptography`` primitives release the GIL, so batches
+are verified across a thread pool.
+"""
+
+import base64
+import binascii
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+from ..canonical import content_hash
+from ..instrumentation import VERIFY, span
+
+if TYPE_CHECKING:
+    from ..manifest import AIManifest
+
+SIGNATURE_PREFIX = "ed25519:"
+
+
+def generate_keypair() -> tuple[bytes, bytes]:
+    """Generate a new Ed25519 key pair.
+
+    Returns:
+        (private_key, public_key) as raw 32-byte values
+    """
+    private_key = os.urandom(32)
+    return private_key, public_key_from_private(private_key)
+
+
+def public_key_from_private(private_key: bytes) -> bytes:
+    """Derive the raw public key for a raw Ed25519 private key."""
+    return _load_private_key(private_key).public_key().public_bytes_raw()
+
+
+@lru_cache(maxsize=64)
+def _load_private_key(private_key: bytes) -> Ed25519PrivateKey:
+    return Ed25519PrivateKey.from_private_bytes(private_key)
+
+
+@lru_cache(maxsize=4096)
+def load_public_key(public_key: bytes) -> Ed25519PublicKey:
+    """Load a raw Ed25519 public key, caching the key object.
+
+    Raises:
+        ValueError: If the key is not a valid 32-byte Ed25519 public key
+    """
+    return Ed25519PublicKey.from_public_bytes(public_key)
+
+
+def sign_bytes(payload: bytes, private_key: bytes) -> str:
+    """Sign a payload, returning an encoded ``ed25519:`` signature."""
+    raw = _load_private_key(private_key).sign(payload)
+    return SIGNATURE_PREFIX + base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_signature(signature: str) -> bytes:
+    """Decode an ``ed25519:`` signature string to raw bytes.
+
+    Raises:
+        ValueError: If the signature is not a well-formed Ed25519 signature
+    """
+    if not signature.startswith(SIGNATURE_PREFIX):
+        raise ValueError(f"Unsupported signature scheme: {signature.split(':', 1)[0]}")
+    encoded = signature.removeprefix(SIGNATURE_PREFIX)
+    try:
+        raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    except binascii.Error as exc:
+        raise ValueError("Malformed Ed25519 signature") from exc
+    if len(raw) != 64:
+        raise ValueError("Malformed Ed25519 signature")
+    return raw
+
+
+def verify_bytes(payload: bytes, signature: str, public_key: bytes) -> bool:
+    """Check an encoded signature over a payload without any caching."""
+    try:
+        load_public_key(public_key).verify(decode_signature(signature), payload)
+    except (InvalidSignature, ValueError):
+        return False
+    return True
+
+
+class PublicKeyCache:
+    """Loaded public key objects keyed by DID."""
+
+    def __init__(self) -> None:
+        self._keys: dict[str, tuple[bytes, Ed25519PublicKey]] = {}
+
+    def __contains__(self, did: object) -> bool:
+        return did in self._keys
+
+    def register(self, did: str, public_key: bytes) -> None:
+        """Associate a raw public key with a DID.
+
+        Raises:
+            ValueError: If the key is not a valid Ed25519 public key
+        """
+        self._keys[did] = (public_key, load_public_key(public_key))
+
+    def get(self, did: str) -> bytes | None:
+        """Return the raw public key registered for a DID, if any."""
+        entry = self._keys.get(did)
+        return entry[0] if entry is not None else None
+
+    def remove(self, did: str) -> None:
+        """Forget the key registered for a DID."""
+        self._keys.pop(did, None)
+
+
+class VerifiedDigestCache:
+    """Bounded LRU set of (digest, key, signature) triples that passed verification.
+
+    Thread-safe, so it can be shared by batch verification workers.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, bytes, str], None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._entries.move_to_end(key)  # type: ignore[arg-type]
+            return True
+
+    def add(self, key: tuple[str, bytes, str]) -> None:
+        """Remember a verified triple, evicting the oldest if full."""
+        with self._lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every verified triple."""
+        with self._lock:
+            self._entries.clear()
+
+
+class ManifestVerifier:
+    """Verifies manifest signatures with key and verified-digest caching.
+
+    Attributes:
+        keys: Public keys registered per DID
+        verified: Triples that already passed verification
+    """
+
+    def __init__(
+        self,
+        keys: PublicKeyCache | None = None,
+        verified: VerifiedDigestCache | None = None,
+        max_workers: int | None = None,
+    ):
+        """Initialize the verifier.
+
+        Args:
+            keys: Per-DID public key cache (a new one if None)
+            verified: Verified-digest cache (a new one if None)
+            max_workers: Thread pool size for batch verification
+        """
+        self.keys = keys if keys is not None else PublicKeyCache()
+        self.verified = verified if verified is not None else VerifiedDigestCache()
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def verify(self, manifest: "AIManifest", public_key: bytes | None = None) -> bool:
+        """Verify one manifest's signature.
+
+        Args:
+            manifest: The manifest to verify
+            public_key: Raw public key (defaults to the key registered for the manifest's DID)
+
+        Returns:
+            True if the signature is valid or absent, False if it is invalid
+            or no key is available to check it
+        """
+        if manifest.signature is None:
+            return True
+        if public_key is None:
+            public_key = self.keys.get(manifest.did)
+            if public_key is None:
+                return False
+        payload = manifest.signing_payload()
+        key = (content_hash(payload), public_key, manifest.signature)
+        if key in self.verified:
+            return True
+        with span(VERIFY):
+            valid = verify_bytes(payload, manifest.signature, public_key)
+        if not valid:
+            return False
+        self.verified.add(key)
+        return True
+
+    def verify_batch(self, items: Iterable[tuple["AIManifest", bytes | None]]) -> list[bool]:
+        """Verify many (manifest, public key) pairs across the thread pool.
+
+        Args:
+            items: Pairs of manifest and raw public key (None to use the registered key)
+
+        Returns:
+            One result per pair, in input order
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [self.verify(manifest, key) for manifest, key in items]
+        return list(self._pool().map(lambda item: self.verify(*item), items))
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="aims-verify"
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the batch verification thread pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+default_verifier = ManifestVerifier()
+"""Process-wide verifier used by :meth:`AIManifest.verify`."""
@@ -0,0 +1,381 @@
+"""Merkle commitments for selective audit disclosure.
+
+Implements the Merkle root of SPECIFICATION.md §5.3.1 over training data
+records. Records are the newline-separated lines of one or more record
+files. Leaves and interior nodes are domain-separated as in RFC 6962:
+
+    leaf = sha256(0x00 || record)
+    node = sha256(0x01 || left || right)
+
+Levels are built pairwise from the leaves up; an unpaired last node is
+promoted to the next level unchanged. Roots are encoded ``sha256:<hex>``,
+the format used by ``DatasetReference.merkle_root``.
+
+:func:`build_index` streams the record files through ``mmap``, hashes leaves
+across a process pool and writes every level of the tree to a compact index
+file, so memory use stays constant however many records there are and
+inclusion proofs come back in O(log n) reads without rebuilding anything.
+
+Index file layout (all digests 32 bytes, counts big-endian)::
+
+    b"AIMSMRK1" | leaf_count: u64 | level 0 digests | level 1 digests | ... | root
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, Self
+
+DIGEST_SIZE = 32
+ROOT_PREFIX = "sha256:"
+INDEX_MAGIC = b"AIMSMRK1"
+_HEADER = struct.Struct(">8sQ")
+_LEAF_PREFIX = hashlib.sha256(b"\x00")
+_NODE_PREFIX = hashlib.sha256(b"\x01")
+_BLOCK_PAIRS = 32_768
+
+StrPath = str | os.PathLike[str]
+
+
+def leaf_hash(record: bytes) -> bytes:
+    """Hash a record into a leaf digest."""
+    digest = _LEAF_PREFIX.copy()
+    digest.update(record)
+    return digest.digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    """Hash two child digests into their parent digest."""
+    digest = _NODE_PREFIX.copy()
+    digest.update(left)
+    digest.update(right)
+    return digest.digest()
+
+
+def encode_root(root: bytes) -> str:
+    """Encode a root digest as ``sha256:<hex>``."""
+    return ROOT_PREFIX + root.hex()
+
+
+def decode_root(root: str) -> bytes:
+    """Decode a ``sha256:<hex>`` root.
+
+    Raises:
+        ValueError: If the root is not a sha256 digest
+    """
+    if not root.startswith(ROOT_PREFIX):
+        raise ValueError(f"Unsupported Merkle root algorithm: {root.split(':', 1)[0]}")
+    raw = bytes.fromhex(root.removeprefix(ROOT_PREFIX))
+    if len(raw) != DIGEST_SIZE:
+        raise ValueError("Merkle root must be a 32-byte digest")
+    return raw
+
+
+def level_sizes(leaf_count: int) -> list[int]:
+    """Number of nodes on each level, from the leaves up to the root."""
+    sizes = [leaf_count]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+def _parent_level(level: bytes) -> bytes:
+    """Hash an even-length run of digests pairwise (or promote a lone trailing digest)."""
+    out = bytearray()
+    for offset in range(0, len(level) - DIGEST_SIZE, 2 * DIGEST_SIZE):
+        out += node_hash(
+            level[offset : offset + DIGEST_SIZE],
+            level[offset + DIGEST_SIZE : offset + 2 * DIGEST_SIZE],
+        )
+    if (len(level) // DIGEST_SIZE) % 2:
+        out += level[-DIGEST_SIZE:]
+    return bytes(out)
+
+
+def merkle_root(records: Iterable[bytes]) -> str:
+    """Compute the Merkle root of records held in memory.
+
+    Convenient for small record sets; use :func:`build_index` for corpora.
+
+    Raises:
+        ValueError: If there are no records
+    """
+    level = b"".join(leaf_hash(record) for record in records)
+    if not level:
+        raise ValueError("Cannot compute a Merkle root over zero records")
+    while len(level) > DIGEST_SIZE:
+        level = _parent_level(level)
+    return encode_root(level)
+
+
+def _hash_range(path: str, start: int, end: int) -> bytes:
+    """Leaf digests of the newline-separated records in ``path[start:end]``."""
+    out = bytearray()
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            pos = start
+            while pos < end:
+                newline = mm.find(b"\n", pos, end)
+                if newline == -1:
+                    newline = end
+                digest = _LEAF_PREFIX.copy()
+                digest.update(view[pos:newline])
+                out += digest.digest()
+                pos = newline + 1
+        finally:
+            view.release()
+    return bytes(out)
+
+
+def _record_ranges(path: str, chunk_size: int) -> Iterator[tuple[str, int, int]]:
+    """Split a record file into chunks ending on record boundaries."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = mm.find(b"\n", min(start + chunk_size, size) - 1)
+            end = size if end == -1 else end + 1
+            yield path, start, end
+            start = end
+
+
+@dataclass(frozen=True)
+class MerkleProof:
+    """Inclusion proof for one leaf.
+
+    Attributes:
+        leaf_index: Position of the record among all leaves
+        leaf_count: Total number of leaves in the tree
+        siblings: Sibling digests from the leaf level upwards (promoted levels skipped)
+    """
+
+    leaf_index: int
+    leaf_count: int
+    siblings: tuple[bytes, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-friendly form for handing to an auditor."""
+        return {
+            "leaf_index": self.leaf_index,
+            "leaf_count": self.leaf_count,
+            "siblings": [sibling.hex() for sibling in self.siblings],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Inverse of :meth:`to_dict`."""
+        return cls(
+            leaf_index=int(data["leaf_index"]),
+            leaf_count=int(data["leaf_count"]),
+            siblings=tuple(bytes.fromhex(sibling) for sibling in data["siblings"]),
+        )
+
+
+def verify_proof(record: bytes, proof: MerkleProof, root: str) -> bool:
+    """Check that ``record`` is the proof's leaf in the tree with ``root``.
+
+    Args:
+        record: The disclosed record (without its trailing newline)
+        proof: Inclusion proof from :meth:`MerkleIndex.proof`
+        root: Committed root, ``sha256:<hex>``
+
+    Returns:
+        True if the proof is valid for this record and root
+    """
+    if not 0 <= proof.leaf_index < proof.leaf_count:
+        return False
+    digest = leaf_hash(record)
+    index, size = proof.leaf_index, proof.leaf_count
+    siblings = iter(proof.siblings)
+    try:
+        while size > 1:
+            if index % 2:
+                digest = node_hash(next(siblings), digest)
+            elif index + 1 < size:
+                digest = node_hash(digest, next(siblings))
+            index //= 2
+            size = (size + 1) // 2
+    except StopIteration:
+        return False
+    if next(siblings, None) is not None:
+        return False
+    try:
+        return digest == decode_root(root)
+    except ValueError:
+        return False
+
+
+class MerkleIndex:
+    """Read-only view over a Merkle level index written by :func:`build_index`.
+
+    The file is memory-mapped; proofs read one digest per level.
+    """
+
+    def __init__(self, path: StrPath):
+        """Open an index file.
+
+        Raises:
+            ValueError: If the file is not a Merkle index
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Not a Merkle index: {self.path}") from None
+        magic, self.leaf_count = _HEADER.unpack_from(self._mm, 0)
+        sizes = level_sizes(self.leaf_count)
+        if magic != INDEX_MAGIC or len(self._mm) != _HEADER.size + sum(sizes) * DIGEST_SIZE:
+            self.close()
+            raise ValueError(f"Not a Merkle index: {self.path}")
+        self._levels: list[tuple[int, int]] = []
+        offset = _HEADER.size
+        for size in sizes:
+            self._levels.append((offset, size))
+            offset += size * DIGEST_SIZE
+
+    def close(self) -> None:
+        """Release the mapping and file handle."""
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _digest(self, level: int, index: int) -> bytes:
+        offset = self._levels[level][0] + index * DIGEST_SIZE
+        return self._mm[offset : offset + DIGEST_SIZE]
+
+    @property
+    def root(self) -> str:
+        """The Merkle root, ``sha256:<hex>``."""
+        return encode_root(self._digest(len(self._levels) - 1, 0))
+
+    def leaf(self, index: int) -> bytes:
+        """The leaf digest at ``index``."""
+        if not 0 <= index < self.leaf_count:
+            raise IndexError(f"Leaf index {index} out of range")
+        return self._digest(0, index)
+
+    def proof(self, index: int) -> MerkleProof:
+        """Build the inclusion proof for the leaf at ``index`` in O(log n).
+
+        Raises:
+            IndexError: If the index is out of range
+        """
+        if not 0 <= index < self.leaf_count:
+            raise IndexError(f"Leaf index {index} out of range")
+        siblings = []
+        position = index
+        for level, (_, size) in enumerate(self._levels[:-1]):
+            sibling = position ^ 1
+            if sibling < size:
+                siblings.append(self._digest(level, sibling))
+            position //= 2
+        return MerkleProof(leaf_index=index, leaf_count=self.leaf_count, siblings=tuple(siblings))
+
+
+def _available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _leaf_digests(
+    ranges: Iterator[tuple[str, int, int]], executor: Executor | None, max_pending: int
+) -> Iterator[bytes]:
+    """Yield leaf digest blocks in input order, keeping at most ``max_pending`` chunks queued."""
+    if executor is None:
+        for path, start, end in ranges:
+            yield _hash_range(path, start, end)
+        return
+    pending: deque[Future[bytes]] = deque()
+    for path, start, end in ranges:
+        pending.append(executor.submit(_hash_range, path, start, end))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def build_index(
+    paths: Sequence[StrPath],
+    index_path: StrPath,
+    *,
+    workers: int | None = None,
+    chunk_size: int = 4 * 1024 * 1024,
+) -> MerkleIndex:
+    """Build a Merkle tree over record files and write its level index.
+
+    Args:
+        paths: Record files, hashed in order; each line is one record
+        index_path: Where to write the level index
+        workers: Leaf-hashing processes (defaults to the usable CPU count; 1 hashes inline)
+        chunk_size: Approximate bytes of records per work unit
+
+    Returns:
+        The opened index
+
+    Raises:
+        ValueError: If the files contain no records
+    """
+    workers = workers or _available_cpus()
+    ranges = (r for path in paths for r in _record_ranges(os.fspath(path), chunk_size))
+    index_path = Path(index_path)
+    tmp_path = index_path.with_suffix(index_path.suffix + ".tmp")
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        with open(tmp_path, "w+b") as out:
+            out.write(_HEADER.pack(INDEX_MAGIC, 0))
+            leaf_count = 0
+            for block in _leaf_digests(ranges, executor, max_pending=2 * workers):
+                out.write(block)
+                leaf_count += len(block) // DIGEST_SIZE
+            if leaf_count == 0:
+                raise ValueError("Cannot compute a Merkle root over zero records")
+            _write_upper_levels(out, leaf_count)
+            out.seek(0)
+            out.write(_HEADER.pack(INDEX_MAGIC, leaf_count))
+        os.replace(tmp_path, index_path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        tmp_path.unlink(missing_ok=True)
+    return MerkleIndex(index_path)
+
+
+def _write_upper_levels(out: BinaryIO, leaf_count: int) -> None:
+    """Append every level above the leaves, reading the level below in fixed-size blocks."""
+    block_bytes = 2 * DIGEST_SIZE * _BLOCK_PAIRS
+    level_offset = _HEADER.size
+    for size in level_sizes(leaf_count)[:-1]:
+        out.flush()
+        with open(out.name, "rb") as reader:
+            reader.seek(level_offset)
+            remaining = size * DIGEST_SIZE
+            out.seek(0, os.SEEK_END)
+            while remaining:
+                block = reader.read(min(block_bytes, remaining))
+                remaining -= len(block)
+                out.write(_parent_level(block))
+        level_offset += size * DIGEST_SIZE
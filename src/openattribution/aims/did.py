@@ -9,6 +9,7 @@ Examples:
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Self
 
 
@@ -35,9 +36,13 @@ class AIMSDID:
         return f"did:aims:{self.method}:{self.organization}:{self.system_id}"
 
     @classmethod
+    @lru_cache(maxsize=65_536)
     def parse(cls, did_string: str) -> Self:
         """Parse a DID string into components.
 
+        Results are memoized (AIMSDID is immutable), so routing code can
+        parse the same DID repeatedly at the cost of a dict lookup.
+
         Args:
             did_string: A full DID string like 'did:aims:web:example.com:my-agent'
 
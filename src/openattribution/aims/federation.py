@@ -0,0 +1,240 @@
+"""Federated resolution across multiple manifest stores.
+
+SPECIFICATION.md §4.2 describes manifest stores as federated: resolvers can
+query several stores. :class:`FederatedResolver` tries stores in
+``ManifestStoreConfig.priority`` order and hedges: when the store being
+waited on runs past its usual latency, the request is also sent to the next
+store and the first valid answer wins. Per-store health and latency are
+tracked so failing or slow stores are demoted automatically.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Self
+
+from .manifest import AIManifest
+from .store import ManifestStore, ManifestStoreConfig
+
+
+class ManifestMismatchError(ValueError):
+    """A store answered with a manifest for a different DID."""
+
+
+@dataclass
+class StoreHealth:
+    """Rolling health and latency statistics for one store.
+
+    Attributes:
+        latencies: Recent successful request latencies in seconds
+        successes: Total successful requests
+        failures: Total failed requests
+        consecutive_failures: Failures since the last success
+        demoted_until: Monotonic time until which the store is demoted for failing
+    """
+
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=128))
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    demoted_until: float = 0.0
+
+    def record_success(self, latency: float) -> None:
+        """Record a request that produced an answer (including not-found)."""
+        self.latencies.append(latency)
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.demoted_until = 0.0
+
+    def record_failure(self, now: float, threshold: int, period: float) -> None:
+        """Record a failed request, demoting the store after ``threshold`` in a row."""
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= threshold:
+            self.demoted_until = now + period
+
+    def percentile(self, q: float) -> float | None:
+        """Latency at quantile ``q`` (0-1) over the recent window, if any samples exist."""
+        if not self.latencies:
+            return None
+        samples = sorted(self.latencies)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+@dataclass
+class FederatedStore:
+    """A configured store with its client and health record."""
+
+    config: ManifestStoreConfig
+    store: ManifestStore
+    health: StoreHealth = field(default_factory=StoreHealth)
+
+
+class FederatedResolver:
+    """Resolve manifests across several federated stores with hedged requests.
+
+    Stores are ranked by priority (higher first). A store is demoted below
+    every healthy store after ``failure_threshold`` consecutive failures
+    (for ``demotion_period`` seconds), or while its median latency exceeds
+    ``slow_threshold``. Among stores of equal priority, the faster one is
+    tried first.
+
+    Example:
+        resolver = FederatedResolver([
+            ManifestStoreConfig(url="https://aims.openattribution.org", priority=10),
+            ManifestStoreConfig(url="https://mirror.example.com", name="mirror"),
+        ])
+        async with resolver:
+            manifest = await resolver.resolve("did:aims:web:example.com:agent")
+    """
+
+    def __init__(
+        self,
+        configs: Iterable[ManifestStoreConfig],
+        *,
+        hedge_percentile: float = 0.95,
+        hedge_delay: float = 0.1,
+        min_hedge_delay: float = 0.005,
+        failure_threshold: int = 3,
+        demotion_period: float = 30.0,
+        slow_threshold: float = 2.0,
+        store_factory: Callable[[ManifestStoreConfig], ManifestStore] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        **store_options: Any,
+    ):
+        """Initialize the resolver.
+
+        Args:
+            configs: The stores to federate
+            hedge_percentile: Latency quantile after which the next store is also queried
+            hedge_delay: Hedge delay used before a store has any latency samples
+            min_hedge_delay: Lower bound for the hedge delay
+            failure_threshold: Consecutive failures before a store is demoted
+            demotion_period: Seconds a failing store stays demoted
+            slow_threshold: Median latency in seconds above which a store is demoted
+            store_factory: Builds the client for each config (defaults to ManifestStore)
+            clock: Monotonic time source, overridable for testing
+            **store_options: Extra keyword arguments for the default ManifestStore factory
+        """
+        configs = list(configs)
+        if not configs:
+            raise ValueError("at least one store config is required")
+        if store_factory is None:
+
+            def store_factory(config: ManifestStoreConfig) -> ManifestStore:
+                return ManifestStore(config.url, **store_options)
+
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.failure_threshold = failure_threshold
+        self.demotion_period = demotion_period
+        self.slow_threshold = slow_threshold
+        self.clock = clock
+        self.stores = [FederatedStore(config, store_factory(config)) for config in configs]
+
+    def ranked(self) -> list[FederatedStore]:
+        """Return the stores in the order they will be tried."""
+        now = self.clock()
+
+        def rank(entry: FederatedStore) -> tuple[bool, int, float]:
+            median = entry.health.percentile(0.5)
+            demoted = entry.health.demoted_until > now or (
+                median is not None and median > self.slow_threshold
+            )
+            return demoted, -entry.config.priority, median if median is not None else 0.0
+
+        return sorted(self.stores, key=rank)
+
+    def _hedge_after(self, entry: FederatedStore) -> float:
+        latency = entry.health.percentile(self.hedge_percentile)
+        if latency is None:
+            latency = self.hedge_delay
+        return max(self.min_hedge_delay, latency)
+
+    async def _attempt(self, entry: FederatedStore, did: str) -> AIManifest | None:
+        start = self.clock()
+        try:
+            manifest = await entry.store.resolve(did)
+            if manifest is not None and manifest.did != did:
+                raise ManifestMismatchError(
+                    f"Store {entry.config.name!r} returned {manifest.did} for {did}"
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            entry.health.record_failure(self.clock(), self.failure_threshold, self.demotion_period)
+            raise
+        entry.health.record_success(self.clock() - start)
+        return manifest
+
+    async def resolve(self, did: str) -> AIManifest | None:
+        """Resolve a DID across the federation.
+
+        Args:
+            did: The DID to resolve
+
+        Returns:
+            The first valid manifest returned by any store, or None if every
+            store that answered reported the DID as not found
+
+        Raises:
+            Exception: The last store error, if no store produced an answer
+        """
+        queue = self.ranked()
+        pending: dict[asyncio.Task[AIManifest | None], FederatedStore] = {}
+        not_found = False
+        last_error: Exception | None = None
+
+        def launch() -> FederatedStore:
+            entry = queue.pop(0)
+            pending[asyncio.create_task(self._attempt(entry, did))] = entry
+            return entry
+
+        waiting_on = launch()
+        try:
+            while pending:
+                timeout = self._hedge_after(waiting_on) if queue else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    del pending[task]
+                    try:
+                        manifest = task.result()
+                    except Exception as exc:
+                        last_error = exc
+                        continue
+                    if manifest is not None:
+                        return manifest
+                    not_found = True
+                if queue and (not done or not pending):
+                    # Hedge on timeout; move on immediately once nothing is in flight.
+                    waiting_on = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if not_found or last_error is None:
+            return None
+        raise last_error
+
+    async def aclose(self) -> None:
+        """Close every store's connection pool."""
+        await asyncio.gather(*(entry.store.aclose() for entry in self.stores))
+
+    async def __aenter__(self) -> Self:
+        """Enter the resolver's context."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close every store's connection pool."""
+        await self.aclose()
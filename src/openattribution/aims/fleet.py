@@ -0,0 +1,807 @@
+"""Fleet snapshot - Columnar tables for compliance queries over many manifests.
+
+Compliance reporting in the style of SPECIFICATION.md §11.3 asks questions
+of a whole fleet of mirrored manifests at once, for example "which systems
+claim no RSL compliance yet allow unrestricted redistribution?" or "which
+licensed sources expire in the next 30 days?". Answering them by looping
+over hundreds of thousands of ``AIManifest`` objects is slow, and every
+object has to stay in memory. A :class:`FleetSnapshot` flattens each
+manifest once into four columnar tables:
+
+- ``systems``: one row per manifest (DID, content hash, operator, parent
+  model, redistribution policy, RSL compliance, timestamps)
+- ``sources``: one row per licensed source (identifier, license type,
+  scope, expiry)
+- ``datasets``: one row per training dataset (identifier, license, RSL
+  compliance)
+- ``affiliations``: one row per brand affiliation (brand, relationship,
+  influence type)
+
+Each column is a typed ``array``:
+
+- Strings are dictionary-encoded as ``uint32`` codes into one shared string
+  table.
+- The redistribution policy is a ``uint8`` enum code and flags are bytes.
+- Timestamps are ``float64`` epoch seconds. As in
+  :func:`~.policy.parse_expiry`, a source with no expiry never expires
+  (``+inf``) and an unparseable expiry has already expired (``-inf``).
+
+Queries work on whole columns at a time. A filter makes one C-level pass
+over its column and returns a :class:`Mask` with one byte per row. Masks
+combine with ``&``, ``|`` and ``~`` as single integer operations over the
+table. Aggregates count codes under a mask, decoding only the distinct
+values they return. Timestamp columns also keep a sorted row order, so a
+date range costs two binary searches plus one step per matching row.
+Child tables join to ``systems`` through their ``system`` column.
+
+Appending a newer manifest for a DID supersedes that DID's earlier rows.
+The old rows stay in the tables but drop out of every query. Appending an
+unchanged manifest does nothing. :meth:`FleetSnapshot.save` writes every
+table to one file, and :meth:`FleetSnapshot.load` memory-maps it back.
+Opening a snapshot therefore does no per-row work, and columns are paged
+in only when a query reads them.
+
+Snapshot file layout (header big-endian, arrays in the writer's byte order)::
+
+    b"AIMSFLT1" | meta_len: u64 | meta JSON | 8-byte aligned sections
+
+Example:
+    snapshot = FleetSnapshot.from_manifests(read_manifests("fleet.jsonl.gz"))
+    systems = snapshot.systems
+    risky = systems.eq("rsl_compliance", False) & systems.eq(
+        "redistribution_policy", "unrestricted"
+    )
+    print(systems.values("did", risky))
+
+    now = datetime.now(UTC)
+    sources = snapshot.sources
+    expiring = sources.between("expires_at", now, now + timedelta(days=30))
+    print(sources.count_by("system", expiring))
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
+from itertools import compress
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
+
+from .layers.content_access import RedistributionPolicy
+from .manifest import AIManifest
+from .policy import parse_expiry
+
+StrPath = str | os.PathLike[str]
+
+FLEET_MAGIC = b"AIMSFLT1"
+_HEADER = struct.Struct(">8sQ")
+_ALIGN = 8
+
+SCHEMA: dict[str, dict[str, str]] = {
+    "systems": {
+        "did": "str",
+        "content_hash": "str",
+        "operator": "str",
+        "parent_model": "str",
+        "redistribution_policy": "enum",
+        "rsl_compliance": "bool",
+        "created_at": "time",
+        "updated_at": "time",
+        "live": "bool",
+    },
+    "sources": {
+        "system": "ref",
+        "identifier": "str",
+        "license_type": "str",
+        "scope": "str",
+        "expires_at": "time",
+    },
+    "datasets": {
+        "system": "ref",
+        "identifier": "str",
+        "license": "str",
+        "rsl_compliant": "bool",
+    },
+    "affiliations": {
+        "system": "ref",
+        "brand": "str",
+        "relationship": "str",
+        "influence_type": "str",
+    },
+}
+"""Column kinds per table.
+
+Kinds are ``str`` (string code, 0 for None), ``enum`` (index into the
+column's labels), ``bool`` (0, 1, or 2 for None), ``time`` (epoch seconds)
+and ``ref`` (row number in ``systems``). ``systems.live`` is 0 for rows a
+newer manifest has superseded.
+"""
+
+_TYPECODES = {"str": "I", "enum": "B", "bool": "B", "time": "d", "ref": "I"}
+_ENUMS: dict[str, tuple[str, ...]] = {
+    "redistribution_policy": tuple(RedistributionPolicy),
+}
+_BOOLS = (False, True, None)
+_FLIP = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+def _seconds(value: datetime | float | None) -> float:
+    """Epoch seconds for a timestamp; naive datetimes are taken as UTC."""
+    if value is None:
+        return math.inf
+    if not isinstance(value, datetime):
+        return float(value)
+    naive = value.replace(tzinfo=None)
+    if naive == datetime.max:
+        return math.inf
+    if naive == datetime.min:
+        return -math.inf
+    return (value if value.tzinfo is not None else value.replace(tzinfo=UTC)).timestamp()
+
+
+def _datetime(seconds: float) -> datetime:
+    if seconds == math.inf:
+        return datetime.max.replace(tzinfo=UTC)
+    if seconds == -math.inf:
+        return datetime.min.replace(tzinfo=UTC)
+    return datetime.fromtimestamp(seconds, UTC)
+
+
+def _and(left: bytes, right: bytes) -> bytes:
+    """AND two 0/1 byte masks in one big-integer operation."""
+    value = int.from_bytes(left, "little") & int.from_bytes(right, "little")
+    return value.to_bytes(len(left), "little")
+
+
+def _or(left: bytes, right: bytes) -> bytes:
+    value = int.from_bytes(left, "little") | int.from_bytes(right, "little")
+    return value.to_bytes(len(left), "little")
+
+
+def _padded(size: int) -> int:
+    return -(-size // _ALIGN) * _ALIGN
+
+
+def _empty_columns() -> dict[str, dict[str, Any]]:
+    return {
+        table: {name: array(_TYPECODES[kind]) for name, kind in kinds.items()}
+        for table, kinds in SCHEMA.items()
+    }
+
+
+def _in_memory(column: Any) -> array:
+    """A growable copy of a column mapped from a file."""
+    if not isinstance(column, memoryview):
+        return column
+    copy = array(column.format)
+    copy.frombytes(column.cast("B"))
+    return copy
+
+
+class _Strings:
+    """The shared string dictionary. Code 0 is None; codes 1.. are strings.
+
+    A loaded dictionary reads strings straight out of the mapped file. It is
+    a NUL-separated blob with an offsets array. Lookups by value search the
+    blob, so a query never has to decode the whole dictionary.
+    """
+
+    def __init__(
+        self,
+        strings: Iterable[str] = (),
+        blob: Any = None,
+        span: tuple[int, int] = (0, 0),
+        offsets: Sequence[int] = (),
+    ):
+        self._added: list[str] = list(strings)
+        self._codes = {value: code for code, value in enumerate(self._added, 1)}
+        self._blob = blob
+        self._span = span
+        self._offsets = offsets
+        self._base = max(len(offsets) - 1, 0)
+        self._decoded: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return self._base + len(self._added)
+
+    def get(self, code: int) -> str | None:
+        """Decode a string code."""
+        if code == 0:
+            return None
+        if code > self._base:
+            return self._added[code - self._base - 1]
+        value = self._decoded.get(code)
+        if value is None:
+            start = self._span[0] + self._offsets[code - 1]
+            end = self._span[0] + self._offsets[code] - 1
+            value = self._decoded[code] = str(self._blob[start:end], "utf-8")
+        return value
+
+    def find(self, value: str | None) -> int | None:
+        """Code for a string, or None if no row holds it."""
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None and self._base:
+            code = self._search(value)
+            if code is not None:
+                self._codes[value] = code
+        return code
+
+    def _search(self, value: str) -> int | None:
+        encoded = value.encode()
+        needle = b"\0" + encoded + b"\0"
+        start, end = self._span
+        position = self._blob.find(needle, start, end)
+        while position != -1:
+            # A NUL inside a string could make the needle straddle two
+            # entries, so check it lines up with one entry exactly.
+            offset = position + 1 - start
+            index = bisect_left(self._offsets, offset)
+            if (
+                index < self._base
+                and self._offsets[index] == offset
+                and self._offsets[index + 1] - 1 == offset + len(encoded)
+            ):
+                return index + 1
+            position = self._blob.find(needle, position + 1, end)
+        return None
+
+    def intern(self, value: str | None) -> int:
+        """Code for a string, adding it if new. Only valid once detached."""
+        code = self.find(value)
+        if code is None:
+            self._added.append(value)  # type: ignore[arg-type]
+            code = self._codes[value] = len(self)  # type: ignore[index]
+        return code
+
+    def detached(self) -> "_Strings":
+        """An in-memory copy that no longer refers to the mapped file."""
+        return _Strings(self.get(code) for code in range(1, len(self) + 1))  # type: ignore[misc]
+
+    def dump(self) -> tuple[array, bytes]:
+        """Offsets and blob for saving."""
+        encoded = [self.get(code).encode() for code in range(1, len(self) + 1)]  # type: ignore[union-attr]
+        offsets = array("Q", [1])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value) + 1)
+        return offsets, b"\0" + b"\0".join(encoded) + b"\0"
+
+
+class Mask:
+    """Selected rows of one table: one byte per row, 1 if selected.
+
+    Masks only ever select current rows; ``~mask`` selects the other
+    current rows, not superseded ones.
+    """
+
+    __slots__ = ("bits", "_live")
+
+    def __init__(self, bits: bytes, live: bytes):
+        self.bits = bits
+        self._live = live
+
+    def _same_table(self, other: "Mask") -> "Mask":
+        if not isinstance(other, Mask) or other._live is not self._live:
+            raise ValueError("Masks must come from the same table of the same snapshot state")
+        return other
+
+    def __and__(self, other: "Mask") -> "Mask":
+        return Mask(_and(self.bits, self._same_table(other).bits), self._live)
+
+    def __or__(self, other: "Mask") -> "Mask":
+        return Mask(_or(self.bits, self._same_table(other).bits), self._live)
+
+    def __invert__(self) -> "Mask":
+        return Mask(_and(self.bits.translate(_FLIP), self._live), self._live)
+
+    def __len__(self) -> int:
+        return len(self.bits)
+
+    def count(self) -> int:
+        """Number of selected rows."""
+        return self.bits.count(1)
+
+    def indices(self) -> list[int]:
+        """Row numbers of the selected rows."""
+        return list(compress(range(len(self.bits)), self.bits))
+
+
+class Table:
+    """One columnar table of a :class:`FleetSnapshot`.
+
+    Filters return a :class:`Mask`. Methods that take an optional ``mask``
+    read every current row when it is omitted.
+    """
+
+    def __init__(self, snapshot: "FleetSnapshot", name: str):
+        self._snapshot = snapshot
+        self.name = name
+        self._kinds = SCHEMA[name]
+
+    def __len__(self) -> int:
+        """Rows stored, including superseded ones."""
+        return self._snapshot._row_count(self.name)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return tuple(self._kinds)
+
+    def column(self, name: str) -> Sequence[Any]:
+        """The raw codes of a column.
+
+        For a loaded snapshot this is a view into the mapping, valid until
+        the snapshot is closed or appended to.
+        """
+        self._kind(name)
+        return self._snapshot._columns[self.name][name]
+
+    def _kind(self, name: str) -> str:
+        kind = self._kinds.get(name)
+        if kind is None:
+            raise KeyError(f"No column {name!r} in {self.name}")
+        return kind
+
+    def all(self) -> Mask:
+        """Every current row."""
+        live = self._snapshot._live(self.name)
+        return Mask(live, live)
+
+    def _mask(self, bits: bytes) -> Mask:
+        live = self._snapshot._live(self.name)
+        return Mask(_and(bits, live), live)
+
+    def _bits(self, mask: Mask | None) -> bytes:
+        if mask is None:
+            return self._snapshot._live(self.name)
+        return self.all()._same_table(mask).bits
+
+    def _encode(self, name: str, value: Any) -> int | float | None:
+        """Column code for a value, or None if no row can hold it."""
+        kind = self._kind(name)
+        if kind == "str":
+            return self._snapshot._strings.find(value)
+        if kind == "enum":
+            return _ENUMS[name].index(RedistributionPolicy(value))
+        if kind == "bool":
+            return _BOOLS.index(value)
+        if kind == "time":
+            return _seconds(value)
+        return self._snapshot._current().get(value)
+
+    def _decoder(self, name: str) -> Any:
+        kind = self._kind(name)
+        if kind == "str":
+            return self._snapshot._strings.get
+        if kind == "enum":
+            return _ENUMS[name].__getitem__
+        if kind == "bool":
+            return _BOOLS.__getitem__
+        if kind == "time":
+            return _datetime
+        dids = self._snapshot._columns["systems"]["did"]
+        get = self._snapshot._strings.get
+        return lambda row: get(dids[row])
+
+    def eq(self, column: str, value: Any) -> Mask:
+        """Rows whose ``column`` equals ``value`` (None matches missing values)."""
+        return self.isin(column, (value,))
+
+    def isin(self, column: str, values: Iterable[Any]) -> Mask:
+        """Rows whose ``column`` is any of ``values``."""
+        codes = {self._encode(column, value) for value in values}
+        codes.discard(None)
+        data = self.column(column)
+        if self._kinds[column] in ("enum", "bool"):
+            table = bytes(code in codes for code in range(256))
+            return self._mask(bytes(data).translate(table))
+        if len(codes) == 1:
+            return self._mask(bytes(map(codes.pop().__eq__, data)))
+        return self._mask(bytes(map(frozenset(codes).__contains__, data)))
+
+    def between(
+        self,
+        column: str,
+        low: datetime | float | None = None,
+        high: datetime | float | None = None,
+    ) -> Mask:
+        """Rows of a timestamp column with ``low <= value < high``.
+
+        Either bound may be omitted. Sources that never expire sort after
+        every date, so only an open ``high`` includes them; unparseable
+        expiries sort before every date. Costs two binary searches over the
+        column's sorted row order plus one step per matching row.
+        """
+        if self._kind(column) != "time":
+            raise ValueError(f"{self.name}.{column} is not a timestamp column")
+        data = self.column(column)
+        key = data.__getitem__
+        order = self._snapshot._order(self.name, column)
+        lowest = -math.inf if low is None else _seconds(low)
+        highest = math.inf if high is None else _seconds(high)
+        start = 0 if low is None else bisect_left(order, lowest, key=key)
+        stop = len(order) if high is None else bisect_left(order, highest, key=key)
+        bits = bytearray(len(data))
+        for row in order[start:stop]:
+            bits[row] = 1
+        # Rows appended since the order was built are not in it yet.
+        for row in range(len(order), len(data)):
+            if lowest <= data[row] and (high is None or data[row] < highest):
+                bits[row] = 1
+        return self._mask(bytes(bits))
+
+    def count(self, mask: Mask | None = None) -> int:
+        """Number of current rows, or of rows selected by ``mask``."""
+        return self._bits(mask).count(1)
+
+    def values(self, column: str, mask: Mask | None = None) -> list[Any]:
+        """Decoded values of ``column`` for the selected rows, in row order."""
+        decode = self._decoder(column)
+        return list(map(decode, compress(self.column(column), self._bits(mask))))
+
+    def count_by(self, column: str, mask: Mask | None = None) -> dict[Any, int]:
+        """Selected rows per distinct value of ``column``, most common first."""
+        decode = self._decoder(column)
+        counts = Counter(compress(self.column(column), self._bits(mask)))
+        return {decode(code): count for code, count in counts.most_common()}
+
+    def records(
+        self, mask: Mask | None = None, columns: Sequence[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Selected rows as dicts (``live`` is left out unless asked for)."""
+        names = columns or [name for name in self._kinds if name != "live"]
+        decoded = [self.values(name, mask) for name in names]
+        return [dict(zip(names, row, strict=True)) for row in zip(*decoded, strict=True)]
+
+    def of_systems(self, systems: Mask) -> Mask:
+        """Rows of this child table that belong to the systems selected in ``systems``."""
+        if self.name == "systems":
+            raise ValueError("of_systems() joins a child table to systems")
+        selected = self._snapshot.systems._bits(systems)
+        return self._mask(bytes(map(selected.__getitem__, self.column("system"))))
+
+    def systems(self, mask: Mask | None = None) -> Mask:
+        """The systems that own at least one row selected in this child table."""
+        if self.name == "systems":
+            raise ValueError("systems() joins a child table to systems")
+        rows = set(compress(self.column("system"), self._bits(mask)))
+        table = self._snapshot.systems
+        return table._mask(bytes(map(rows.__contains__, range(len(table)))))
+
+
+class FleetSnapshot:
+    """Columnar tables over a fleet of manifests, one current version per DID.
+
+    Not thread-safe; give each thread its own snapshot, or load the same
+    file once per thread.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty snapshot."""
+        self._columns = _empty_columns()
+        self._strings = _Strings()
+        self._rows: dict[str, int] | None = {}
+        self._generation = 0
+        self._live_bits: dict[str, tuple[int, bytes]] = {}
+        self._orders: dict[tuple[str, str], Sequence[int]] = {}
+        self._file: Any = None
+        self._mmap: mmap.mmap | None = None
+        self.systems = Table(self, "systems")
+        self.sources = Table(self, "sources")
+        self.datasets = Table(self, "datasets")
+        self.affiliations = Table(self, "affiliations")
+
+    @classmethod
+    def from_manifests(cls, manifests: Iterable[AIManifest]) -> Self:
+        """Build a snapshot, streaming through ``manifests`` once."""
+        snapshot = cls()
+        snapshot.extend(manifests)
+        return snapshot
+
+    def __len__(self) -> int:
+        """Number of DIDs."""
+        return len(self._current())
+
+    def __contains__(self, did: object) -> bool:
+        return did in self._current()
+
+    def _current(self) -> dict[str, int]:
+        """DID -> its current systems row, built on first use after a load."""
+        if self._rows is None:
+            systems = self._columns["systems"]
+            get = self._strings.get
+            self._rows = {
+                get(code): row  # type: ignore[misc]
+                for row, code in compress(enumerate(systems["did"]), systems["live"])
+            }
+        return self._rows
+
+    def _row_count(self, table: str) -> int:
+        return len(self._columns[table]["live" if table == "systems" else "system"])
+
+    def _live(self, table: str) -> bytes:
+        """One byte per row of ``table``: 1 if it belongs to a current manifest."""
+        cached = self._live_bits.get(table)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1]
+        systems = bytes(self._columns["systems"]["live"])
+        if table == "systems":
+            bits = systems
+        else:
+            bits = bytes(map(systems.__getitem__, self._columns[table]["system"]))
+        self._live_bits[table] = (self._generation, bits)
+        return bits
+
+    def _order(self, table: str, column: str, complete: bool = False) -> Sequence[int]:
+        """Row numbers sorted by a timestamp column.
+
+        The order may cover only a prefix of the table. Rows appended since
+        it was built are left out until they make up a quarter of the table,
+        or until ``complete`` is set.
+        """
+        order = self._orders.get((table, column))
+        rows = self._row_count(table)
+        missing = rows - len(order) if order is not None else rows
+        if order is None or missing * 4 > rows or (complete and missing):
+            data = self._columns[table][column]
+            order = array("I", sorted(range(rows), key=data.__getitem__))
+            self._orders[(table, column)] = order
+        return order
+
+    def append(self, manifest: AIManifest) -> bool:
+        """Add a manifest, superseding any earlier one for its DID.
+
+        Returns:
+            False if the DID's current manifest has the same content hash
+        """
+        current = self._current()
+        did = manifest.did
+        previous = current.get(did)
+        content_hash = manifest.content_hash
+        if previous is not None:
+            stored = self._columns["systems"]["content_hash"][previous]
+            if self._strings.find(content_hash) == stored:
+                return False
+        self._writable()
+        intern = self._strings.intern
+        systems = self._columns["systems"]
+        if previous is not None:
+            systems["live"][previous] = 0
+        row = len(systems["did"])
+
+        foundation = manifest.foundation
+        access = manifest.content_access
+        systems["did"].append(intern(did))
+        systems["content_hash"].append(intern(content_hash))
+        systems["operator"].append(intern(manifest.deployment.operator))
+        systems["parent_model"].append(intern(foundation.parent_model))
+        systems["redistribution_policy"].append(
+            _ENUMS["redistribution_policy"].index(access.redistribution_policy)
+        )
+        systems["rsl_compliance"].append(foundation.rsl_compliance)
+        systems["created_at"].append(_seconds(manifest.created_at))
+        systems["updated_at"].append(_seconds(manifest.updated_at))
+        systems["live"].append(1)
+
+        sources = self._columns["sources"]
+        detailed = set()
+        for detail in access.source_details:
+            detailed.add(detail.identifier)
+            sources["system"].append(row)
+            sources["identifier"].append(intern(detail.identifier))
+            sources["license_type"].append(intern(detail.license_type))
+            sources["scope"].append(intern(detail.scope))
+            sources["expires_at"].append(_seconds(parse_expiry(detail.expires_at)))
+        for identifier in dict.fromkeys(access.licensed_sources):
+            if identifier not in detailed:
+                sources["system"].append(row)
+                sources["identifier"].append(intern(identifier))
+                sources["license_type"].append(0)
+                sources["scope"].append(0)
+                sources["expires_at"].append(math.inf)
+
+        datasets = self._columns["datasets"]
+        detailed = set()
+        for reference in foundation.dataset_details:
+            detailed.add(reference.identifier)
+            datasets["system"].append(row)
+            datasets["identifier"].append(intern(reference.identifier))
+            datasets["license"].append(intern(reference.license))
+            datasets["rsl_compliant"].append(reference.rsl_compliant)
+        for identifier in dict.fromkeys(foundation.training_datasets):
+            if identifier not in detailed:
+                datasets["system"].append(row)
+                datasets["identifier"].append(intern(identifier))
+                datasets["license"].append(0)
+                datasets["rsl_compliant"].append(_BOOLS.index(None))
+
+        affiliations = self._columns["affiliations"]
+        for affiliation in manifest.deployment.brand_affiliations:
+            affiliations["system"].append(row)
+            affiliations["brand"].append(intern(affiliation.brand))
+            affiliations["relationship"].append(intern(affiliation.relationship))
+            affiliations["influence_type"].append(intern(affiliation.influence_type))
+
+        current[did] = row
+        self._generation += 1
+        return True
+
+    def extend(self, manifests: Iterable[AIManifest]) -> int:
+        """Append manifests in order.
+
+        Returns:
+            How many were added (unchanged manifests are skipped)
+        """
+        return sum(self.append(manifest) for manifest in manifests)
+
+    def _writable(self) -> None:
+        """Copy mapped columns into memory so they can grow, then unmap."""
+        if self._mmap is None:
+            return
+        # No reference to a view may outlive this loop, or unmapping fails.
+        for columns in self._columns.values():
+            for name in columns:
+                columns[name] = _in_memory(columns[name])
+        for key in self._orders:
+            self._orders[key] = _in_memory(self._orders[key])
+        self._strings = self._strings.detached()
+        self._current()
+        self._unmap()
+
+    def _unmap(self, clear: bool = False) -> None:
+        if clear:
+            self._columns = _empty_columns()
+            self._strings = _Strings()
+            self._rows = {}
+            self._orders = {}
+            self._generation += 1
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def save(self, path: StrPath) -> None:
+        """Write the snapshot to ``path`` atomically.
+
+        Superseded rows are kept, so a loaded snapshot answers queries
+        exactly as this one does. The sorted row order of every timestamp
+        column is saved too.
+        """
+        path = Path(path)
+        offsets, blob = self._strings.dump()
+        sections: list[Any] = [offsets, blob]
+        layout: dict[str, Any] = {
+            "byteorder": sys.byteorder,
+            "enums": _ENUMS,
+            "strings": {"count": len(self._strings), "offsets": 0, "blob": 0, "size": len(blob)},
+            "tables": {},
+        }
+        position = _padded(len(offsets) * offsets.itemsize)
+        layout["strings"]["blob"] = position
+        position += _padded(len(blob))
+        for table, columns in self._columns.items():
+            rows = self._row_count(table)
+            placed = layout["tables"][table] = {"rows": rows, "columns": {}, "orders": {}}
+            for name, column in columns.items():
+                placed["columns"][name] = position
+                sections.append(column)
+                position += _padded(rows * array(_TYPECODES[SCHEMA[table][name]]).itemsize)
+            for name, kind in SCHEMA[table].items():
+                if kind == "time":
+                    placed["orders"][name] = position
+                    sections.append(self._order(table, name, complete=True))
+                    position += _padded(rows * array("I").itemsize)
+        meta = json.dumps(layout, separators=(",", ":")).encode()
+
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        try:
+            with open(tmp_path, "wb") as out:
+                out.write(_HEADER.pack(FLEET_MAGIC, len(meta)))
+                out.write(meta)
+                out.write(b"\0" * (_padded(out.tell()) - out.tell()))
+                for section in sections:
+                    size = memoryview(section).nbytes
+                    out.write(section)
+                    out.write(b"\0" * (_padded(size) - size))
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: StrPath) -> Self:
+        """Memory-map a snapshot written by :meth:`save`.
+
+        Columns are read in place. The first append copies them into memory
+        and releases the file.
+
+        Raises:
+            ValueError: If the file is not a fleet snapshot
+        """
+        path = Path(path)
+        snapshot = cls()
+        file = open(path, "rb")
+        try:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            file.close()
+            raise ValueError(f"Not a fleet snapshot: {path}") from None
+        snapshot._file, snapshot._mmap = file, mm
+        try:
+            snapshot._map(mm)
+            valid = True
+        except (ValueError, KeyError, TypeError, struct.error):
+            valid = False
+        # Unmap outside the handler: the traceback still holds views into the file.
+        if not valid:
+            snapshot._unmap(clear=True)
+            raise ValueError(f"Not a fleet snapshot: {path}")
+        return snapshot
+
+    def _map(self, mm: mmap.mmap) -> None:
+        magic, meta_size = _HEADER.unpack_from(mm, 0)
+        if magic != FLEET_MAGIC:
+            raise ValueError("Bad magic")
+        layout = json.loads(mm[_HEADER.size : _HEADER.size + meta_size])
+        if layout["enums"] != {name: list(labels) for name, labels in _ENUMS.items()}:
+            raise ValueError("Enum labels differ")
+        base = _padded(_HEADER.size + meta_size)
+        native = layout["byteorder"] == sys.byteorder
+        view = memoryview(mm)
+
+        def section(offset: int, typecode: str, count: int) -> Any:
+            start = base + offset
+            end = start + count * array(typecode).itemsize
+            if end > len(mm):
+                raise ValueError("Truncated")
+            if native:
+                return view[start:end].cast(typecode)
+            copy = array(typecode)
+            copy.frombytes(view[start:end])
+            copy.byteswap()
+            return copy
+
+        strings = layout["strings"]
+        start = base + strings["blob"]
+        if start + strings["size"] > len(mm):
+            raise ValueError("Truncated")
+        self._strings = _Strings(
+            blob=mm,
+            span=(start, start + strings["size"]),
+            offsets=section(strings["offsets"], "Q", strings["count"] + 1),
+        )
+        for table, kinds in SCHEMA.items():
+            placed = layout["tables"][table]
+            self._columns[table] = {
+                name: section(placed["columns"][name], _TYPECODES[kind], placed["rows"])
+                for name, kind in kinds.items()
+            }
+            for name, offset in placed["orders"].items():
+                self._orders[(table, name)] = section(offset, "I", placed["rows"])
+        self._rows = None
+
+    def close(self) -> None:
+        """Release the file mapping of a loaded snapshot.
+
+        The snapshot is empty afterwards. Views returned by
+        :meth:`Table.column` must not be held past this point.
+        """
+        self._unmap(clear=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -4,10 +4,35 @@ The three-layer model:
 - Foundation: Training data licensing provenance
 - Deployment: Commercial and operational context
 - ContentAccess: Runtime content access rights
+
+Each layer's module is imported when the layer is first used.
 """
 
-from .foundation import FoundationLayer
-from .deployment import DeploymentLayer
-from .content_access import ContentAccessLayer
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .content_access import ContentAccessLayer
+    from .deployment import DeploymentLayer
+    from .foundation import FoundationLayer
 
 __all__ = ["FoundationLayer", "DeploymentLayer", "ContentAccessLayer"]
+
+_EXPORTS = {
+    "FoundationLayer": ".foundation",
+    "DeploymentLayer": ".deployment",
+    "ContentAccessLayer": ".content_access",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
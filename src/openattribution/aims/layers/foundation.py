@@ -40,3 +40,11 @@ class FoundationLayer(BaseModel):
         None,
         description="Contact for licensing audit requests",
     )
+    parent_model: str | None = Field(
+        None,
+        description="DID of the base model this system was derived from",
+    )
+    derivation_type: str | None = Field(
+        None,
+        description="How the system was derived from its parent (e.g., 'fine-tune')",
+    )
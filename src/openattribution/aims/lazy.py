@@ -0,0 +1,206 @@
+"""Lazy manifests - Read-mostly views validating each layer on first access.
+
+A router deciding what it may share with another agent typically reads a
+manifest's ``did`` and ``content_access.redistribution_policy`` and nothing
+else, yet :meth:`AIManifest.model_validate_json` validates every dataset
+reference and brand affiliation up front. :class:`LazyManifest` keeps the
+raw JSON body instead and validates only the top-level fields plus the
+redistribution policy when it is created. Each of the three layers is
+validated from the body the first time it is read.
+
+Validated layers can be passed through an :class:`InternPool`, which
+replaces every sub-object with a shared copy when an identical one is
+already alive, and interns strings. Manifests held in a cache then share
+one instance of, say, a common ``DatasetReference``. Shared objects must be
+treated as read-only; use :meth:`LazyManifest.to_manifest` to get an
+independent, fully validated :class:`AIManifest`.
+
+:meth:`ManifestStore.resolve_lazy` returns these views, keeping one per
+cache entry with a pool shared across the store.
+
+Example:
+    view = await store.resolve_lazy(did)
+    if view.redistribution_policy is RedistributionPolicy.NONE:
+        ...
+"""
+
+import sys
+import threading
+import weakref
+from typing import Any
+
+from pydantic import BaseModel, Field, create_model
+from pydantic_core import to_json
+
+from .layers import ContentAccessLayer, DeploymentLayer, FoundationLayer
+from .layers.content_access import RedistributionPolicy
+from .manifest import AIManifest
+from .wire import CBOR_MEDIA_TYPE, decode_value, media_type
+
+_LAYERS: dict[str, type[BaseModel]] = {
+    "foundation": FoundationLayer,
+    "deployment": DeploymentLayer,
+    "content_access": ContentAccessLayer,
+}
+
+# One model per layer that validates that layer and ignores the rest of the body.
+_LAYER_MODELS: dict[str, type[BaseModel]] = {
+    name: create_model(f"_{layer.__name__}Only", **{name: (layer, Field(default_factory=layer))})
+    for name, layer in _LAYERS.items()
+}
+
+
+class _PolicyHeader(BaseModel):
+    redistribution_policy: RedistributionPolicy = RedistributionPolicy.SUMMARY_ONLY
+
+
+# AIManifest's top-level fields, with only the policy read from its layers.
+_Header = create_model(
+    "_Header",
+    **{
+        name: (field.annotation, field)
+        for name, field in AIManifest.model_fields.items()
+        if name not in _LAYERS
+    },
+    content_access=(_PolicyHeader, Field(default_factory=_PolicyHeader)),
+)
+
+
+class InternPool:
+    """Deduplicates validated sub-objects across manifests.
+
+    Models are pooled by type and field values and held weakly, so an
+    entry lives only as long as some manifest still uses it. Strings are
+    interned with :func:`sys.intern`. Thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._models: weakref.WeakValueDictionary[tuple[Any, ...], BaseModel] = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def intern(self, value: Any) -> Any:
+        """Return a shared copy of ``value`` (a model, list or string) if one exists."""
+        if type(value) is str:
+            return sys.intern(value)
+        if type(value) is list:
+            return [self.intern(item) for item in value]
+        if isinstance(value, BaseModel):
+            fields = value.__dict__
+            for name, item in fields.items():
+                fields[name] = self.intern(item)
+            key = (type(value), *(_key(item) for item in fields.values()))
+            with self._lock:
+                pooled = self._models.get(key)
+                if pooled is not None:
+                    self.hits += 1
+                    return pooled
+                self._models[key] = value
+        return value
+
+
+def _key(value: Any) -> Any:
+    # Children are interned before their parent, so identity stands in for
+    # equality; a pooled parent keeps its children, and their ids, alive.
+    if isinstance(value, BaseModel):
+        return id(value)
+    if type(value) is list:
+        return tuple(_key(item) for item in value)
+    return value
+
+
+class LazyManifest:
+    """A read-only manifest view that validates layers on first access.
+
+    Attributes:
+        body: The manifest's JSON encoding, as received
+        did: The manifest's DID
+        redistribution_policy: ``content_access.redistribution_policy``, read eagerly
+    """
+
+    __slots__ = ("body", "did", "redistribution_policy", "_header", "_layers", "_pool", "_hash")
+
+    def __init__(
+        self,
+        body: bytes,
+        content_type: str | None = None,
+        *,
+        pool: InternPool | None = None,
+    ):
+        """Validate a body's top-level fields, deferring the layers.
+
+        Args:
+            body: The manifest payload
+            content_type: Media type of ``body``; binary bodies are re-encoded as JSON
+            pool: Pool used to share validated layers (none if None)
+
+        Raises:
+            pydantic.ValidationError: If the top-level fields are invalid
+        """
+        if media_type(content_type) == CBOR_MEDIA_TYPE:
+            body = to_json(decode_value(body))
+        header = _Header.model_validate_json(body)
+        self.body = body
+        self.did = sys.intern(header.did)
+        self.redistribution_policy = header.content_access.redistribution_policy
+        self._header = header
+        self._layers: dict[str, BaseModel] = {}
+        self._pool = pool
+        self._hash: str | None = None
+
+    def __repr__(self) -> str:
+        return f"LazyManifest(did={self.did!r}, layers={sorted(self._layers)})"
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _Header.model_fields and name != "content_access":
+            return getattr(self._header, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _layer(self, name: str) -> Any:
+        layer = self._layers.get(name)
+        if layer is None:
+            layer = getattr(_LAYER_MODELS[name].model_validate_json(self.body), name)
+            if self._pool is not None:
+                layer = self._pool.intern(layer)
+            self._layers[name] = layer
+        return layer
+
+    @property
+    def foundation(self) -> FoundationLayer:
+        """The Foundation Layer, validated on first access."""
+        return self._layer("foundation")
+
+    @property
+    def deployment(self) -> DeploymentLayer:
+        """The Deployment Layer, validated on first access."""
+        return self._layer("deployment")
+
+    @property
+    def content_access(self) -> ContentAccessLayer:
+        """The Content Access Layer, validated on first access."""
+        return self._layer("content_access")
+
+    @property
+    def validated_layers(self) -> frozenset[str]:
+        """Names of the layers validated so far."""
+        return frozenset(self._layers)
+
+    def to_manifest(self) -> AIManifest:
+        """Fully validate the body into an independent :class:`AIManifest`.
+
+        The result shares nothing with this view or its pool, so it is safe
+        to modify.
+        """
+        return AIManifest.model_validate_json(self.body)
+
+    @property
+    def content_hash(self) -> str:
+        """The manifest's content hash (computed once, via a full validation)."""
+        if self._hash is None:
+            self._hash = self.to_manifest().content_hash
+        return self._hash
@@ -0,0 +1,271 @@
+"""Lineage index - Which systems were trained on what, directly or by derivation.
+
+SPECIFICATION.md §5.5 links a derivative model to its base model through
+``FoundationLayer.parent_model``, and §11.4 traces provenance along that
+chain. This index answers lineage questions over many manifests without
+scanning them:
+
+- Inverted postings map each dataset to the systems that list it in
+  ``training_datasets`` or ``dataset_details``.
+- A derivative graph maps each system to its parent and its children.
+
+"Which systems used dataset X, directly or through a parent model?" is
+then the posting list for X plus every descendant of those systems, and
+"what did this system inherit?" walks the parent chain. Both cost time
+proportional to the answer, not to the number of indexed manifests.
+
+The index is updated incrementally: indexing a newer manifest for a DID
+replaces that DID's postings and parent edge, and re-indexing an unchanged
+manifest is a no-op. With a ``path`` it is persisted to SQLite and loaded
+back on open, so a restart needs no rebuild.
+
+Example:
+    index = LineageIndex("lineage.db")
+    index.add_many(manifests)
+    affected = index.systems_using("dataset:books3")
+"""
+
+import os
+import sqlite3
+import threading
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from .manifest import AIManifest
+
+StrPath = str | os.PathLike[str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS systems (
+    did TEXT PRIMARY KEY,
+    parent TEXT,
+    content_hash TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    dataset TEXT NOT NULL,
+    did TEXT NOT NULL,
+    PRIMARY KEY (dataset, did)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_did ON postings(did);
+"""
+
+
+def manifest_datasets(manifest: AIManifest) -> frozenset[str]:
+    """Every dataset identifier a manifest's Foundation Layer lists."""
+    foundation = manifest.foundation
+    return frozenset(foundation.training_datasets).union(
+        d.identifier for d in foundation.dataset_details
+    )
+
+
+class LineageIndex:
+    """Inverted dataset postings and a derivative graph over manifests.
+
+    Thread-safe; reads and writes take one lock.
+    """
+
+    def __init__(self, path: StrPath | None = None):
+        """Open an index, loading any persisted state.
+
+        Args:
+            path: SQLite file to persist to (in memory only if None)
+        """
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.RLock()
+        self._datasets: dict[str, frozenset[str]] = {}
+        self._hashes: dict[str, str] = {}
+        self._postings: defaultdict[str, set[str]] = defaultdict(set)
+        self._parent: dict[str, str] = {}
+        self._children: defaultdict[str, set[str]] = defaultdict(set)
+        self._db: sqlite3.Connection | None = None
+        if self.path is not None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+            self._load()
+
+    def _load(self) -> None:
+        assert self._db is not None
+        datasets: defaultdict[str, set[str]] = defaultdict(set)
+        for dataset, did in self._db.execute("SELECT dataset, did FROM postings"):
+            datasets[did].add(dataset)
+            self._postings[dataset].add(did)
+        for did, parent, content_hash in self._db.execute(
+            "SELECT did, parent, content_hash FROM systems"
+        ):
+            self._hashes[did] = content_hash
+            self._datasets[did] = frozenset(datasets.get(did, ()))
+            if parent is not None:
+                self._parent[did] = parent
+                self._children[parent].add(did)
+
+    def close(self) -> None:
+        """Close the backing database."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, did: object) -> bool:
+        return did in self._hashes
+
+    def add(self, manifest: AIManifest) -> bool:
+        """Index a manifest, replacing any earlier version for its DID.
+
+        Returns:
+            False if this exact version was already indexed
+        """
+        return self.add_many([manifest]) == 1
+
+    def add_many(self, manifests: Iterable[AIManifest]) -> int:
+        """Index many manifests in one transaction.
+
+        Returns:
+            The number of manifests that changed the index
+        """
+        changed = 0
+        with self._lock:
+            db = self._db
+            try:
+                for manifest in manifests:
+                    if self._hashes.get(manifest.did) == manifest.content_hash:
+                        continue
+                    self._apply(manifest)
+                    if db is not None:
+                        self._persist(db, manifest)
+                    changed += 1
+                if db is not None:
+                    db.commit()
+            except BaseException:
+                if db is not None:
+                    db.rollback()
+                    self._reload()
+                raise
+        return changed
+
+    def _apply(self, manifest: AIManifest) -> None:
+        did = manifest.did
+        self._unlink(did)
+        datasets = manifest_datasets(manifest)
+        self._datasets[did] = datasets
+        self._hashes[did] = manifest.content_hash
+        for dataset in datasets:
+            self._postings[dataset].add(did)
+        parent = manifest.foundation.parent_model
+        if parent is not None:
+            self._parent[did] = parent
+            self._children[parent].add(did)
+
+    def _persist(self, db: sqlite3.Connection, manifest: AIManifest) -> None:
+        did = manifest.did
+        db.execute("DELETE FROM postings WHERE did = ?", (did,))
+        db.execute(
+            "INSERT OR REPLACE INTO systems (did, parent, content_hash) VALUES (?, ?, ?)",
+            (did, manifest.foundation.parent_model, manifest.content_hash),
+        )
+        db.executemany(
+            "INSERT INTO postings (dataset, did) VALUES (?, ?)",
+            ((dataset, did) for dataset in self._datasets[did]),
+        )
+
+    def _unlink(self, did: str) -> None:
+        for dataset in self._datasets.pop(did, ()):
+            users = self._postings[dataset]
+            users.discard(did)
+            if not users:
+                del self._postings[dataset]
+        parent = self._parent.pop(did, None)
+        if parent is not None:
+            siblings = self._children[parent]
+            siblings.discard(did)
+            if not siblings:
+                del self._children[parent]
+        self._hashes.pop(did, None)
+
+    def _reload(self) -> None:
+        self._datasets.clear()
+        self._hashes.clear()
+        self._postings.clear()
+        self._parent.clear()
+        self._children.clear()
+        self._load()
+
+    def remove(self, did: str) -> None:
+        """Drop a system from the index (its children keep their parent edge)."""
+        with self._lock:
+            self._unlink(did)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM postings WHERE did = ?", (did,))
+                    self._db.execute("DELETE FROM systems WHERE did = ?", (did,))
+
+    def parent(self, did: str) -> str | None:
+        """The system's direct parent model, if any."""
+        return self._parent.get(did)
+
+    def ancestors(self, did: str) -> list[str]:
+        """The parent chain from the direct parent up to the root.
+
+        A parent that was never indexed still appears, ending the chain;
+        a cyclic chain stops before revisiting a system.
+        """
+        with self._lock:
+            chain: list[str] = []
+            seen = {did}
+            parent = self._parent.get(did)
+            while parent is not None and parent not in seen:
+                chain.append(parent)
+                seen.add(parent)
+                parent = self._parent.get(parent)
+            return chain
+
+    def descendants(self, did: str) -> set[str]:
+        """Every system derived from ``did``, directly or transitively."""
+        with self._lock:
+            return self._reachable(self._children.get(did, ())) - {did}
+
+    def _reachable(self, start: Iterable[str]) -> set[str]:
+        seen = set(start)
+        queue = deque(seen)
+        while queue:
+            for child in self._children.get(queue.popleft(), ()):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append(child)
+        return seen
+
+    def datasets_of(self, did: str, transitive: bool = True) -> set[str]:
+        """Datasets a system was trained on, including its ancestors' if transitive."""
+        with self._lock:
+            datasets = set(self._datasets.get(did, ()))
+            if transitive:
+                for ancestor in self.ancestors(did):
+                    datasets |= self._datasets.get(ancestor, frozenset())
+            return datasets
+
+    def systems_using(self, dataset: str, transitive: bool = True) -> set[str]:
+        """Systems trained on a dataset, including derivatives of those if transitive."""
+        with self._lock:
+            direct = self._postings.get(dataset, set())
+            return self._reachable(direct) if transitive else set(direct)
+
+    def datasets(self) -> Iterator[str]:
+        """Every indexed dataset identifier."""
+        with self._lock:
+            return iter(list(self._postings))
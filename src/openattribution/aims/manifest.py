@@ -1,9 +1,11 @@
 """AI Manifest - The core AIMS document."""
 
 from datetime import UTC, datetime
+from typing import Any, Self
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
+from .canonical import canonical_model_json, content_hash
 from .did import AIMSDID
 from .layers import ContentAccessLayer, DeploymentLayer, FoundationLayer
 
@@ -47,34 +49,93 @@ class AIManifest(BaseModel):
 
     @property
     def parsed_did(self) -> AIMSDID:
-        """Parse the DID string into components."""
+        """Parse the DID string into components (memoized by AIMSDID.parse)."""
         return AIMSDID.parse(self.did)
 
-    def verify(self) -> bool:
+    _content_hash: str | None = PrivateAttr(None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self.__pydantic_private__["_content_hash"] = None
+
+    def model_copy(self, *, update: dict[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the manifest, dropping the memoized content hash if fields change."""
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            copy._content_hash = None
+        return copy
+
+    def canonical_json(self) -> bytes:
+        """Return the canonical (JCS-style) encoding of the manifest.
+
+        The ``signature`` field is excluded, so the encoding identifies the
+        manifest content that a signature covers.
+        """
+        return canonical_model_json(self, exclude={"signature"})
+
+    @property
+    def content_hash(self) -> str:
+        """The ``sha256:<hex>`` hash of the canonical encoding.
+
+        Computed once and reused until a field of the manifest is assigned.
+        In-place changes to nested layers (including list contents) are not
+        tracked; call :meth:`invalidate_content_hash` after making them.
+        """
+        private = self.__pydantic_private__
+        if private["_content_hash"] is None:
+            private["_content_hash"] = content_hash(self.canonical_json())
+        return private["_content_hash"]
+
+    @property
+    def entity_hash(self) -> str:
+        """The ``sha256:<hex>`` hash of the canonical encoding including the signature.
+
+        Unlike :attr:`content_hash` this tells a signed copy apart from an
+        unsigned one, so it identifies what a manifest store keeps. It is
+        recomputed on every access.
+        """
+        return content_hash(canonical_model_json(self))
+
+    def invalidate_content_hash(self) -> None:
+        """Forget the memoized content hash after an in-place change."""
+        self._content_hash = None
+
+    def signing_payload(self) -> bytes:
+        """Return the bytes covered by the manifest signature.
+
+        This is always recomputed rather than memoized, so a signature check
+        can never be fooled by an untracked in-place change.
+        """
+        return self.canonical_json()
+
+    def verify(self, public_key: bytes | None = None) -> bool:
         """Verify the manifest's cryptographic signature.
 
-        Returns:
-            True if signature is valid or absent, False if invalid
+        Args:
+            public_key: Raw Ed25519 public key. Defaults to the key registered
+                for this manifest's DID with ``crypto.default_verifier.keys``.
 
-        Note:
-            Full verification requires the signing key. This is a stub
-            that will be implemented with proper crypto in a future version.
+        Returns:
+            True if signature is valid or absent, False if invalid or no key
+            is available to check it
         """
-        # TODO: Implement actual signature verification
-        if self.signature is None:
-            return True  # Unsigned manifests are valid but untrusted
-        # Placeholder for signature verification
-        return True
+        from .crypto.ed25519 import default_verifier
+
+        return default_verifier.verify(self, public_key)
 
     def sign(self, private_key: bytes) -> None:
         """Sign the manifest with a private key.
 
+        Bumps ``updated_at`` and stores an ``ed25519:`` signature over the
+        signing payload.
+
         Args:
             private_key: Ed25519 private key bytes
-
-        Note:
-            Stub implementation - will be completed with proper crypto.
         """
-        # TODO: Implement actual signing
-        self.signature = "stub-signature"
+        from .crypto.ed25519 import sign_bytes
+
         self.updated_at = datetime.now(UTC)
+        payload = self.signing_payload()
+        self.signature = sign_bytes(payload, private_key)
+        self._content_hash = content_hash(payload)
@@ -0,0 +1,214 @@
+"""Patch - JSON Patch (RFC 6902) diffs between manifest versions.
+
+Manifests change a little at a time: ``updated_at`` is bumped, a licensed
+source is added, a signature is replaced. Sending only those changes keeps
+frequent republishing and history walks cheap. :func:`diff` computes a
+small patch between two JSON documents and :func:`apply_patch` applies
+one; both operate on the plain ``dict``/``list`` values of
+``model_dump(mode="json")`` or ``json.loads``.
+
+Lists are compared by trimming their common prefix and suffix, so
+appending, inserting or removing entries costs one operation per entry
+rather than one per shifted index.
+
+Example:
+    patch = diff(old.model_dump(mode="json"), new.model_dump(mode="json"))
+    document = apply_patch(old.model_dump(mode="json"), patch)
+    assert AIManifest.model_validate(document).content_hash == new.content_hash
+"""
+
+import copy
+from typing import Any
+
+from pydantic_core import to_json
+
+PATCH_MEDIA_TYPE = "application/json-patch+json"
+
+
+class PatchError(ValueError):
+    """A patch is malformed or does not apply to the document."""
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _tokens(pointer: str) -> list[str]:
+    """Split a JSON Pointer (RFC 6901) into unescaped reference tokens."""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise PatchError(f"Invalid JSON pointer {pointer!r}")
+    if not pointer:
+        return []
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def diff(old: Any, new: Any) -> list[dict[str, Any]]:
+    """Compute a JSON Patch that turns ``old`` into ``new``.
+
+    Args:
+        old: The source document
+        new: The target document
+
+    Returns:
+        A list of ``add``, ``remove`` and ``replace`` operations; empty if
+        the documents are equal
+    """
+    operations: list[dict[str, Any]] = []
+    _diff(old, new, "", operations)
+    return operations
+
+
+def _same(old: Any, new: Any) -> bool:
+    """JSON equality: like ``==``, but ``1``, ``1.0`` and ``True`` differ."""
+    if type(old) is not type(new) or old != new:
+        return False
+    if not isinstance(old, dict | list):
+        return True
+    # Identical encodings settle it in one native call; walk the values only
+    # when, say, member order differs.
+    if to_json(old) == to_json(new):
+        return True
+    if isinstance(old, dict):
+        return all(_same(value, new[key]) for key, value in old.items())
+    return all(map(_same, old, new))
+
+
+def _diff(old: Any, new: Any, path: str, operations: list[dict[str, Any]]) -> None:
+    if _same(old, new):
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key in old:
+                _diff(old[key], value, child, operations)
+            else:
+                operations.append({"op": "add", "path": child, "value": value})
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, operations)
+    else:
+        operations.append({"op": "replace", "path": path, "value": new})
+
+
+def _diff_list(old: list[Any], new: list[Any], path: str, operations: list[dict[str, Any]]) -> None:
+    shortest = min(len(old), len(new))
+    prefix = 0
+    while prefix < shortest and _same(old[prefix], new[prefix]):
+        prefix += 1
+    suffix = 0
+    while suffix < shortest - prefix and _same(old[-1 - suffix], new[-1 - suffix]):
+        suffix += 1
+    old_middle = old[prefix : len(old) - suffix]
+    new_middle = new[prefix : len(new) - suffix]
+    common = min(len(old_middle), len(new_middle))
+    for i in range(common):
+        _diff(old_middle[i], new_middle[i], f"{path}/{prefix + i}", operations)
+    # Remove from the back so earlier indexes stay valid.
+    for i in reversed(range(common, len(old_middle))):
+        operations.append({"op": "remove", "path": f"{path}/{prefix + i}"})
+    for i in range(common, len(new_middle)):
+        operations.append({"op": "add", "path": f"{path}/{prefix + i}", "value": new_middle[i]})
+
+
+def apply_patch(document: Any, patch: list[dict[str, Any]]) -> Any:
+    """Apply a JSON Patch to a document, modifying it in place.
+
+    Supports every RFC 6902 operation (``add``, ``remove``, ``replace``,
+    ``move``, ``copy`` and ``test``). Operations are applied in order, so
+    if one fails the document may be partly patched.
+
+    Args:
+        document: The document to patch
+        patch: The operations to apply
+
+    Returns:
+        The patched document (a new object only if the root was replaced)
+
+    Raises:
+        PatchError: If the patch is malformed or an operation does not apply
+    """
+    if not isinstance(patch, list):
+        raise PatchError("A patch must be a list of operations")
+    for operation in patch:
+        if not isinstance(operation, dict):
+            raise PatchError("Each operation must be an object")
+        op = operation.get("op")
+        path = _tokens(operation.get("path"))  # type: ignore[arg-type]
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise PatchError(f"{op} operation at {operation['path']!r} needs a value")
+        if op == "add":
+            document = _add(document, path, operation["value"])
+        elif op == "remove":
+            document, _ = _remove(document, path)
+        elif op == "replace":
+            document, _ = _remove(document, path)
+            document = _add(document, path, operation["value"])
+        elif op in ("move", "copy"):
+            source = _tokens(operation.get("from"))  # type: ignore[arg-type]
+            if op == "move":
+                if path[: len(source)] == source and len(path) > len(source):
+                    raise PatchError("Cannot move a value into one of its children")
+                document, value = _remove(document, source)
+            else:
+                value = copy.deepcopy(_get(document, source))
+            document = _add(document, path, value)
+        elif op == "test":
+            if not _same(_get(document, path), operation["value"]):
+                raise PatchError(f"Test failed at {operation['path']!r}")
+        else:
+            raise PatchError(f"Unknown operation {op!r}")
+    return document
+
+
+def _index(container: list[Any], token: str, *, append: bool = False) -> int:
+    if append and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"Invalid array index {token!r}")
+    index = int(token)
+    if index > len(container) - (0 if append else 1):
+        raise PatchError(f"Array index {index} out of range")
+    return index
+
+
+def _get(document: Any, path: list[str]) -> Any:
+    for token in path:
+        if isinstance(document, dict):
+            if token not in document:
+                raise PatchError(f"Missing member {token!r}")
+            document = document[token]
+        elif isinstance(document, list):
+            document = document[_index(document, token)]
+        else:
+            raise PatchError(f"Cannot descend into a scalar at {token!r}")
+    return document
+
+
+def _add(document: Any, path: list[str], value: Any) -> Any:
+    if not path:
+        return value
+    parent = _get(document, path[:-1])
+    token = path[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, append=True), value)
+    else:
+        raise PatchError(f"Cannot add to a scalar at {token!r}")
+    return document
+
+
+def _remove(document: Any, path: list[str]) -> tuple[Any, Any]:
+    if not path:
+        return None, document
+    parent = _get(document, path[:-1])
+    token = path[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise PatchError(f"Missing member {token!r}")
+        return document, parent.pop(token)
+    if isinstance(parent, list):
+        return document, parent.pop(_index(parent, token))
+    raise PatchError(f"Cannot remove from a scalar at {token!r}")
@@ -0,0 +1,369 @@
+"""Trust policies - Declarative rules compiled into fast predicates.
+
+SPECIFICATION.md §8.4 leaves trust decisions to applications. This module
+lets an application declare its policy once, as data, and evaluate it
+against many manifests cheaply:
+
+- Rules are pydantic models, so a policy can be loaded from JSON config.
+- :meth:`Policy.compile` turns the rules into plain predicates.
+- :class:`ManifestFacts` precomputes per-manifest lookups (frozensets of
+  sources and affiliations, parsed expiry datetimes) once per manifest
+  version, so each rule check is a set or dict lookup.
+
+Example:
+    policy = Policy(rules=[
+        MinRedistribution(policy="attributed"),
+        HoldsLicense(source="source:wirecutter"),
+        NoBrandAffiliation(influence_type="exclusive"),
+    ]).compile()
+    decision = policy.evaluate(manifest)
+    if not decision.allowed:
+        print(decision.violations)
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+from .layers.content_access import RedistributionPolicy
+from .manifest import AIManifest
+
+REDISTRIBUTION_RANK = {
+    RedistributionPolicy.NONE: 0,
+    RedistributionPolicy.SUMMARY_ONLY: 1,
+    RedistributionPolicy.ATTRIBUTED: 2,
+    RedistributionPolicy.UNRESTRICTED: 3,
+}
+"""Redistribution policies ordered from most to least restrictive."""
+
+_NO_EXPIRY = datetime.max.replace(tzinfo=UTC)
+_EXPIRED = datetime.min.replace(tzinfo=UTC)
+
+
+def parse_expiry(value: str | None) -> datetime:
+    """Parse a ``LicensedSource.expires_at`` value.
+
+    Naive timestamps and bare dates are taken as UTC. A missing value never
+    expires; an unparseable one is treated as already expired.
+    """
+    if value is None:
+        return _NO_EXPIRY
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return _EXPIRED
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestFacts:
+    """Precomputed lookups over one manifest version.
+
+    Attributes:
+        did: The manifest's DID
+        redistribution_rank: Position of the redistribution policy in REDISTRIBUTION_RANK
+        rsl_compliance: Whether training data claims RSL compliance
+        sources: Every licensed source identifier
+        source_expiry: Latest expiry per source (datetime.max if it never expires)
+        rsl_licenses: RSL license identifiers held
+        brands: Affiliated brand names
+        influence_types: Influence types across all brand affiliations
+        affiliations: (brand, influence_type) pairs
+        datasets: Training dataset identifiers
+    """
+
+    did: str
+    redistribution_rank: int
+    rsl_compliance: bool
+    sources: frozenset[str]
+    source_expiry: dict[str, datetime]
+    rsl_licenses: frozenset[str]
+    brands: frozenset[str]
+    influence_types: frozenset[str]
+    affiliations: frozenset[tuple[str, str | None]]
+    datasets: frozenset[str]
+
+    @classmethod
+    def from_manifest(cls, manifest: AIManifest) -> "ManifestFacts":
+        """Build the lookups for a manifest."""
+        access = manifest.content_access
+        expiry: dict[str, datetime] = {}
+        for detail in access.source_details:
+            # A source with several grants is held until the latest one expires.
+            expires = parse_expiry(detail.expires_at)
+            if expiry.setdefault(detail.identifier, expires) < expires:
+                expiry[detail.identifier] = expires
+        for source in access.licensed_sources:
+            expiry.setdefault(source, _NO_EXPIRY)
+        affiliations = manifest.deployment.brand_affiliations
+        foundation = manifest.foundation
+        return cls(
+            did=manifest.did,
+            redistribution_rank=REDISTRIBUTION_RANK[access.redistribution_policy],
+            rsl_compliance=foundation.rsl_compliance,
+            sources=frozenset(expiry),
+            source_expiry=expiry,
+            rsl_licenses=frozenset(access.rsl_licenses),
+            brands=frozenset(a.brand for a in affiliations),
+            influence_types=frozenset(a.influence_type for a in affiliations if a.influence_type),
+            affiliations=frozenset((a.brand, a.influence_type) for a in affiliations),
+            datasets=frozenset(foundation.training_datasets).union(
+                d.identifier for d in foundation.dataset_details
+            ),
+        )
+
+
+class FactsCache:
+    """LRU cache of ManifestFacts keyed by manifest content hash."""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, ManifestFacts] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, manifest: AIManifest) -> ManifestFacts:
+        """Return the facts for a manifest, building them on first sight."""
+        key = manifest.content_hash
+        facts = self._entries.get(key)
+        if facts is None:
+            facts = self._entries[key] = ManifestFacts.from_manifest(manifest)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return facts
+
+
+Predicate = Callable[[ManifestFacts, datetime], bool]
+
+
+def _utc(now: datetime | None) -> datetime:
+    """The evaluation time, defaulting to now; naive times are taken as UTC like expiries."""
+    if now is None:
+        return datetime.now(UTC)
+    return now if now.tzinfo is not None else now.replace(tzinfo=UTC)
+
+
+class BaseRule(BaseModel, ABC):
+    """Base class for policy rules."""
+
+    @abstractmethod
+    def describe(self) -> str:
+        """Human-readable statement of the rule, reported when it fails."""
+
+    @abstractmethod
+    def predicate(self) -> Predicate:
+        """Compile the rule into a predicate over ManifestFacts and the current time."""
+
+
+class MinRedistribution(BaseRule):
+    """Require a redistribution policy at least as permissive as ``policy``."""
+
+    rule: Literal["min_redistribution"] = "min_redistribution"
+    policy: RedistributionPolicy
+
+    def describe(self) -> str:
+        return f"redistribution_policy >= {self.policy}"
+
+    def predicate(self) -> Predicate:
+        minimum = REDISTRIBUTION_RANK[self.policy]
+        return lambda facts, now: facts.redistribution_rank >= minimum
+
+
+class MaxRedistribution(BaseRule):
+    """Require a redistribution policy no more permissive than ``policy``."""
+
+    rule: Literal["max_redistribution"] = "max_redistribution"
+    policy: RedistributionPolicy
+
+    def describe(self) -> str:
+        return f"redistribution_policy <= {self.policy}"
+
+    def predicate(self) -> Predicate:
+        maximum = REDISTRIBUTION_RANK[self.policy]
+        return lambda facts, now: facts.redistribution_rank <= maximum
+
+
+class HoldsLicense(BaseRule):
+    """Require a license for ``source`` that has not expired."""
+
+    rule: Literal["holds_license"] = "holds_license"
+    source: str
+    allow_expired: bool = False
+
+    def describe(self) -> str:
+        qualifier = "" if self.allow_expired else "unexpired "
+        return f"holds {qualifier}license for {self.source}"
+
+    def predicate(self) -> Predicate:
+        source = self.source
+        if self.allow_expired:
+            return lambda facts, now: source in facts.sources
+        return lambda facts, now: facts.source_expiry.get(source, _EXPIRED) > now
+
+
+class HoldsRSLLicense(BaseRule):
+    """Require the RSL license ``license``."""
+
+    rule: Literal["holds_rsl_license"] = "holds_rsl_license"
+    license: str
+
+    def describe(self) -> str:
+        return f"holds RSL license {self.license}"
+
+    def predicate(self) -> Predicate:
+        license_id = self.license
+        return lambda facts, now: license_id in facts.rsl_licenses
+
+
+class RequireRSLCompliance(BaseRule):
+    """Require the foundation layer to claim RSL compliance."""
+
+    rule: Literal["rsl_compliance"] = "rsl_compliance"
+
+    def describe(self) -> str:
+        return "rsl_compliance is true"
+
+    def predicate(self) -> Predicate:
+        return lambda facts, now: facts.rsl_compliance
+
+
+class NoBrandAffiliation(BaseRule):
+    """Reject brand affiliations with a given influence type and/or brand.
+
+    With neither field set, any brand affiliation is rejected.
+    """
+
+    rule: Literal["no_brand_affiliation"] = "no_brand_affiliation"
+    influence_type: str | None = None
+    brand: str | None = None
+
+    def describe(self) -> str:
+        filters = {"brand": self.brand, "influence_type": self.influence_type}
+        parts = [f"{name}={value}" for name, value in filters.items() if value is not None]
+        return "no brand affiliation" + (f" with {', '.join(parts)}" if parts else "")
+
+    def predicate(self) -> Predicate:
+        brand, influence = self.brand, self.influence_type
+        if brand is None and influence is None:
+            return lambda facts, now: not facts.brands
+        if brand is None:
+            return lambda facts, now: influence not in facts.influence_types
+        if influence is None:
+            return lambda facts, now: brand not in facts.brands
+        pair = (brand, influence)
+        return lambda facts, now: pair not in facts.affiliations
+
+
+class ExcludesDataset(BaseRule):
+    """Reject systems trained on ``dataset``."""
+
+    rule: Literal["excludes_dataset"] = "excludes_dataset"
+    dataset: str
+
+    def describe(self) -> str:
+        return f"not trained on {self.dataset}"
+
+    def predicate(self) -> Predicate:
+        dataset = self.dataset
+        return lambda facts, now: dataset not in facts.datasets
+
+
+Rule = Annotated[
+    MinRedistribution
+    | MaxRedistribution
+    | HoldsLicense
+    | HoldsRSLLicense
+    | RequireRSLCompliance
+    | NoBrandAffiliation
+    | ExcludesDataset,
+    Field(discriminator="rule"),
+]
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of evaluating a policy against one manifest.
+
+    Attributes:
+        did: The manifest's DID
+        violations: Descriptions of the rules that failed
+    """
+
+    did: str
+    violations: tuple[str, ...] = ()
+
+    @property
+    def allowed(self) -> bool:
+        """Whether every rule passed."""
+        return not self.violations
+
+    def __bool__(self) -> bool:
+        return self.allowed
+
+
+class Policy(BaseModel):
+    """A declarative trust policy: every rule must pass."""
+
+    rules: list[Rule] = Field(default_factory=list, description="Rules that must all hold")
+
+    def compile(self, facts_cache: FactsCache | None = None) -> "CompiledPolicy":
+        """Compile the rules into predicates.
+
+        Args:
+            facts_cache: Cache of per-manifest facts (a new one if None); share
+                one between policies evaluated over the same manifests
+        """
+        return CompiledPolicy(
+            [(rule.describe(), rule.predicate()) for rule in self.rules],
+            facts_cache if facts_cache is not None else FactsCache(),
+        )
+
+
+class CompiledPolicy:
+    """A policy compiled to predicates over ManifestFacts."""
+
+    def __init__(self, checks: list[tuple[str, Predicate]], facts_cache: FactsCache):
+        self.checks = checks
+        self.facts_cache = facts_cache
+
+    def facts(self, manifest: AIManifest | ManifestFacts) -> ManifestFacts:
+        """Return the precomputed facts for a manifest."""
+        if isinstance(manifest, ManifestFacts):
+            return manifest
+        return self.facts_cache.get(manifest)
+
+    def allows(self, manifest: AIManifest | ManifestFacts, now: datetime | None = None) -> bool:
+        """Check the policy, stopping at the first failing rule."""
+        facts = self.facts(manifest)
+        now = _utc(now)
+        return all(check(facts, now) for _, check in self.checks)
+
+    def evaluate(
+        self, manifest: AIManifest | ManifestFacts, now: datetime | None = None
+    ) -> Decision:
+        """Check every rule and report all violations.
+
+        Args:
+            manifest: A manifest, or facts already built for one
+            now: Time used for license expiry (defaults to the current time;
+                a naive time is taken as UTC)
+        """
+        facts = self.facts(manifest)
+        now = _utc(now)
+        violations = tuple(name for name, check in self.checks if not check(facts, now))
+        return Decision(did=facts.did, violations=violations)
+
+    def evaluate_many(
+        self, manifests: Iterable[AIManifest | ManifestFacts], now: datetime | None = None
+    ) -> list[Decision]:
+        """Evaluate a batch of manifests against one clock reading."""
+        now = _utc(now)
+        return [self.evaluate(manifest, now) for manifest in manifests]
@@ -0,0 +1,275 @@
+"""Refresher - Stale-while-revalidate and refresh-ahead for frequently used DIDs.
+
+With a plain :class:`~openattribution.aims.cache.ManifestCache`, the first
+request after a manifest goes stale waits for the store. For a popular
+counterparty, that is a latency spike on the request path every TTL.
+:class:`ManifestRefresher` keeps those requests off the network:
+
+- Stale while revalidate: :meth:`ManifestRefresher.resolve` returns a
+  cached copy that is at most ``max_stale`` seconds past its expiry
+  straight away, and revalidates it in the background.
+- Refresh ahead: a background task periodically revalidates the most
+  frequently resolved DIDs whose cached copy expires within ``lead``
+  seconds, so they rarely go stale at all.
+- License deadlines: the ``expires_at`` of a manifest's licensed sources
+  (``ContentAccessLayer.source_details``) is also a refresh deadline, so a
+  manifest republished when a license lapses is picked up right away.
+
+Rounds run on a jittered schedule, and at most ``concurrency`` refreshes
+are in flight at once.
+
+Example:
+    async with ManifestStore(url, cache=ManifestCache()) as store:
+        async with ManifestRefresher(store) as refresher:
+            manifest = await refresher.resolve(did)
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+from types import TracebackType
+from typing import TYPE_CHECKING, Self
+
+from .cache import CacheEntry
+from .manifest import AIManifest
+from .policy import parse_expiry
+
+if TYPE_CHECKING:
+    from .store import ManifestStore
+
+logger = logging.getLogger(__name__)
+
+
+def license_deadlines(manifest: AIManifest) -> list[float]:
+    """Expiry times (seconds since epoch) of a manifest's licensed sources, sorted.
+
+    Expiries are read with :func:`~openattribution.aims.policy.parse_expiry`,
+    so refresh deadlines agree with policy checks: a missing expiry falls due
+    at ``datetime.max`` and an unparseable one fell due at ``datetime.min``,
+    before any revalidation.
+    """
+    return sorted(
+        parse_expiry(source.expires_at).timestamp()
+        for source in manifest.content_access.source_details
+    )
+
+
+class ManifestRefresher:
+    """Serves hot manifests from cache and refreshes them in the background.
+
+    Attributes:
+        refreshes: Background refreshes completed
+        failures: Background refreshes that raised
+    """
+
+    def __init__(
+        self,
+        store: "ManifestStore",
+        *,
+        hot_size: int = 1_000,
+        lead: float = 30.0,
+        max_stale: float = 300.0,
+        interval: float = 5.0,
+        jitter: float = 0.1,
+        concurrency: int = 8,
+        half_life: float = 300.0,
+        max_tracked: int = 100_000,
+    ):
+        """Initialize the refresher.
+
+        Args:
+            store: Store to resolve through; must have a ``cache``
+            hot_size: Number of most frequently resolved DIDs refreshed ahead of expiry
+            lead: Seconds before expiry to refresh a hot DID
+            max_stale: Seconds past expiry a cached copy may still be served
+            interval: Seconds between refresh-ahead rounds
+            jitter: Fractional random spread applied to each interval
+            concurrency: Maximum background refreshes in flight
+            half_life: Seconds over which a DID's access count decays by half
+            max_tracked: Maximum number of DIDs whose access counts are kept; also
+                capped at the cache's ``max_entries``, since only cached DIDs
+                can be refreshed ahead
+        """
+        if store.cache is None:
+            raise ValueError("The store has no cache to refresh")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.store = store
+        self.cache = store.cache
+        self.hot_size = hot_size
+        self.lead = lead
+        self.max_stale = max_stale
+        self.interval = interval
+        self.jitter = jitter
+        self.half_life = half_life
+        self.max_tracked = min(max_tracked, self.cache.max_entries)
+        self.refreshes = 0
+        self.failures = 0
+        self._scores: dict[str, float] = {}
+        self._deadlines: dict[str, tuple[str, list[float]]] = {}
+        self._validated: dict[str, float] = {}
+        self._decayed_at = self.cache.clock()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pending: dict[str, asyncio.Task[None]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    async def resolve(self, did: str) -> AIManifest | None:
+        """Resolve a DID, serving a recently expired copy while it is refreshed.
+
+        Args:
+            did: The DID to resolve
+
+        Returns:
+            The AI manifest if found, None otherwise
+
+        Raises:
+            httpx.HTTPError: If a resolve that has to wait for the store fails
+        """
+        self._scores[did] = self._scores.get(did, 0.0) + 1.0
+        if len(self._scores) > 2 * self.max_tracked:
+            self._trim()
+        entry = self.cache.get(did)
+        if entry is not None and not self._revoked(entry):
+            now = self.cache.clock()
+            if entry.is_fresh(now) and now < self._next_deadline(entry):
+                return entry.manifest
+            if now < entry.expires_at + self.max_stale:
+                self.schedule(did)
+                return entry.manifest
+        return await self.store.resolve(did)
+
+    def _revoked(self, entry: CacheEntry) -> bool:
+        revocations = self.store.revocations
+        return revocations is not None and revocations.is_revoked(entry.did, entry.content_hash)
+
+    def _next_deadline(self, entry: CacheEntry) -> float:
+        """The first license deadline since this refresher last revalidated the DID."""
+        cached = self._deadlines.get(entry.did)
+        if cached is None or cached[0] != entry.content_hash:
+            cached = (entry.content_hash, license_deadlines(entry.manifest))
+            self._deadlines[entry.did] = cached
+        # A deadline that passed before the last revalidation has been acted on;
+        # one that passed before this refresher ever revalidated has not.
+        validated_at = self._validated.get(entry.did, 0.0)
+        for deadline in cached[1]:
+            if deadline > validated_at:
+                return deadline
+        return float("inf")
+
+    def schedule(self, did: str) -> None:
+        """Refresh a DID in the background, unless a refresh is already pending."""
+        if did not in self._pending:
+            task = asyncio.create_task(self._refresh(did), name=f"aims-refresh:{did}")
+            self._pending[did] = task
+            task.add_done_callback(lambda _: self._pending.pop(did, None))
+
+    async def _refresh(self, did: str) -> None:
+        async with self._semaphore:
+            started = self.cache.clock()
+            try:
+                await self.store.refresh(did)
+            except Exception:
+                self.failures += 1
+                logger.warning("Background refresh of %s failed", did, exc_info=True)
+            else:
+                self._validated[did] = started
+                self.refreshes += 1
+
+    def hot(self) -> list[str]:
+        """The ``hot_size`` most frequently resolved DIDs, most frequent first."""
+        return heapq.nlargest(self.hot_size, self._scores, key=self._scores.__getitem__)
+
+    def due(self) -> list[str]:
+        """Hot DIDs expiring within ``lead`` or past a license deadline."""
+        now = self.cache.clock()
+        due = []
+        for did in self.hot():
+            entry = self.cache.peek(did)
+            if entry is None:
+                continue
+            if entry.expires_at <= now + self.lead or self._next_deadline(entry) <= now:
+                due.append(did)
+        return due
+
+    def _decay(self) -> None:
+        now = self.cache.clock()
+        factor = 0.5 ** ((now - self._decayed_at) / self.half_life)
+        self._decayed_at = now
+        scores = {
+            did: score * factor for did, score in self._scores.items() if score * factor >= 0.01
+        }
+        self._scores = scores
+        self._trim()
+
+    def _trim(self) -> None:
+        """Forget DIDs the cache has evicted, then the least used beyond ``max_tracked``.
+
+        :meth:`resolve` only calls this once more than twice ``max_tracked``
+        DIDs are scored, so its cost is spread over at least ``max_tracked``
+        resolves.
+        """
+        scores = {did: score for did, score in self._scores.items() if did in self.cache}
+        if len(scores) > self.max_tracked:
+            scores = dict(heapq.nlargest(self.max_tracked, scores.items(), key=lambda s: s[1]))
+        self._scores = scores
+        for tracked in (self._deadlines, self._validated):
+            for did in [did for did in tracked if did not in scores]:
+                del tracked[did]
+
+    async def run_once(self) -> int:
+        """Run one refresh-ahead round and wait for its refreshes.
+
+        Returns:
+            The number of DIDs refreshed in this round
+        """
+        self._decay()
+        due = self.due()
+        for did in due:
+            self.schedule(did)
+        pending = [self._pending[did] for did in due if did in self._pending]
+        if pending:
+            await asyncio.wait(pending)
+        return len(due)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start refreshing in the background on the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="aims-refresher")
+
+    async def stop(self) -> None:
+        """Stop the background task and cancel refreshes in flight."""
+        tasks = list(self._pending.values())
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> Self:
+        """Start the background task."""
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the background task."""
+        await self.stop()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+            try:
+                await self.run_once()
+            except Exception:
+                logger.warning("Refresh round failed", exc_info=True)
@@ -0,0 +1,393 @@
+"""DID resolution - DID Documents and the verification keys in them.
+
+SPECIFICATION.md §4.1 and §8.2: an AIMS DID resolves to a DID Document
+holding the public keys that verify the system's manifests and
+attestations. Resolution is dispatched on the DID method through a
+registry, so new methods can be plugged in:
+
+- ``web``: the document is fetched from :meth:`AIMSDID.resolve_url`.
+- ``key``: the organization segment is itself an Ed25519 multikey
+  (``z6Mk...``) and the document is derived from it without any I/O.
+
+:class:`DIDResolver` caches resolved documents together with their decoded
+public keys, honouring ``Cache-Control`` on fetched documents, and
+coalesces concurrent resolutions of the same DID into one request.
+
+Example:
+    async with DIDResolver() as resolver:
+        key = await resolver.public_key("did:aims:web:example.com:agent")
+        manifest.verify(key)
+"""
+
+import asyncio
+import base64
+import binascii
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Self
+
+import httpx
+from pydantic import BaseModel, ConfigDict, Field
+
+from .cache import max_age, no_store
+from .crypto import PublicKeyCache, load_public_key
+from .did import AIMSDID
+from .store import DEFAULT_LIMITS
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+ED25519_MULTICODEC = b"\xed\x01"
+ED25519_KEY_TYPES = frozenset({"Ed25519VerificationKey2018", "Ed25519VerificationKey2020"})
+_BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+
+
+class DIDResolutionError(ValueError):
+    """A DID could not be resolved to a usable DID Document."""
+
+
+def base58_encode(data: bytes) -> str:
+    """Encode bytes as base58btc."""
+    zeros = len(data) - len(data.lstrip(b"\0"))
+    number = int.from_bytes(data, "big")
+    encoded = []
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded.append(BASE58_ALPHABET[remainder])
+    return "1" * zeros + "".join(reversed(encoded))
+
+
+def base58_decode(value: str) -> bytes:
+    """Decode a base58btc string.
+
+    Raises:
+        ValueError: If the string contains characters outside the alphabet
+    """
+    number = 0
+    for char in value:
+        try:
+            number = number * 58 + _BASE58_INDEX[char]
+        except KeyError:
+            raise ValueError(f"Invalid base58 character: {char!r}") from None
+    zeros = len(value) - len(value.lstrip("1"))
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big") if number else b""
+    return b"\0" * zeros + body
+
+
+def decode_multibase(value: str) -> bytes:
+    """Decode a multibase string (base58btc ``z`` or base64url ``u``).
+
+    Raises:
+        ValueError: If the encoding is unsupported or malformed
+    """
+    prefix, encoded = value[:1], value[1:]
+    if prefix == "z":
+        return base58_decode(encoded)
+    if prefix == "u":
+        try:
+            return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        except binascii.Error as exc:
+            raise ValueError("Malformed base64url multibase value") from exc
+    raise ValueError(f"Unsupported multibase prefix: {prefix!r}")
+
+
+def encode_ed25519_multikey(public_key: bytes) -> str:
+    """Encode a raw Ed25519 public key as a ``z6Mk...`` multikey."""
+    return "z" + base58_encode(ED25519_MULTICODEC + public_key)
+
+
+def decode_ed25519_multikey(value: str) -> bytes:
+    """Decode a ``z6Mk...`` multikey to a raw Ed25519 public key.
+
+    Raises:
+        ValueError: If the value is not a multibase Ed25519 public key
+    """
+    raw = decode_multibase(value)
+    if not raw.startswith(ED25519_MULTICODEC) or len(raw) != 34:
+        raise ValueError("Not an Ed25519 multikey")
+    return raw[2:]
+
+
+class VerificationMethod(BaseModel):
+    """A verification method entry in a DID Document."""
+
+    model_config = ConfigDict(populate_by_name=True, extra="allow")
+
+    id: str
+    type: str
+    controller: str | None = None
+    public_key_multibase: str | None = Field(None, alias="publicKeyMultibase")
+    public_key_base58: str | None = Field(None, alias="publicKeyBase58")
+    public_key_jwk: dict[str, Any] | None = Field(None, alias="publicKeyJwk")
+
+    def ed25519_key(self) -> bytes | None:
+        """The raw Ed25519 public key, or None if this is not an Ed25519 key.
+
+        Raises:
+            ValueError: If the method claims to be Ed25519 but the key is malformed
+        """
+        if self.public_key_multibase is not None:
+            raw = decode_multibase(self.public_key_multibase)
+            if raw.startswith(ED25519_MULTICODEC) and len(raw) == 34:
+                raw = raw[2:]
+            elif self.type not in ED25519_KEY_TYPES:
+                return None
+        elif self.public_key_base58 is not None and self.type in ED25519_KEY_TYPES:
+            raw = base58_decode(self.public_key_base58)
+        elif self.public_key_jwk is not None:
+            jwk = self.public_key_jwk
+            if jwk.get("kty") != "OKP" or jwk.get("crv") != "Ed25519":
+                return None
+            encoded = jwk.get("x", "")
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        else:
+            return None
+        if len(raw) != 32:
+            raise ValueError(f"Ed25519 key in {self.id} is not 32 bytes")
+        return raw
+
+
+class DIDDocument(BaseModel):
+    """A W3C DID Document (the subset AIMS uses)."""
+
+    model_config = ConfigDict(populate_by_name=True, extra="allow")
+
+    id: str
+    verification_method: list[VerificationMethod] = Field(
+        default_factory=list, alias="verificationMethod"
+    )
+    authentication: list[str | VerificationMethod] = Field(default_factory=list)
+    assertion_method: list[str | VerificationMethod] = Field(
+        default_factory=list, alias="assertionMethod"
+    )
+    service: list[dict[str, Any]] = Field(default_factory=list)
+
+    def ed25519_keys(self) -> dict[str, bytes]:
+        """Raw Ed25519 public keys by verification method id, in document order.
+
+        Raises:
+            ValueError: If an Ed25519 verification method holds a malformed key
+        """
+        methods = [
+            *self.verification_method,
+            *(m for m in (*self.assertion_method, *self.authentication) if not isinstance(m, str)),
+        ]
+        keys = {}
+        for method in methods:
+            key = method.ed25519_key()
+            if key is not None:
+                keys.setdefault(method.id, key)
+        return keys
+
+
+@dataclass(frozen=True)
+class ResolvedDID:
+    """A resolved DID Document with its decoded keys.
+
+    Attributes:
+        did: The resolved DID
+        document: The DID Document
+        public_keys: Raw Ed25519 public keys by verification method id
+        expires_at: When the cached resolution goes stale (seconds, resolver clock)
+    """
+
+    did: str
+    document: DIDDocument
+    public_keys: dict[str, bytes]
+    expires_at: float
+
+    @property
+    def public_key(self) -> bytes | None:
+        """The first Ed25519 key in the document, if any."""
+        return next(iter(self.public_keys.values()), None)
+
+
+MethodResolver = Callable[["DIDResolver", AIMSDID], Awaitable[tuple[DIDDocument, float | None]]]
+"""Resolves a parsed DID to its document and an optional freshness lifetime."""
+
+
+async def resolve_web(resolver: "DIDResolver", did: AIMSDID) -> tuple[DIDDocument, float | None]:
+    """Fetch the DID Document from the organization's ``.well-known`` URL."""
+    url = did.resolve_url()
+    if url is None:
+        raise DIDResolutionError(f"{did} is not a web DID")
+    response = await resolver.client.get(url, headers={"Accept": "application/did+json"})
+    if response.status_code == 404:
+        raise DIDResolutionError(f"No DID Document for {did}")
+    response.raise_for_status()
+    document = DIDDocument.model_validate_json(response.content)
+    if no_store(response):
+        return document, 0.0
+    return document, max_age(response)
+
+
+async def resolve_key(resolver: "DIDResolver", did: AIMSDID) -> tuple[DIDDocument, float | None]:
+    """Derive the DID Document for a ``key`` DID from its embedded multikey.
+
+    The document never changes, so it is cached without expiry.
+    """
+    try:
+        decode_ed25519_multikey(did.organization)
+    except ValueError as exc:
+        raise DIDResolutionError(f"Invalid key DID {did}: {exc}") from exc
+    method_id = f"{did}#{did.organization}"
+    document = DIDDocument(
+        id=str(did),
+        verification_method=[
+            VerificationMethod(
+                id=method_id,
+                type="Ed25519VerificationKey2020",
+                controller=str(did),
+                public_key_multibase=did.organization,
+            )
+        ],
+        authentication=[method_id],
+        assertion_method=[method_id],
+    )
+    return document, float("inf")
+
+
+class DIDResolver:
+    """Resolves AIMS DIDs to DID Documents, with caching.
+
+    Resolved documents and their decoded keys are kept in an LRU for the
+    document's ``Cache-Control: max-age`` (or ``ttl`` when absent);
+    ``no-store`` documents are not cached. Concurrent resolutions of the
+    same DID share one request. Documents are fetched through one pooled
+    HTTP client, created on first use.
+
+    Attributes:
+        methods: Resolution functions by DID method
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 300.0,
+        max_entries: int = 10_000,
+        timeout: float = 10.0,
+        limits: httpx.Limits | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        keys: PublicKeyCache | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the resolver.
+
+        Args:
+            ttl: Freshness lifetime for documents without ``max-age``
+            max_entries: Maximum number of cached resolutions
+            timeout: Request timeout in seconds
+            limits: Connection pool limits (defaults to the store's DEFAULT_LIMITS)
+            transport: Custom transport, e.g. for testing
+            keys: Key cache to register each DID's first Ed25519 key in, e.g.
+                ``crypto.default_verifier.keys`` so :meth:`AIManifest.verify` finds it
+            clock: Time source for expiry
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.limits = limits or DEFAULT_LIMITS
+        self.keys = keys
+        self.clock = clock
+        self.methods: dict[str, MethodResolver] = {"web": resolve_web, "key": resolve_key}
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._entries: OrderedDict[str, ResolvedDID] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[ResolvedDID]] = {}
+
+    def register(self, method: str, resolve: MethodResolver) -> None:
+        """Register (or replace) the resolution function for a DID method."""
+        self.methods[method] = resolve
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared pooled HTTP client, created on first access."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, transport=self._transport
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def __aenter__(self) -> Self:
+        """Open the connection pool."""
+        _ = self.client
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the connection pool."""
+        await self.aclose()
+
+    def cached(self, did: str) -> ResolvedDID | None:
+        """Return a fresh cached resolution without resolving."""
+        entry = self._entries.get(did)
+        if entry is None:
+            return None
+        if entry.expires_at <= self.clock():
+            del self._entries[did]
+            return None
+        self._entries.move_to_end(did)
+        return entry
+
+    def invalidate(self, did: str) -> None:
+        """Drop a cached resolution, e.g. after a key rotation."""
+        self._entries.pop(did, None)
+
+    async def resolve(self, did: str) -> ResolvedDID:
+        """Resolve a DID to its document and keys.
+
+        Raises:
+            ValueError: If the DID is not a valid AIMS DID
+            DIDResolutionError: If the method is unsupported or the document is
+                missing, malformed, or for a different DID
+            httpx.HTTPError: If fetching the document fails
+        """
+        entry = self.cached(did)
+        if entry is not None:
+            return entry
+        fetch = self._inflight.get(did)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._resolve(did))
+            self._inflight[did] = fetch
+            fetch.add_done_callback(lambda _: self._inflight.pop(did, None))
+        return await asyncio.shield(fetch)
+
+    async def _resolve(self, did: str) -> ResolvedDID:
+        parsed = AIMSDID.parse(did)
+        method = self.methods.get(parsed.method)
+        if method is None:
+            raise DIDResolutionError(f"Unsupported DID method: {parsed.method}")
+        document, max_age = await method(self, parsed)
+        if document.id != did:
+            raise DIDResolutionError(f"DID Document is for {document.id}, not {did}")
+        try:
+            public_keys = document.ed25519_keys()
+            for key in public_keys.values():
+                load_public_key(key)  # fail here rather than at verification time
+        except ValueError as exc:
+            raise DIDResolutionError(f"Malformed key in DID Document for {did}: {exc}") from exc
+        lifetime = self.ttl if max_age is None else max_age
+        resolved = ResolvedDID(did, document, public_keys, self.clock() + lifetime)
+        if lifetime > 0:
+            self._entries[did] = resolved
+            self._entries.move_to_end(did)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if self.keys is not None and resolved.public_key is not None:
+            self.keys.register(did, resolved.public_key)
+        return resolved
+
+    async def public_key(self, did: str) -> bytes | None:
+        """Resolve a DID and return its first Ed25519 public key, if any."""
+        return (await self.resolve(did)).public_key
@@ -0,0 +1,194 @@
+"""Revocation - Local revocation status synced incrementally from a store.
+
+SPECIFICATION.md §8.6 Q5 and §8.7 call for a way to learn that a DID (for
+example after a key compromise) or a specific manifest version has been
+revoked. A store publishes a versioned revocation log; clients keep a
+local :class:`RevocationList` and pull only the changes since the version
+they hold, so checking a manifest is a local set lookup rather than a
+network round trip.
+
+Entries are DIDs or manifest content hashes, held as 64-bit truncated
+SHA-256 digests. Deltas travel as base64url-encoded runs of big-endian
+digests:
+
+    GET /revocations?since=<version>
+    -> {"version": 42, "full": false, "added": "<b64>", "removed": "<b64>"}
+
+``full`` is true when the store sends its whole set instead of a delta (on
+first sync, or when the client's version is unknown to the store).
+"""
+
+import asyncio
+import base64
+import hashlib
+import logging
+import random
+import struct
+import time
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from .store import ManifestStore
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SIZE = 8
+_DIGEST = struct.Struct(">Q")
+
+
+@lru_cache(maxsize=65_536)
+def revocation_digest(entry: str) -> int:
+    """Truncated digest identifying a revoked DID or content hash."""
+    return _DIGEST.unpack_from(hashlib.sha256(entry.encode()).digest())[0]
+
+
+def encode_digests(digests: Iterable[int]) -> str:
+    """Encode digests as base64url big-endian u64s, sorted for compressibility."""
+    packed = b"".join(_DIGEST.pack(digest) for digest in sorted(digests))
+    return base64.urlsafe_b64encode(packed).rstrip(b"=").decode()
+
+
+def decode_digests(encoded: str) -> list[int]:
+    """Decode digests written by :func:`encode_digests`.
+
+    Raises:
+        ValueError: If the payload is not a whole number of digests
+    """
+    raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    if len(raw) % DIGEST_SIZE:
+        raise ValueError("Revocation digest payload is truncated")
+    return [digest for (digest,) in _DIGEST.iter_unpack(raw)]
+
+
+class RevocationList:
+    """Local revocation status for DIDs and manifest versions.
+
+    Attributes:
+        version: Log version this list reflects (0 before the first sync)
+        synced_at: When the list was last updated from a store (clock time)
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self.version = 0
+        self.synced_at: float | None = None
+        self.clock = clock
+        self._digests: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def __contains__(self, entry: object) -> bool:
+        return isinstance(entry, str) and revocation_digest(entry) in self._digests
+
+    def is_revoked(self, did: str, content_hash: str | None = None) -> bool:
+        """Whether a DID, or the given version of its manifest, is revoked."""
+        digests = self._digests
+        if not digests:
+            return False
+        if revocation_digest(did) in digests:
+            return True
+        return content_hash is not None and revocation_digest(content_hash) in digests
+
+    def revoke(self, entry: str) -> None:
+        """Mark an entry revoked locally, e.g. from an out-of-band report."""
+        self._digests.add(revocation_digest(entry))
+
+    def apply(self, delta: dict[str, Any]) -> int:
+        """Apply a delta or full snapshot from ``GET /revocations``.
+
+        Returns:
+            The number of entries added or removed
+
+        Raises:
+            ValueError: If the payload is malformed
+        """
+        added = decode_digests(delta.get("added", ""))
+        removed = decode_digests(delta.get("removed", ""))
+        if delta.get("full"):
+            changed = len(self._digests.symmetric_difference(added))
+            self._digests = set(added)
+        else:
+            before = len(self._digests)
+            self._digests.difference_update(removed)
+            after_removal = len(self._digests)
+            self._digests.update(added)
+            changed = (before - after_removal) + (len(self._digests) - after_removal)
+        self.version = int(delta["version"])
+        self.synced_at = self.clock()
+        return changed
+
+
+class RevocationSync:
+    """Background task keeping a store's revocation list up to date.
+
+    Each round fetches the delta since the list's version; failures are
+    logged and the last known list stays in force until the next round.
+
+    Example:
+        store = ManifestStore(url, revocations=RevocationList())
+        async with RevocationSync(store, interval=30):
+            await store.verify(did)
+    """
+
+    def __init__(self, store: "ManifestStore", interval: float = 60.0, jitter: float = 0.1):
+        """Initialize the sync task.
+
+        Args:
+            store: Store to sync from; must have a ``revocations`` list
+            interval: Seconds between syncs
+            jitter: Fractional random spread applied to each interval
+        """
+        if store.revocations is None:
+            raise ValueError("The store has no revocation list to sync")
+        self.store = store
+        self.interval = interval
+        self.jitter = jitter
+        self.failures = 0
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start syncing in the background on the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="aims-revocation-sync")
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> Self:
+        """Sync once, then keep syncing in the background."""
+        await self.store.sync_revocations()
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the background task."""
+        await self.stop()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+            try:
+                await self.store.sync_revocations()
+            except Exception:
+                self.failures += 1
+                logger.warning("Revocation sync failed", exc_info=True)
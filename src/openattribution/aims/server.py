@@ -0,0 +1,678 @@
+"""Reference Manifest Store server.
+
+A small ASGI application implementing the routes :class:`ManifestStore`
+talks to, backed by SQLite in WAL mode. It is meant for running a local
+registry mirror and for load-testing clients without an outside service.
+
+Storage follows SPECIFICATION.md §4.2:
+
+- Content addressed: each manifest is stored once under the hash of its
+  stored bytes (signature included), however many DIDs or versions refer
+  to it.
+- Version history: every publish that changes a DID's manifest appends a
+  numbered version; older versions stay retrievable. Adding or replacing
+  only the signature counts as a change.
+
+Routes:
+    POST  /manifests                                 publish a manifest (JSON or binary)
+    GET   /manifests/{did}                           latest version (ETag / If-None-Match aware)
+    PATCH /manifests/{did}                           publish a JSON Patch against the latest
+    GET   /manifests/{did}/versions?since={version}  version history
+    GET   /manifests/{did}/versions/{version}        a specific version
+    GET   /manifests/{did}/versions/{version}/patch?from={version}
+                                                     JSON Patch between two versions
+    GET   /hashes/{hash}                             a manifest by content hash
+    GET   /datasets/{dataset}/systems                systems trained on a dataset (lineage.py)
+    GET   /revocations?since={version}               revocation delta (see revocation.py)
+    POST  /revocations                               revoke or reinstate a DID or content hash
+
+Manifest routes negotiate the binary wire format (see wire.py) through
+``Accept``, and publishes may send it with a matching ``Content-Type``.
+
+A PATCH carries an ``application/json-patch+json`` body (see patch.py) and
+must name the version it was computed against with ``If-Match``; it is
+refused with 412 if another publish got there first. An
+``X-AIMS-Entity-Hash`` header, if sent, must match the patched result's
+entity hash (its ETag, which covers the signature).
+
+Run with ``python -m openattribution.aims.server`` (requires the ``server`` extra).
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, MutableMapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs
+
+from pydantic import ValidationError
+
+from .canonical import canonical_model_json, content_hash
+from .lineage import LineageIndex
+from .manifest import AIManifest
+from .patch import PATCH_MEDIA_TYPE, PatchError, apply_patch, diff
+from .revocation import encode_digests, revocation_digest
+from .wire import (
+    CBOR_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    WireFormatError,
+    decode_manifest,
+    encode_value,
+    media_type,
+    negotiate,
+)
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+MAX_BODY_SIZE = 16 * 1024 * 1024
+BINARY_CACHE_ENTRIES = 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    body BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS versions (
+    did TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    published_at REAL NOT NULL,
+    blob TEXT NOT NULL REFERENCES blobs(hash),
+    PRIMARY KEY (did, version)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS versions_by_hash ON versions(hash);
+CREATE TABLE IF NOT EXISTS revocation_log (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    entry TEXT NOT NULL,
+    digest INTEGER NOT NULL,
+    revoked INTEGER NOT NULL,
+    reason TEXT,
+    logged_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS revoked (
+    digest INTEGER PRIMARY KEY
+);
+"""
+
+
+class VersionConflictError(Exception):
+    """A conditional publish found a different latest version than expected."""
+
+
+@dataclass(frozen=True)
+class StoredManifest:
+    """One stored manifest version.
+
+    Attributes:
+        did: The manifest's DID
+        version: Version number within the DID's history (starting at 1)
+        hash: Content hash of the manifest
+        published_at: Publication time (seconds since epoch)
+        body_hash: Hash of ``body``, served as the version's ETag
+        body: Canonical JSON encoding of the full manifest, including its signature
+    """
+
+    did: str
+    version: int
+    hash: str
+    published_at: float
+    body_hash: str
+    body: bytes
+
+
+class ManifestRepository:
+    """SQLite-backed, content-addressed and versioned manifest storage.
+
+    Each thread gets its own connection; WAL mode lets readers proceed while
+    a write is in progress, including readers in other processes sharing the
+    same database file. The latest version of recently read or published
+    DIDs is also kept in a small in-process LRU. Only this repository's own
+    publishes update it, so pass ``hot_entries=0`` if other processes write
+    to the same database file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        hot_entries: int = 10_000,
+        lineage: LineageIndex | None = None,
+    ):
+        """Open (and if needed create) a repository.
+
+        Args:
+            path: SQLite database file, or ":memory:" for a private in-memory store
+            hot_entries: Number of latest versions kept in the in-process LRU
+                (0 disables it)
+            lineage: Lineage index kept up to date with each DID's latest version
+        """
+        self.path = str(path)
+        self.hot_entries = hot_entries
+        self.lineage = lineage
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._write_lock = threading.Lock()
+        self._hot: OrderedDict[str, StoredManifest] = OrderedDict()
+        self._hot_lock = threading.Lock()
+        if self.path == ":memory:":
+            # A shared-cache URI so every thread's connection sees the same database.
+            self._uri = f"file:aims-{uuid.uuid4().hex}?mode=memory&cache=shared"
+            self._keepalive = self._connect()
+        else:
+            self._uri = Path(self.path).resolve().as_uri()
+        with self._write_lock:
+            self._connection().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        return connection
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+            self._connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        """Close every connection opened by this repository."""
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+        self._local = threading.local()
+        if self.path == ":memory:":
+            self._keepalive.close()
+
+    def publish(self, manifest: AIManifest, base_hash: str | None = None) -> StoredManifest:
+        """Store a manifest, appending a version if it changed.
+
+        Publishing the DID's current manifest again, signature included, is
+        a no-op that returns the existing version.
+
+        Args:
+            manifest: The manifest to store
+            base_hash: If given, the body hash the DID's latest version must
+                have for the publish to go ahead
+
+        Raises:
+            VersionConflictError: If ``base_hash`` is not the latest version's body hash
+        """
+        body = canonical_model_json(manifest)
+        body_hash = content_hash(body)
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR IGNORE INTO blobs (hash, body) VALUES (?, ?)", (body_hash, body)
+                )
+                row = connection.execute(
+                    "SELECT version, blob FROM versions WHERE did = ? "
+                    "ORDER BY version DESC LIMIT 1",
+                    (manifest.did,),
+                ).fetchone()
+                if base_hash is not None and (row is None or row[1] != base_hash):
+                    raise VersionConflictError(manifest.did)
+                if row is not None and row[1] == body_hash:
+                    return self.version(manifest.did, row[0])  # type: ignore[return-value]
+                stored = StoredManifest(
+                    did=manifest.did,
+                    version=(row[0] if row is not None else 0) + 1,
+                    hash=manifest.content_hash,
+                    published_at=time.time(),
+                    body_hash=body_hash,
+                    body=body,
+                )
+                connection.execute(
+                    "INSERT INTO versions (did, version, hash, published_at, blob) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (stored.did, stored.version, stored.hash, stored.published_at, body_hash),
+                )
+            # Cached and indexed under the write lock, so a reader that fetched
+            # the previous version cannot put it back afterwards (see latest)
+            # and concurrent publishes reach the lineage index in version order.
+            self._cache_latest(stored)
+            if self.lineage is not None:
+                self.lineage.add(manifest)
+        return stored
+
+    def _fetch(self, where: str, params: tuple[Any, ...]) -> StoredManifest | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT v.did, v.version, v.hash, v.published_at, v.blob, b.body "
+                f"FROM versions v JOIN blobs b ON b.hash = v.blob WHERE {where}",
+                params,
+            )
+            .fetchone()
+        )
+        return StoredManifest(*row) if row is not None else None
+
+    def latest(self, did: str) -> StoredManifest | None:
+        """The current version of a DID's manifest."""
+        with self._hot_lock:
+            stored = self._hot.get(did)
+            if stored is not None:
+                self._hot.move_to_end(did)
+                return stored
+        stored = self._fetch("v.did = ? ORDER BY v.version DESC LIMIT 1", (did,))
+        if stored is not None:
+            self._cache_latest(stored)
+        return stored
+
+    def _cache_latest(self, stored: StoredManifest) -> None:
+        """Put a DID's latest version in the LRU unless a newer one is already there."""
+        if self.hot_entries <= 0:
+            return
+        with self._hot_lock:
+            cached = self._hot.get(stored.did)
+            if cached is None or cached.version < stored.version:
+                self._hot[stored.did] = stored
+            self._hot.move_to_end(stored.did)
+            if len(self._hot) > self.hot_entries:
+                self._hot.popitem(last=False)
+
+    def version(self, did: str, version: int) -> StoredManifest | None:
+        """A specific version of a DID's manifest."""
+        return self._fetch("v.did = ? AND v.version = ?", (did, version))
+
+    def by_hash(self, content_hash: str) -> StoredManifest | None:
+        """The earliest stored version with the given content hash."""
+        return self._fetch("v.hash = ? ORDER BY v.published_at LIMIT 1", (content_hash,))
+
+    def history(self, did: str, since: int = 0) -> list[StoredManifest]:
+        """Versions of a DID's manifest after ``since``, oldest first, without bodies."""
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT did, version, hash, published_at, blob FROM versions "
+                "WHERE did = ? AND version > ? ORDER BY version",
+                (did, since),
+            )
+            .fetchall()
+        )
+        return [StoredManifest(*row, body=b"") for row in rows]
+
+    def revoke(self, entry: str, revoked: bool = True, reason: str | None = None) -> int:
+        """Revoke (or reinstate) a DID or manifest content hash.
+
+        Returns:
+            The revocation log version recording the change
+        """
+        # SQLite INTEGER is signed; store the u64 digest's two's complement.
+        digest = _signed(revocation_digest(entry))
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                cursor = connection.execute(
+                    "INSERT INTO revocation_log (entry, digest, revoked, reason, logged_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (entry, digest, int(revoked), reason, time.time()),
+                )
+                if revoked:
+                    connection.execute("INSERT OR IGNORE INTO revoked VALUES (?)", (digest,))
+                else:
+                    connection.execute("DELETE FROM revoked WHERE digest = ?", (digest,))
+        return cursor.lastrowid  # type: ignore[return-value]
+
+    def revocations_since(self, version: int) -> dict[str, Any]:
+        """Revocation changes after ``version``, or the full set if it is unknown."""
+        connection = self._connection()
+        current = connection.execute("SELECT MAX(version) FROM revocation_log").fetchone()[0] or 0
+        if version <= 0 or version > current:
+            digests = [_unsigned(d) for (d,) in connection.execute("SELECT digest FROM revoked")]
+            return {"version": current, "full": True, "added": encode_digests(digests)}
+        state: dict[int, bool] = {}
+        rows = connection.execute(
+            "SELECT digest, revoked FROM revocation_log WHERE version > ? ORDER BY version",
+            (version,),
+        )
+        for digest, revoked in rows:
+            state[_unsigned(digest)] = bool(revoked)
+        return {
+            "version": current,
+            "full": False,
+            "added": encode_digests(d for d, revoked in state.items() if revoked),
+            "removed": encode_digests(d for d, revoked in state.items() if not revoked),
+        }
+
+
+def _signed(digest: int) -> int:
+    return digest - (1 << 64) if digest >= 1 << 63 else digest
+
+
+def _unsigned(digest: int) -> int:
+    return digest + (1 << 64) if digest < 0 else digest
+
+
+def _quote_etag(tag: str) -> str:
+    return f'"{tag}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if header is None:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in header.split(","))
+
+
+class ManifestStoreApp:
+    """ASGI application serving a :class:`ManifestRepository`.
+
+    Binary encodings are derived from the stored JSON on demand and kept in
+    a small LRU keyed by body hash, since a stored body never changes.
+    Repository calls block on SQLite, so they run in worker threads rather
+    than on the event loop.
+    """
+
+    def __init__(self, repository: ManifestRepository):
+        self.repository = repository
+        self._binary: OrderedDict[str, bytes] = OrderedDict()
+        self._binary_lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        status, response_headers, body = await self._route(scope, headers, receive)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (name.encode("latin-1"), value.encode("latin-1"))
+                    for name, value in [*response_headers, ("content-length", str(len(body)))]
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _route(
+        self, scope: Scope, headers: dict[str, str], receive: Receive
+    ) -> tuple[int, list[tuple[str, str]], bytes]:
+        method, path = scope["method"], scope["path"].rstrip("/")
+        if path == "/manifests":
+            if method != "POST":
+                return _error(405, "Method not allowed")
+            return await self._publish(receive, headers)
+        if path == "/revocations":
+            if method == "POST":
+                return await self._revoke(receive)
+            return await asyncio.to_thread(self._revocations, scope)
+        if method == "PATCH" and path.startswith("/manifests/") and "/versions" not in path:
+            return await self._patch(path.removeprefix("/manifests/"), receive, headers)
+        if method not in ("GET", "HEAD"):
+            return _error(405, "Method not allowed")
+        return await asyncio.to_thread(self._get, scope, path, headers)
+
+    def _get(
+        self, scope: Scope, path: str, headers: dict[str, str]
+    ) -> tuple[int, list[tuple[str, str]], bytes]:
+        if path.startswith("/datasets/") and path.endswith("/systems"):
+            return self._systems(scope, path.removeprefix("/datasets/").removesuffix("/systems"))
+        if path.startswith("/hashes/"):
+            return self._manifest(self.repository.by_hash(path.removeprefix("/hashes/")), headers)
+        if not path.startswith("/manifests/"):
+            return _error(404, "Not found")
+
+        did, versions, rest = path.removeprefix("/manifests/").partition("/versions")
+        if not versions:
+            return self._manifest(self.repository.latest(did), headers)
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if not rest:
+            try:
+                since = int(query.get("since", ["0"])[0])
+            except ValueError:
+                return _error(400, "since must be an integer")
+            if self.repository.latest(did) is None:
+                return _error(404, "Not found")
+            history = [
+                {"version": v.version, "hash": v.hash, "published_at": v.published_at}
+                for v in self.repository.history(did, since)
+            ]
+            return _json(200, {"did": did, "versions": history})
+        version_part, is_patch, _ = rest.removeprefix("/").partition("/patch")
+        try:
+            version = int(version_part)
+        except ValueError:
+            return _error(404, "Not found")
+        if not is_patch:
+            return self._manifest(self.repository.version(did, version), headers)
+        try:
+            base = int(query["from"][0])
+        except (KeyError, ValueError):
+            return _error(400, "from must be a version number")
+        return self._version_patch(did, base, version)
+
+    def _manifest(
+        self, stored: StoredManifest | None, headers: dict[str, str]
+    ) -> tuple[int, list[tuple[str, str]], bytes]:
+        if stored is None:
+            return _error(404, "Not found")
+        etag = _quote_etag(stored.body_hash)
+        response_headers = [
+            ("etag", etag),
+            ("x-aims-version", str(stored.version)),
+            ("cache-control", "no-cache"),
+            ("vary", "accept"),
+        ]
+        if _etag_matches(headers.get("if-none-match"), etag):
+            return 304, response_headers, b""
+        if negotiate(headers.get("accept")) == CBOR_MEDIA_TYPE:
+            body = self._binary_body(stored)
+            return 200, [("content-type", CBOR_MEDIA_TYPE), *response_headers], body
+        return 200, [("content-type", JSON_MEDIA_TYPE), *response_headers], stored.body
+
+    def _binary_body(self, stored: StoredManifest) -> bytes:
+        with self._binary_lock:
+            body = self._binary.get(stored.body_hash)
+            if body is not None:
+                self._binary.move_to_end(stored.body_hash)
+                return body
+        body = encode_value(json.loads(stored.body))
+        with self._binary_lock:
+            self._binary[stored.body_hash] = body
+            if len(self._binary) > BINARY_CACHE_ENTRIES:
+                self._binary.popitem(last=False)
+        return body
+
+    async def _publish(
+        self, receive: Receive, headers: dict[str, str]
+    ) -> tuple[int, list[tuple[str, str]], bytes]:
+        content_type = media_type(headers.get("content-type"))
+        if content_type not in (JSON_MEDIA_TYPE, CBOR_MEDIA_TYPE):
+            return _error(415, f"Unsupported media type {content_type}")
+        body = await _read_body(receive)
+        if body is None:
+            return _error(413, "Manifest too large")
+        try:
+            if content_type == CBOR_MEDIA_TYPE:
+                manifest = decode_manifest(body)
+            else:
+                manifest = AIManifest.model_validate_json(body)
+        except WireFormatError as exc:
+            return _error(400, str(exc))
+        except ValidationError as exc:
+            return _json(422, {"detail": json.loads(exc.json(include_url=False))})
+        stored = await asyncio.to_thread(self.repository.publish, manifest)
+        return _json(
+            201,
+            {"did": stored.did, "version": stored.version, "hash": stored.hash},
+            [("etag", _quote_etag(stored.body_hash))],
+        )
+
+    async def _patch(
+        self, did: str, receive: Receive, headers: dict[str, str]
+    ) -> tuple[int, list[tuple[str, str]], bytes]:
+        if media_type(headers.get("content-type")) != PATCH_MEDIA_TYPE:
+            return _error(415, f"Expected {PATCH_MEDIA_TYPE}")
+        if_match = headers.get("if-match")
+        if if_match is None:
+            return _error(428, "If-Match with the base version's ETag is required")
+        body = await _read_body(receive)
+        if body is None:
+            return _error(413, "Patch too large")
+        stored = await asyncio.to_thread(self.repository.latest, did)
+        if stored is None:
+            return _error(404, "Not found")
+        if not _etag_matches(if_match, _quote_etag(stored.body_hash)):
+            return _error(412, "The latest version is not the patch's base")
+        try:
+            document = apply_patch(json.loads(stored.body), json.loads(body))
+        except ValueError as exc:  # PatchError, or a body that is not JSON
+            return _error(409 if isinstance(exc, PatchError) else 400, str(exc))
+        try:
+            manifest = AIManifest.model_validate(document)
+        except ValidationError as exc:
+            return _json(422, {"detail": json.loads(exc.json(include_url=False))})
+        if manifest.did != did:
+            return _error(409, "A patch may not change the manifest's DID")
+        expected = headers.get("x-aims-entity-hash")
+        if expected is not None and expected != manifest.entity_hash:
+            return _error(409, "The patched manifest does not have the expected entity hash")
+        try:
+            stored = await asyncio.to_thread(
+                self.repository.publish, manifest, base_hash=stored.body_hash
+            )
+        except VersionConflictError:
+            return _error(412, "The latest version is not the patch's base")
+        return _json(
+            200,
+            {"did": stored.did, "version": stored.version, "hash": stored.hash},
+            [("etag", _quote_etag(stored.body_hash))],
+        )
+
+    def _version_patch(
+        self, did: str, base: int, version: int
+    ) -> tuple[int, list[tuple[str, str]], bytes]:
+        source = self.repository.version(did, base)
+        target = self.repository.version(did, version)
+        if source is None or target is None:
+            return _error(404, "Not found")
+        patch = diff(json.loads(source.body), json.loads(target.body))
+        return _json(
+            200,
+            {"did": did, "from": base, "version": version, "hash": target.hash, "patch": patch},
+            [
+                ("etag", _quote_etag(target.body_hash)),
+                ("cache-control", "max-age=31536000, immutable"),
+            ],
+        )
+
+    def _systems(self, scope: Scope, dataset: str) -> tuple[int, list[tuple[str, str]], bytes]:
+        lineage = self.repository.lineage
+        if lineage is None:
+            return _error(404, "Lineage index not enabled")
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        transitive = query.get("transitive", ["true"])[0].lower() != "false"
+        systems = sorted(lineage.systems_using(dataset, transitive=transitive))
+        return _json(200, {"dataset": dataset, "transitive": transitive, "systems": systems})
+
+    def _revocations(self, scope: Scope) -> tuple[int, list[tuple[str, str]], bytes]:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        try:
+            since = int(query.get("since", ["0"])[0])
+        except ValueError:
+            return _error(400, "since must be an integer")
+        return _json(200, self.repository.revocations_since(since))
+
+    async def _revoke(self, receive: Receive) -> tuple[int, list[tuple[str, str]], bytes]:
+        body = await _read_body(receive)
+        try:
+            request = json.loads(body or b"")
+            entry = request["entry"]
+            revoked = bool(request.get("revoked", True))
+            reason = request.get("reason")
+        except (ValueError, KeyError, TypeError):
+            return _error(400, 'Expected {"entry": ..., "revoked": true|false}')
+        if not isinstance(entry, str):
+            return _error(400, "entry must be a DID or content hash")
+        version = await asyncio.to_thread(self.repository.revoke, entry, revoked, reason)
+        return _json(201, {"entry": entry, "revoked": revoked, "version": version})
+
+
+async def _read_body(receive: Receive) -> bytes | None:
+    """Read a request body, or None if it exceeds MAX_BODY_SIZE."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_SIZE:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _json(
+    status: int, data: Any, headers: list[tuple[str, str]] | None = None
+) -> tuple[int, list[tuple[str, str]], bytes]:
+    body = json.dumps(data).encode()
+    return status, [("content-type", "application/json"), *(headers or [])], body
+
+
+def _error(status: int, detail: str) -> tuple[int, list[tuple[str, str]], bytes]:
+    return _json(status, {"detail": detail})
+
+
+def create_app(
+    path: str | Path = ":memory:", lineage_path: str | Path | None = None
+) -> ManifestStoreApp:
+    """Create a store app over the SQLite database at ``path``.
+
+    Args:
+        path: Manifest database file
+        lineage_path: Lineage index file; enables the /datasets routes (in
+            memory for an in-memory store)
+    """
+    lineage = None
+    if lineage_path is not None:
+        lineage = LineageIndex(None if str(lineage_path) == ":memory:" else lineage_path)
+    return ManifestStoreApp(ManifestRepository(path, lineage=lineage))
+
+
+def main() -> None:
+    """Serve a local manifest store with uvicorn."""
+    import argparse
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit(
+            "The reference server needs uvicorn: pip install 'openattribution-aims[server]'"
+        ) from None
+
+    parser = argparse.ArgumentParser(description="Run a local AIMS manifest store.")
+    parser.add_argument("--db", default="aims-store.db", help="SQLite database file")
+    parser.add_argument("--lineage-db", default=None, help="Lineage index file (optional)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.db, args.lineage_db), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,93 @@
 """Manifest Store - Distributed registry for AIMS manifests."""
 
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Self, TypeVar
+
 import httpx
 from pydantic import BaseModel, Field
+from pydantic_core import from_json, to_json
 
+from .cache import CacheEntry, ManifestCache, max_age, no_store
+from .instrumentation import (
+    CONNECT,
+    DECODE,
+    PAYLOAD_BYTES,
+    TRANSFER,
+    VALIDATE,
+    ConnectTrace,
+    enabled,
+    observe,
+    span,
+)
+from .lazy import InternPool, LazyManifest
 from .manifest import AIManifest
+from .patch import PATCH_MEDIA_TYPE, apply_patch, diff
+from .revocation import RevocationList
+from .wire import (
+    CBOR_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    decode_value,
+    encode_manifest,
+    media_type,
+    parse_manifest,
+)
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+DEFAULT_CONCURRENCY = 16
+DELTA_BASES = 1_024
+# Responses to a delta publish that a full publish can recover from
+_DELTA_REJECTED = frozenset({404, 409, 412, 422, 428})
+# Responses meaning the store does not support delta publishes at all
+_DELTA_UNSUPPORTED = frozenset({405, 415, 501})
+BINARY_ACCEPT = f"{CBOR_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.5"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one DID in a bulk store operation.
+
+    Attributes:
+        did: The DID this result is for
+        manifest: The resolved or published manifest (None if not found or failed)
+        error: The exception raised for this DID, if any
+    """
+
+    did: str
+    manifest: AIManifest | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded for this DID."""
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class ManifestVersion:
+    """One entry in a DID's version history.
+
+    Attributes:
+        did: The manifest's DID
+        version: Version number within the DID's history (starting at 1)
+        hash: Content hash of that version
+        published_at: Publication time (seconds since epoch)
+    """
+
+    did: str
+    version: int
+    hash: str
+    published_at: float
 
 
 class ManifestStore:
@@ -11,17 +95,125 @@ class ManifestStore:
 
     Manifest stores are distributed registries where AI systems publish
     their manifests for discovery and verification by other agents.
+
+    The store owns a single pooled HTTP client that is created on first use
+    and shared by every request, so repeated resolves reuse kept-alive
+    connections instead of paying for a new TCP/TLS handshake each time.
+    The client is safe to share between any number of coroutines running
+    on the same event loop. Use the store as an async context manager, or
+    call :meth:`aclose`, to release the pool.
+
+    When a :class:`ManifestCache` is supplied, resolved manifests are served
+    from it while fresh, and stale entries are revalidated with a
+    conditional request so an unchanged manifest is neither downloaded nor
+    parsed again.
+    :meth:`resolve_lazy` returns a :class:`~openattribution.aims.lazy.LazyManifest`
+    view instead, validating each layer only when it is read.
+
+    When a :class:`RevocationList` is supplied, cached manifests whose DID
+    or version has been revoked are not served, and :meth:`verify` rejects
+    them. Keep the list current with :meth:`sync_revocations` or a
+    :class:`~openattribution.aims.revocation.RevocationSync` task.
+
+    With ``binary=True`` manifests are exchanged in the compact binary wire
+    format (see :mod:`openattribution.aims.wire`) when the store supports
+    it: resolves ask for it in ``Accept`` and parse whichever format the
+    response declares, and publishes fall back to JSON, for the rest of the
+    store's lifetime, if the store answers 415 Unsupported Media Type.
+
+    Requests report connect, transfer, payload size, decode and validate
+    metrics to any sinks registered with
+    :mod:`openattribution.aims.instrumentation`, tagged with the store URL.
+
+    Concurrent resolves of the same DID are coalesced: only one request is
+    sent and every caller shares its result.
+
+    :meth:`publish_delta` sends only a JSON Patch against the version last
+    published or resolved through this client, and :meth:`resolve_history`
+    walks a DID's version chain one patch at a time.
+
+    Example:
+        async with ManifestStore("https://aims.openattribution.org") as store:
+            manifest = await store.resolve("did:aims:web:example.com:agent")
     """
 
-    def __init__(self, base_url: str, timeout: float = 30.0):
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30.0,
+        *,
+        http2: bool = False,
+        limits: httpx.Limits | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: ManifestCache | None = None,
+        revocations: RevocationList | None = None,
+        binary: bool = False,
+        intern_pool: InternPool | None = None,
+    ):
         """Initialize the manifest store client.
 
         Args:
             base_url: Base URL of the manifest store
             timeout: Request timeout in seconds
+            http2: Enable HTTP/2 (requires the ``http2`` extra)
+            limits: Connection pool limits (defaults to :data:`DEFAULT_LIMITS`)
+            transport: Custom transport, e.g. for testing against an in-process store
+            cache: Manifest cache consulted before going to the network
+            revocations: Revocation list checked on cache hits and by :meth:`verify`
+            binary: Prefer the binary wire format over JSON
+            intern_pool: Pool shared by the views :meth:`resolve_lazy` returns
+                (a new one if None)
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.http2 = http2
+        self.limits = limits or DEFAULT_LIMITS
+        self._transport = transport
+        self.cache = cache
+        self.revocations = revocations
+        self.binary = binary
+        self.intern_pool = intern_pool if intern_pool is not None else InternPool()
+        self._binary_publish = binary
+        self._delta_publish = True
+        self._published: OrderedDict[str, tuple[str, dict[str, Any]]] = OrderedDict()
+        self._metric_attributes = {"store": self.base_url}
+        self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[tuple[str, str | None], asyncio.Future[CacheEntry | None]] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared pooled HTTP client, created on first access."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the connection pool.
+
+        The store remains usable; a new pool is opened on the next request.
+        """
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def __aenter__(self) -> Self:
+        """Open the connection pool."""
+        _ = self.client
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the connection pool."""
+        await self.aclose()
 
     async def publish(self, manifest: AIManifest) -> str:
         """Publish a manifest to the store.
@@ -35,19 +227,111 @@ class ManifestStore:
         Raises:
             httpx.HTTPError: If the request fails
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/manifests",
-                json=manifest.model_dump(mode="json"),
+        url = f"{self.base_url}/manifests"
+        document = manifest.model_dump(mode="json")
+        entity_hash = manifest.entity_hash
+        if self._binary_publish:
+            response = await self._request(
+                "POST",
+                url,
+                content=encode_manifest(manifest),
+                headers={"Content-Type": CBOR_MEDIA_TYPE},
             )
+            if response.status_code != 415:
+                response.raise_for_status()
+                self._remember(manifest.did, entity_hash, document)
+                return manifest.did
+            self._binary_publish = False
+        response = await self._request("POST", url, json=document)
+        response.raise_for_status()
+        self._remember(manifest.did, entity_hash, document)
+        return manifest.did
+
+    async def publish_delta(
+        self, manifest: AIManifest, base: AIManifest | None = None, *, fallback: bool = True
+    ) -> str:
+        """Publish a manifest as a JSON Patch against its previous version.
+
+        The patch is computed against ``base`` or, by default, the version of
+        the DID last published through this client (or held in its cache).
+        It is sent with the base's entity hash in ``If-Match``, so the
+        store rejects it if another publish has landed since, and with the
+        new entity hash, so a patch that would not reproduce this manifest
+        exactly, signature included, is rejected too.
+
+        With ``fallback`` (the default), a rejected patch is followed by a
+        full :meth:`publish`, as is a publish with no known base or whose
+        patch would be no smaller than the whole manifest. A store without
+        delta support is detected once, and later calls publish in full.
+
+        Args:
+            manifest: The AI manifest to publish
+            base: The version the store currently holds for this DID
+            fallback: Publish the full manifest if the patch is rejected
+
+        Returns:
+            The DID of the published manifest
+
+        Raises:
+            httpx.HTTPError: If the request fails, or the patch is rejected
+                and ``fallback`` is False
+        """
+        did = manifest.did
+        known = self._base(did, base)
+        if known is None or not self._delta_publish:
+            return await self.publish(manifest)
+        base_hash, base_document = known
+        document = manifest.model_dump(mode="json")
+        body = to_json(diff(base_document, document))
+        if fallback and len(body) >= len(to_json(document)):
+            return await self.publish(manifest)
+        entity_hash = manifest.entity_hash
+        response = await self._request(
+            "PATCH",
+            f"{self.base_url}/manifests/{did}",
+            content=body,
+            headers={
+                "Content-Type": PATCH_MEDIA_TYPE,
+                "If-Match": f'"{base_hash}"',
+                "X-AIMS-Entity-Hash": entity_hash,
+            },
+        )
+        if response.is_success:
+            self._remember(did, entity_hash, document)
+            return did
+        if response.status_code in _DELTA_UNSUPPORTED:
+            self._delta_publish = False
+        elif not fallback or response.status_code not in _DELTA_REJECTED:
             response.raise_for_status()
-            return manifest.did
+        self._published.pop(did, None)
+        return await self.publish(manifest)
 
-    async def resolve(self, did: str) -> AIManifest | None:
+    def _base(self, did: str, base: AIManifest | None) -> tuple[str, dict[str, Any]] | None:
+        """The (entity hash, JSON document) a delta for ``did`` is computed against."""
+        if base is not None:
+            return base.entity_hash, base.model_dump(mode="json")
+        known = self._published.get(did)
+        if known is not None:
+            return known
+        entry = self.cache.peek(did) if self.cache is not None else None
+        if entry is not None:
+            return entry.manifest.entity_hash, entry.manifest.model_dump(mode="json")
+        return None
+
+    def _remember(self, did: str, entity_hash: str, document: dict[str, Any]) -> None:
+        self._published[did] = (entity_hash, document)
+        self._published.move_to_end(did)
+        if len(self._published) > DELTA_BASES:
+            self._published.popitem(last=False)
+
+    async def resolve(self, did: str, expected_hash: str | None = None) -> AIManifest | None:
         """Resolve a DID to its manifest.
 
         Args:
             did: The DID to resolve
+            expected_hash: Content hash from a counterparty's attestation. A cached
+                copy with this hash is used regardless of its age; any other
+                cached copy is bypassed.
 
         Returns:
             The AI manifest if found, None otherwise
@@ -55,26 +339,369 @@ class ManifestStore:
         Raises:
             httpx.HTTPError: If the request fails (except 404)
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(f"{self.base_url}/manifests/{did}")
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            return AIManifest.model_validate(response.json())
+        entry = await self._resolve_entry(did, expected_hash)
+        return self._manifest(entry) if entry is not None else None
+
+    async def resolve_lazy(self, did: str, expected_hash: str | None = None) -> LazyManifest | None:
+        """Resolve a DID to a lazily validated view of its manifest.
+
+        Like :meth:`resolve`, but only the top-level fields and redistribution
+        policy are validated; each layer is validated on first access and
+        pooled in :attr:`intern_pool`, and the view is kept with the cache
+        entry. Use this when most resolves only read ``did`` and
+        ``redistribution_policy``.
+
+        Args:
+            did: The DID to resolve
+            expected_hash: Content hash from a counterparty's attestation (see
+                :meth:`resolve`); checking it validates the whole manifest once
 
-    async def verify(self, did: str) -> bool:
+        Returns:
+            A read-only view of the manifest if found, None otherwise
+
+        Raises:
+            httpx.HTTPError: If the request fails (except 404)
+        """
+        entry = await self._resolve_entry(did, expected_hash)
+        if entry is None:
+            return None
+        if entry.view is None:
+            try:
+                entry.view = LazyManifest(entry.body, entry.media_type, pool=self.intern_pool)
+            except ValueError:
+                self._discard(entry)
+                raise
+        return entry.view
+
+    async def _resolve_entry(self, did: str, expected_hash: str | None) -> CacheEntry | None:
+        entry = self.cache.get(did) if self.cache is not None else None
+        if entry is not None and self._revoked(did, entry):
+            # The store may have published a replacement for a revoked version.
+            self.cache.invalidate(did)
+            entry = None
+        validator = None
+        if entry is not None:
+            if expected_hash is not None:
+                if entry.content_hash == expected_hash:
+                    return entry
+            elif entry.is_fresh(self.cache.clock()):
+                return entry
+            else:
+                validator = entry.validator
+        return await self._coalesced(did, validator)
+
+    async def refresh(self, did: str) -> AIManifest | None:
+        """Revalidate a DID with the store even if its cached copy is fresh.
+
+        An unchanged manifest costs a conditional request and extends the
+        cached copy's lifetime; a changed one replaces it.
+
+        Args:
+            did: The DID to refresh
+
+        Returns:
+            The current manifest, or None if the store no longer has one
+
+        Raises:
+            httpx.HTTPError: If the request fails (except 404)
+        """
+        entry = self.cache.peek(did) if self.cache is not None else None
+        entry = await self._coalesced(did, entry.validator if entry is not None else None)
+        return self._manifest(entry) if entry is not None else None
+
+    async def _coalesced(self, did: str, validator: str | None) -> CacheEntry | None:
+        key = (did, validator)
+        fetch = self._inflight.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch(did, validator))
+            self._inflight[key] = fetch
+            fetch.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield the shared fetch so one caller being cancelled doesn't fail the others.
+        return await asyncio.shield(fetch)
+
+    async def _fetch(self, did: str, validator: str | None) -> CacheEntry | None:
+        url = f"{self.base_url}/manifests/{did}"
+        headers = {"Accept": BINARY_ACCEPT} if self.binary else {}
+        if validator is not None:
+            headers["If-None-Match"] = validator
+        response = await self._request("GET", url, headers=headers)
+        if response.status_code == 304 and validator is not None:
+            entry = self.cache.refresh(did, max_age(response))
+            if entry is not None:
+                return entry
+            del headers["If-None-Match"]
+            response = await self._request("GET", url, headers=headers)
+        if response.status_code == 404:
+            if self.cache is not None:
+                self.cache.invalidate(did)
+            return None
+        response.raise_for_status()
+
+        # The body is validated when a caller first asks for the manifest (or
+        # a layer of its lazy view), not here.
+        content_type = media_type(response.headers.get("Content-Type"))
+        etag, ttl = response.headers.get("ETag"), max_age(response)
+        if self.cache is not None and not no_store(response):
+            return self.cache.put(did, None, response.content, etag, ttl, media_type=content_type)
+        return CacheEntry(did, response.content, etag, 0.0, media_type=content_type)
+
+    def _manifest(self, entry: CacheEntry) -> AIManifest:
+        """The entry's validated manifest, parsed (and timed) on first use."""
+        if entry.parsed is None:
+            try:
+                entry.parsed = self._parse(entry.body, entry.media_type)
+            except ValueError:  # ValidationError or WireFormatError
+                self._discard(entry)
+                raise
+        return entry.parsed
+
+    def _discard(self, entry: CacheEntry) -> None:
+        """Drop an entry whose body turned out not to be a valid manifest."""
+        if self.cache is not None and self.cache.peek(entry.did) is entry:
+            self.cache.invalidate(entry.did)
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        if not enabled():
+            return await self.client.request(method, url, **kwargs)
+        trace = ConnectTrace()
+        start = time.perf_counter()
+        response = await self.client.request(method, url, extensions={"trace": trace}, **kwargs)
+        elapsed = time.perf_counter() - start
+        attributes = self._metric_attributes
+        if trace.elapsed is not None:
+            observe(CONNECT, trace.elapsed, attributes)
+            elapsed -= trace.elapsed
+        observe(TRANSFER, elapsed, attributes)
+        observe(PAYLOAD_BYTES, len(response.content), attributes)
+        return response
+
+    def _parse(self, body: bytes, content_type: str) -> AIManifest:
+        if not enabled():
+            return parse_manifest(body, content_type)
+        # pydantic parses and validates JSON in one pass; split the two while
+        # instrumented so each phase can be timed.
+        return self._parse_document(body, content_type)[1]
+
+    def _parse_document(self, body: bytes, content_type: str) -> tuple[Any, AIManifest]:
+        """Decode a body of either wire format, returning the document and its manifest."""
+        attributes = self._metric_attributes
+        with span(DECODE, attributes):
+            data = decode_value(body) if content_type == CBOR_MEDIA_TYPE else from_json(body)
+        with span(VALIDATE, attributes):
+            return data, AIManifest.model_validate(data)
+
+    async def history(self, did: str, since: int = 0) -> list[ManifestVersion]:
+        """List a DID's published versions, oldest first.
+
+        Args:
+            did: The DID to look up
+            since: Only list versions after this one
+
+        Returns:
+            The versions (without manifests); empty if the DID is unknown
+
+        Raises:
+            httpx.HTTPError: If the request fails (except 404)
+        """
+        response = await self._request(
+            "GET", f"{self.base_url}/manifests/{did}/versions", params={"since": since}
+        )
+        if response.status_code == 404:
+            return []
+        response.raise_for_status()
+        return [ManifestVersion(did=did, **entry) for entry in response.json()["versions"]]
+
+    async def resolve_version(self, did: str, version: int) -> AIManifest | None:
+        """Resolve one historical version of a DID's manifest.
+
+        Args:
+            did: The DID to resolve
+            version: The version number, as listed by :meth:`history`
+
+        Returns:
+            The AI manifest if that version exists, None otherwise
+
+        Raises:
+            httpx.HTTPError: If the request fails (except 404)
+        """
+        headers = {"Accept": BINARY_ACCEPT} if self.binary else {}
+        response = await self._request(
+            "GET", f"{self.base_url}/manifests/{did}/versions/{version}", headers=headers
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return self._parse(response.content, media_type(response.headers.get("Content-Type")))
+
+    async def resolve_history(
+        self, did: str, since: int = 0
+    ) -> AsyncIterator[tuple[ManifestVersion, AIManifest]]:
+        """Walk a DID's version chain, downloading each version as a patch.
+
+        The first version after ``since`` is fetched in full; each later one
+        as a JSON Patch from its predecessor, checked against the version's
+        content hash. A version whose patch fails to apply or to reproduce
+        that hash is fetched in full instead.
+
+        Args:
+            did: The DID to walk
+            since: Start after this version (0 for the whole history)
+
+        Yields:
+            (version, manifest) pairs, oldest first
+
+        Raises:
+            httpx.HTTPError: If a request fails
+        """
+        document: Any = None
+        previous: ManifestVersion | None = None
+        for entry in await self.history(did, since):
+            manifest = None
+            if previous is not None:
+                response = await self._request(
+                    "GET",
+                    f"{self.base_url}/manifests/{did}/versions/{entry.version}/patch",
+                    params={"from": previous.version},
+                )
+                response.raise_for_status()
+                try:
+                    document = apply_patch(document, response.json()["patch"])
+                    manifest = AIManifest.model_validate(document)
+                except ValueError:  # PatchError or ValidationError
+                    manifest = None
+                if manifest is not None and manifest.content_hash != entry.hash:
+                    manifest = None
+            if manifest is None:
+                response = await self._request(
+                    "GET",
+                    f"{self.base_url}/manifests/{did}/versions/{entry.version}",
+                    headers={"Accept": BINARY_ACCEPT} if self.binary else {},
+                )
+                response.raise_for_status()
+                document, manifest = self._parse_document(
+                    response.content, media_type(response.headers.get("Content-Type"))
+                )
+            previous = entry
+            yield entry, manifest
+
+    async def resolve_many(
+        self, dids: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[BatchResult]:
+        """Resolve many DIDs, yielding results as they complete.
+
+        At most ``concurrency`` resolves are in flight at once, and DIDs are
+        pulled from ``dids`` only as slots free up. Failures are reported per
+        DID rather than aborting the batch.
+
+        Args:
+            dids: The DIDs to resolve
+            concurrency: Maximum number of concurrent requests
+
+        Yields:
+            One BatchResult per DID, in completion order
+        """
+
+        async def resolve_one(did: str) -> BatchResult:
+            return BatchResult(did=did, manifest=await self.resolve(did))
+
+        async for result in _bounded(dids, resolve_one, concurrency):
+            yield result
+
+    async def publish_many(
+        self, manifests: Iterable[AIManifest], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[BatchResult]:
+        """Publish many manifests, yielding results as they complete.
+
+        Args:
+            manifests: The manifests to publish
+            concurrency: Maximum number of concurrent requests
+
+        Yields:
+            One BatchResult per manifest, in completion order
+        """
+
+        async def publish_one(manifest: AIManifest) -> BatchResult:
+            return BatchResult(did=await self.publish(manifest), manifest=manifest)
+
+        async for result in _bounded(manifests, publish_one, concurrency):
+            yield result
+
+    async def verify(self, did: str, public_key: bytes | None = None) -> bool:
         """Verify a manifest exists and has valid signature.
 
         Args:
             did: The DID to verify
+            public_key: Raw Ed25519 public key (defaults to the key registered for the DID)
 
         Returns:
-            True if manifest exists and is valid
+            True if manifest exists, is valid, and neither it nor its DID is revoked
         """
         manifest = await self.resolve(did)
-        if manifest is None:
+        if manifest is None or self._revoked(did, manifest):
+            return False
+        return manifest.verify(public_key)
+
+    def _revoked(self, did: str, held: AIManifest | CacheEntry) -> bool:
+        # An empty list cannot match, so don't make a lazily held entry hash itself.
+        if not self.revocations:
             return False
-        return manifest.verify()
+        return self.revocations.is_revoked(did, held.content_hash)
+
+    async def sync_revocations(self) -> int:
+        """Fetch revocations published since the local list's version.
+
+        Returns:
+            The number of entries added or removed
+
+        Raises:
+            ValueError: If the store has no revocation list configured
+            httpx.HTTPError: If the request fails
+        """
+        if self.revocations is None:
+            raise ValueError("No revocation list configured")
+        response = await self._request(
+            "GET", f"{self.base_url}/revocations", params={"since": self.revocations.version}
+        )
+        response.raise_for_status()
+        return self.revocations.apply(response.json())
+
+
+async def _bounded(
+    items: Iterable[T],
+    run: Callable[[T], Awaitable[BatchResult]],
+    concurrency: int,
+) -> AsyncIterator[BatchResult]:
+    """Run ``run`` over ``items`` with at most ``concurrency`` tasks in flight."""
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    async def guarded(item: T) -> BatchResult:
+        try:
+            return await run(item)
+        except Exception as exc:
+            did = item.did if isinstance(item, AIManifest) else str(item)
+            return BatchResult(did=did, error=exc)
+
+    iterator = iter(items)
+    pending: set[asyncio.Task[BatchResult]] = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.create_task(guarded(item)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
 
 
 class ManifestStoreConfig(BaseModel):
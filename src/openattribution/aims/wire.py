@@ -0,0 +1,383 @@
+"""Wire format - Compact binary encoding of manifests with content negotiation.
+
+Manifests travel as JSON by default. Stores and clients that both support
+it can instead exchange a CBOR (RFC 8949) encoding, negotiated with the
+``Accept`` and ``Content-Type`` headers:
+
+    Accept: application/vnd.aims.manifest+cbor, application/json;q=0.5
+
+A party that does not recognise the binary media type simply answers in
+JSON, so negotiation always falls back cleanly.
+
+The binary document is ``[table_version, value]``, where ``value`` is the
+manifest's JSON data model (``model_dump(mode="json")``) encoded as CBOR with
+one addition: strings listed in a versioned, append-only string table are
+interned. Interned map keys are written as the table index, and interned
+string values as the index under CBOR tag 6 (unassigned by IANA, reserved
+here for this purpose). Every field name and enum value of the manifest
+schema is in the table, so most keys cost a single byte.
+
+Decoding yields exactly the JSON data model that was encoded, so a manifest
+round-trips to the same canonical form, content hash and signature as over
+JSON. The codec is a dependency-free subset of CBOR: definite lengths only,
+integers up to 64 bits, and float64 for non-integral numbers.
+
+Example:
+    body = encode_manifest(manifest)
+    assert decode_manifest(body).content_hash == manifest.content_hash
+"""
+
+import struct
+from typing import Any
+
+from .manifest import AIManifest
+
+JSON_MEDIA_TYPE = "application/json"
+CBOR_MEDIA_TYPE = "application/vnd.aims.manifest+cbor"
+
+# Append-only: existing entries must never move, or older peers would decode
+# indexes to the wrong strings. Start a new table version to remove entries.
+STRING_TABLE_V1: tuple[str, ...] = (
+    # AIManifest
+    "did",
+    "version",
+    "foundation",
+    "deployment",
+    "content_access",
+    "created_at",
+    "updated_at",
+    "signature",
+    "model_card_url",
+    "dataset_card_url",
+    "a2a_card_url",
+    # FoundationLayer / DatasetReference
+    "training_datasets",
+    "dataset_details",
+    "rsl_compliance",
+    "licensing_summary",
+    "audit_contact",
+    "parent_model",
+    "derivation_type",
+    "identifier",
+    "license",
+    "rsl_compliant",
+    "merkle_root",
+    # DeploymentLayer / BrandAffiliation
+    "operator",
+    "brand_affiliations",
+    "domain_specialization",
+    "declared_biases",
+    "commercial_purpose",
+    "brand",
+    "relationship",
+    "influence_type",
+    # ContentAccessLayer / LicensedSource
+    "licensed_sources",
+    "source_details",
+    "redistribution_policy",
+    "rsl_licenses",
+    "content_partnerships",
+    "license_type",
+    "scope",
+    "expires_at",
+    # RedistributionPolicy
+    "none",
+    "summary_only",
+    "attributed",
+    "unrestricted",
+    # Values suggested by the schema's field descriptions
+    "1.0",
+    "first-party",
+    "granted",
+    "marketplace",
+    "full",
+    "partial",
+    "specific-content",
+    "owner",
+    "partner",
+    "sponsor",
+    "boost",
+    "exclusive",
+    "fine-tune",
+    "distillation",
+    # Common SPDX identifiers
+    "CC-BY-4.0",
+    "CC-BY-SA-4.0",
+    "CC-BY-NC-4.0",
+    "CC0-1.0",
+    "MIT",
+    "Apache-2.0",
+    "proprietary",
+)
+
+STRING_TABLES: dict[int, tuple[str, ...]] = {1: STRING_TABLE_V1}
+TABLE_VERSION = 1
+
+# Deepest array/map nesting a payload may use; manifests need a handful of
+# levels, and the decoder recurses once per level.
+MAX_NESTING = 64
+
+_INTERNED_TAG = 6
+_FLOAT64 = struct.Struct(">d")
+_INDEXES = {version: {s: i for i, s in enumerate(t)} for version, t in STRING_TABLES.items()}
+
+
+class WireFormatError(ValueError):
+    """A binary payload is malformed or uses an unknown string table."""
+
+
+def media_type(content_type: str | None) -> str:
+    """The bare media type of a ``Content-Type`` header (JSON if absent)."""
+    if not content_type:
+        return JSON_MEDIA_TYPE
+    return content_type.partition(";")[0].strip().lower()
+
+
+def negotiate(accept: str | None) -> str:
+    """Choose the response media type for an ``Accept`` header.
+
+    The binary format is only chosen when it is listed explicitly and
+    preferred at least as much as JSON; wildcards select JSON.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+    cbor_q = 0.0
+    json_q = 0.0
+    for part in accept.split(","):
+        name, *params = part.split(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name == CBOR_MEDIA_TYPE:
+            cbor_q = max(cbor_q, q)
+        elif name in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            json_q = max(json_q, q)
+    return CBOR_MEDIA_TYPE if cbor_q > 0 and cbor_q >= json_q else JSON_MEDIA_TYPE
+
+
+def _head(out: bytearray, major: int, n: int) -> None:
+    major <<= 5
+    if n < 24:
+        out.append(major | n)
+    elif n < 0x100:
+        out.append(major | 24)
+        out.append(n)
+    elif n < 0x10000:
+        out.append(major | 25)
+        out += n.to_bytes(2, "big")
+    elif n < 0x100000000:
+        out.append(major | 26)
+        out += n.to_bytes(4, "big")
+    elif n < 0x10000000000000000:
+        out.append(major | 27)
+        out += n.to_bytes(8, "big")
+    else:
+        raise ValueError(f"Integer too large for the wire format: {n}")
+
+
+def _text(out: bytearray, value: str) -> None:
+    raw = value.encode()
+    _head(out, 3, len(raw))
+    out += raw
+
+
+def _encode(out: bytearray, value: Any, index: dict[str, int]) -> None:
+    kind = type(value)
+    if kind is str:
+        interned = index.get(value)
+        if interned is None:
+            _text(out, value)
+        else:
+            _head(out, 6, _INTERNED_TAG)
+            _head(out, 0, interned)
+    elif kind is dict:
+        _head(out, 5, len(value))
+        for key, item in value.items():
+            interned = index.get(key)
+            if interned is None:
+                if not isinstance(key, str):
+                    raise TypeError("Map keys must be strings in the wire format")
+                _text(out, key)
+            else:
+                _head(out, 0, interned)
+            _encode(out, item, index)
+    elif kind is list or kind is tuple:
+        _head(out, 4, len(value))
+        for item in value:
+            _encode(out, item, index)
+    elif value is None:
+        out.append(0xF6)
+    elif value is True:
+        out.append(0xF5)
+    elif value is False:
+        out.append(0xF4)
+    elif kind is int:
+        if value >= 0:
+            _head(out, 0, value)
+        else:
+            _head(out, 1, -1 - value)
+    elif kind is float:
+        out.append(0xFB)
+        out += _FLOAT64.pack(value)
+    elif isinstance(value, str):
+        _encode(out, str(value), index)
+    else:
+        raise TypeError(f"Cannot encode {kind.__name__} in the wire format")
+
+
+def encode_value(value: Any, table_version: int = TABLE_VERSION) -> bytes:
+    """Encode a JSON-compatible value as a binary wire document.
+
+    Raises:
+        TypeError: If the value contains something JSON cannot represent
+        ValueError: If an integer does not fit in 64 bits
+    """
+    out = bytearray(b"\x82")
+    _head(out, 0, table_version)
+    _encode(out, value, _INDEXES[table_version])
+    return bytes(out)
+
+
+def _argument(data: bytes, pos: int, info: int) -> tuple[int, int]:
+    """Read the argument following an initial byte whose low bits are ``info``."""
+    if info < 24:
+        return info, pos
+    if info > 27:
+        raise WireFormatError("Indefinite lengths are not supported")
+    end = pos + (1 << (info - 24))
+    if end > len(data):
+        raise WireFormatError("Truncated payload")
+    return int.from_bytes(data[pos:end], "big"), end
+
+
+def _decode(data: bytes, pos: int, table: tuple[str, ...], depth: int) -> tuple[Any, int]:
+    # Hot path: short strings, small containers and interned values are read
+    # inline; _argument handles the longer encodings.
+    initial = data[pos]
+    pos += 1
+    major = initial >> 5
+    info = initial & 0x1F
+    if major == 3:
+        if info >= 24:
+            info, pos = _argument(data, pos, info)
+        end = pos + info
+        if end > len(data):
+            raise WireFormatError("Truncated payload")
+        return data[pos:end].decode(), end
+    if major == 5:
+        if info >= 24:
+            info, pos = _argument(data, pos, info)
+        if depth >= MAX_NESTING:
+            raise WireFormatError("Payload is nested too deeply")
+        result = {}
+        for _ in range(info):
+            initial = data[pos]
+            if initial < 24:
+                key = table[initial]
+                pos += 1
+            else:
+                key, pos = _key(data, pos, table)
+            result[key], pos = _decode(data, pos, table, depth + 1)
+        return result, pos
+    if major == 6:
+        if info != _INTERNED_TAG:
+            raise WireFormatError("Unsupported tag")
+        initial = data[pos]
+        if initial >> 5:
+            raise WireFormatError("Interned string must be an unsigned index")
+        index, pos = _argument(data, pos + 1, initial)
+        return table[index], pos
+    if major == 4:
+        if info >= 24:
+            info, pos = _argument(data, pos, info)
+        if depth >= MAX_NESTING:
+            raise WireFormatError("Payload is nested too deeply")
+        items = []
+        append = items.append
+        for _ in range(info):
+            item, pos = _decode(data, pos, table, depth + 1)
+            append(item)
+        return items, pos
+    if major == 7:
+        if info == 22:
+            return None, pos
+        if info == 21:
+            return True, pos
+        if info == 20:
+            return False, pos
+        if info == 27:
+            if pos + 8 > len(data):
+                raise WireFormatError("Truncated payload")
+            return _FLOAT64.unpack_from(data, pos)[0], pos + 8
+    elif major == 0:
+        return _argument(data, pos, info)
+    elif major == 1:
+        value, pos = _argument(data, pos, info)
+        return -1 - value, pos
+    raise WireFormatError(f"Unsupported initial byte 0x{initial:02x}")
+
+
+def _key(data: bytes, pos: int, table: tuple[str, ...]) -> tuple[str, int]:
+    initial = data[pos]
+    if initial >> 5 == 0:
+        index, pos = _argument(data, pos + 1, initial)
+        return table[index], pos
+    if initial >> 5 == 3:
+        return _decode(data, pos, table, 0)
+    raise WireFormatError("Map keys must be strings or string table indexes")
+
+
+def decode_value(data: bytes) -> Any:
+    """Decode a document written by :func:`encode_value`.
+
+    Raises:
+        WireFormatError: If the payload is malformed or its table version unknown
+    """
+    try:
+        if data[0] != 0x82:
+            raise WireFormatError("Not an AIMS binary document")
+        version, pos = _decode(data, 1, (), 0)
+        table = STRING_TABLES.get(version) if type(version) is int else None
+        if table is None:
+            raise WireFormatError(f"Unknown string table version {version!r}")
+        value, pos = _decode(data, pos, table, 0)
+    except IndexError:
+        raise WireFormatError("Truncated payload or unknown string table index") from None
+    except UnicodeDecodeError as exc:
+        raise WireFormatError("Invalid UTF-8 in text string") from exc
+    if pos != len(data):
+        raise WireFormatError("Trailing bytes after document")
+    return value
+
+
+def encode_manifest(manifest: AIManifest) -> bytes:
+    """Encode a manifest (including its signature) in the binary wire format."""
+    return encode_value(manifest.model_dump(mode="json"))
+
+
+def decode_manifest(data: bytes) -> AIManifest:
+    """Decode and validate a manifest from the binary wire format.
+
+    Raises:
+        WireFormatError: If the payload is malformed
+        pydantic.ValidationError: If the decoded document is not a valid manifest
+    """
+    return AIManifest.model_validate(decode_value(data))
+
+
+def parse_manifest(body: bytes, content_type: str | None = None) -> AIManifest:
+    """Parse a manifest body in whichever format its ``Content-Type`` names.
+
+    Raises:
+        WireFormatError: If a binary body is malformed
+        pydantic.ValidationError: If the body is not a valid manifest
+    """
+    if media_type(content_type) == CBOR_MEDIA_TYPE:
+        return decode_manifest(body)
+    return AIManifest.model_validate_json(body)
@@ -0,0 +1,212 @@
+"""Tests for attestation handshakes."""
+
+import httpx
+import pytest
+
+from openattribution.aims import AIManifest, ManifestStore
+from openattribution.aims.attestation import (
+    AttestationError,
+    AttestationVerifier,
+    ReplayCache,
+    ReplayCacheFullError,
+    create_attestation,
+    resolve_attested,
+)
+from openattribution.aims.canonical import canonical_json
+from openattribution.aims.crypto import PublicKeyCache, generate_keypair
+
+DID = "did:aims:web:example.com:agent"
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now: float = 1_700_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def signer():
+    """A manifest with its key pair."""
+    private_key, public_key = generate_keypair()
+    return AIManifest(did=DID), private_key, public_key
+
+
+class TestReplayCache:
+    """Tests for ReplayCache."""
+
+    def test_rejects_seen_nonce(self):
+        """A nonce is accepted once per DID within the window."""
+        cache = ReplayCache(window=60)
+
+        assert cache.add(DID, "n1", 1000, now=1000)
+        assert not cache.add(DID, "n1", 1000, now=1001)
+        assert cache.add("did:aims:web:other.com:agent", "n1", 1000, now=1001)
+
+    def test_buckets_expire(self):
+        """Nonces are forgotten a bucket at a time once outside the window."""
+        cache = ReplayCache(window=60, buckets=6)
+        for i in range(5):
+            cache.add(DID, f"n{i}", 1000, now=1000)
+        assert len(cache) == 5
+
+        cache.add(DID, "late", 1080, now=1080)
+
+        assert len(cache) == 1
+
+    def test_full_cache_fails_closed(self):
+        """A full cache rejects new nonces instead of evicting live ones."""
+        cache = ReplayCache(window=60, max_entries=2)
+        cache.add(DID, "n1", 1000, now=1000)
+        cache.add(DID, "n2", 1000, now=1000)
+
+        with pytest.raises(ReplayCacheFullError):
+            cache.add(DID, "n3", 1000, now=1000)
+        assert not cache.add(DID, "n1", 1000, now=1000)
+
+
+class TestAttestationVerifier:
+    """Tests for AttestationVerifier."""
+
+    def test_verify_establishes_session(self, signer):
+        """A valid attestation yields a session carrying the manifest hash."""
+        manifest, private_key, public_key = signer
+        clock = FakeClock()
+        verifier = AttestationVerifier(clock=clock)
+
+        attestation = create_attestation(manifest, private_key, timestamp=clock.now)
+        session = verifier.verify(attestation, public_key)
+
+        assert session.manifest_hash == manifest.content_hash
+        assert verifier.session(DID) == session
+        clock.now += 61
+        assert verifier.session(DID) is None
+
+    def test_replay_is_rejected(self, signer):
+        """Presenting the same attestation twice fails."""
+        manifest, private_key, public_key = signer
+        clock = FakeClock()
+        verifier = AttestationVerifier(clock=clock)
+        attestation = create_attestation(manifest, private_key, timestamp=clock.now)
+        verifier.verify(attestation, public_key)
+
+        with pytest.raises(AttestationError, match="already been used"):
+            verifier.verify(attestation, public_key)
+
+    def test_full_replay_cache_is_not_a_replay(self, signer):
+        """A fresh attestation refused by a full cache is reported as such."""
+        manifest, private_key, public_key = signer
+        clock = FakeClock()
+        verifier = AttestationVerifier(clock=clock, replays=ReplayCache(max_entries=1))
+        verifier.verify(create_attestation(manifest, private_key, timestamp=clock.now), public_key)
+
+        with pytest.raises(ReplayCacheFullError, match="full"):
+            verifier.verify(
+                create_attestation(manifest, private_key, timestamp=clock.now), public_key
+            )
+
+    def test_stale_future_and_forged(self, signer):
+        """Stale, future-dated and wrongly signed attestations fail."""
+        manifest, private_key, public_key = signer
+        _, other_key = generate_keypair()
+        clock = FakeClock()
+        verifier = AttestationVerifier(clock=clock, max_age=60, max_skew=5)
+
+        with pytest.raises(AttestationError, match="expired"):
+            verifier.verify(create_attestation(manifest, private_key, timestamp=clock.now - 61))
+        with pytest.raises(AttestationError, match="future"):
+            verifier.verify(create_attestation(manifest, private_key, timestamp=clock.now + 10))
+        with pytest.raises(AttestationError, match="signature"):
+            verifier.verify(
+                create_attestation(manifest, private_key, timestamp=clock.now), other_key
+            )
+        tampered = create_attestation(manifest, private_key, timestamp=clock.now).model_copy(
+            update={"manifest_hash": "sha256:" + "0" * 64}
+        )
+        with pytest.raises(AttestationError, match="signature"):
+            verifier.verify(tampered, public_key)
+
+    def test_registered_key_and_unknown_did(self, signer):
+        """Keys come from the key cache; unknown DIDs fail."""
+        manifest, private_key, public_key = signer
+        keys = PublicKeyCache()
+        clock = FakeClock()
+        verifier = AttestationVerifier(keys=keys, clock=clock)
+        attestation = create_attestation(manifest, private_key, timestamp=clock.now)
+
+        with pytest.raises(AttestationError, match="No public key"):
+            verifier.verify(attestation)
+        keys.register(DID, public_key)
+        assert verifier.verify(attestation).did == DID
+
+    async def test_authenticate_reuses_session(self, signer):
+        """A live session is reused without another handshake."""
+        manifest, private_key, public_key = signer
+        keys = PublicKeyCache()
+        keys.register(DID, public_key)
+        verifier = AttestationVerifier(keys=keys)
+        handshakes = []
+
+        async def handshake():
+            handshakes.append(1)
+            return create_attestation(manifest, private_key)
+
+        first = await verifier.authenticate(DID, handshake)
+        second = await verifier.authenticate(DID, handshake)
+
+        assert first is second
+        assert len(handshakes) == 1
+
+    def test_verify_batch(self, signer):
+        """Batches report a session or an error per attestation, in order."""
+        manifest, private_key, public_key = signer
+        clock = FakeClock()
+        verifier = AttestationVerifier(clock=clock, max_workers=2)
+        good = create_attestation(manifest, private_key, timestamp=clock.now)
+        items = [(good, public_key), (good, public_key)]
+        items += [(create_attestation(manifest, private_key, timestamp=clock.now), public_key)]
+
+        try:
+            results = verifier.verify_batch(items)
+        finally:
+            verifier.close()
+
+        assert sum(isinstance(r, AttestationError) for r in results) == 1
+        assert not isinstance(results[2], AttestationError)
+
+
+class TestResolveAttested:
+    """Tests for fetching the attested manifest."""
+
+    async def test_hash_must_match(self, signer):
+        """The fetched manifest must be the attested version."""
+        manifest, private_key, public_key = signer
+        verifier = AttestationVerifier()
+        session = verifier.verify(create_attestation(manifest, private_key), public_key)
+        served = {"manifest": manifest}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=served["manifest"].model_dump_json())
+
+        async with ManifestStore(
+            "https://store.test", transport=httpx.MockTransport(handler)
+        ) as store:
+            assert (await resolve_attested(store, session)).did == DID
+            served["manifest"] = AIManifest(did=DID, model_card_url="https://example.com/new")
+            with pytest.raises(AttestationError, match="does not match"):
+                await resolve_attested(store, session)
+
+
+class TestSigningPayload:
+    """Tests for the attestation signing payload."""
+
+    def test_payload_is_canonical(self, signer):
+        """The fast payload encoding matches the canonical encoding."""
+        manifest, private_key, _ = signer
+        attestation = create_attestation(manifest, private_key)
+        fields = attestation.model_dump(exclude={"signature"})
+
+        assert attestation.signing_payload() == canonical_json(fields)
@@ -0,0 +1,134 @@
+"""Tests for NDJSON bulk import and export."""
+
+import gzip
+import io
+
+import pytest
+from pydantic import ValidationError
+
+from openattribution.aims import AIManifest
+from openattribution.aims.bulk import (
+    BulkValidationError,
+    aread_manifests,
+    awrite_manifests,
+    describe,
+    iter_records,
+    read_manifests,
+    validate_file,
+    write_manifests,
+)
+
+
+def make_manifests(count: int) -> list[AIManifest]:
+    """Build distinct manifests."""
+    return [AIManifest(did=f"did:aims:web:example{i}.com:agent") for i in range(count)]
+
+
+class TestBulkRoundTrip:
+    """Tests for writing and reading NDJSON files."""
+
+    def test_plain_round_trip(self, tmp_path):
+        """Manifests read back equal to what was written, in order."""
+        manifests = make_manifests(5)
+        path = tmp_path / "registry.ndjson"
+
+        assert write_manifests(iter(manifests), path) == 5
+
+        assert list(read_manifests(path)) == manifests
+        assert path.read_bytes().count(b"\n") == 5
+
+    def test_gzip_is_detected(self, tmp_path):
+        """A .gz path is compressed on write and detected by magic bytes on read."""
+        manifests = make_manifests(3)
+        path = tmp_path / "registry.ndjson.gz"
+        write_manifests(manifests, path)
+        renamed = path.rename(tmp_path / "registry.bin")
+
+        assert gzip.decompress(renamed.read_bytes()).count(b"\n") == 3
+        assert list(read_manifests(renamed)) == manifests
+
+    def test_file_objects(self):
+        """Binary file objects work as sources and destinations."""
+        manifests = make_manifests(3)
+        buffer = io.BytesIO()
+        write_manifests(manifests, buffer, compress=True)
+
+        assert list(read_manifests(io.BytesIO(buffer.getvalue()))) == manifests
+
+    def test_small_chunks(self, tmp_path):
+        """Records spanning many chunks come back in file order."""
+        manifests = make_manifests(25)
+        path = tmp_path / "registry.ndjson"
+        write_manifests(manifests, path)
+
+        assert list(read_manifests(path, chunk_lines=4)) == manifests
+
+
+class TestBulkErrors:
+    """Tests for invalid record reporting."""
+
+    @pytest.fixture
+    def mixed(self, tmp_path):
+        """A file with a blank line, a malformed line and a schema violation."""
+        good = AIManifest(did="did:aims:web:example.com:agent").model_dump_json().encode()
+        lines = [good, b"", b"{not json", good, b'{"version": "1.0"}', good]
+        path = tmp_path / "mixed.ndjson"
+        path.write_bytes(b"\n".join(lines) + b"\n")
+        return path, lines
+
+    def test_errors_carry_line_and_offset(self, mixed):
+        """Invalid lines are reported with their 1-based line and byte offset."""
+        path, lines = mixed
+        records = list(iter_records(path))
+
+        assert [r.line for r in records] == [1, 3, 4, 5, 6]
+        assert [r.ok for r in records] == [True, False, True, False, True]
+        bad = records[1]
+        assert bad.offset == len(lines[0]) + 2
+        assert path.read_bytes()[bad.offset :].startswith(b"{not json")
+        assert "did" in records[3].error
+
+    def test_describe_matches_record_error(self, mixed):
+        """describe renders a ValidationError the way bulk records report it."""
+        path, lines = mixed
+        with pytest.raises(ValidationError) as excinfo:
+            AIManifest.model_validate_json(lines[4])
+
+        assert describe(excinfo.value) == list(iter_records(path))[3].error
+        assert describe(excinfo.value).startswith("did: ")
+
+    def test_read_manifests_raises(self, mixed):
+        """read_manifests stops at the first invalid record."""
+        path, _ = mixed
+
+        with pytest.raises(BulkValidationError) as excinfo:
+            list(read_manifests(path))
+
+        assert excinfo.value.line == 3
+
+    def test_validate_file_with_process_pool(self, mixed):
+        """Validation across worker processes reports the same errors."""
+        path, _ = mixed
+
+        report = validate_file(path, workers=2, chunk_lines=2)
+
+        assert report.valid == 3
+        assert [error.line for error in report.errors] == [3, 5]
+        assert not report.ok
+
+
+class TestAsyncBulk:
+    """Tests for the async iterators."""
+
+    async def test_async_round_trip(self, tmp_path):
+        """Async iterables are written and read back in order."""
+        manifests = make_manifests(7)
+        path = tmp_path / "registry.ndjson.gz"
+
+        async def produce():
+            for manifest in manifests:
+                yield manifest
+
+        assert await awrite_manifests(produce(), path, batch_size=3) == 7
+
+        assert [m async for m in aread_manifests(path, chunk_lines=2)] == manifests
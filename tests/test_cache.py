@@ -0,0 +1,158 @@
+"""Tests for the manifest cache."""
+
+import httpx
+
+from openattribution.aims import AIManifest, ManifestCache, ManifestStore
+
+DID = "did:aims:web:example.com:agent"
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def entry_body(did: str = DID) -> bytes:
+    return AIManifest(did=did).model_dump_json().encode()
+
+
+class TestManifestCache:
+    """Tests for ManifestCache class."""
+
+    def test_put_and_get(self):
+        """Stored entries are returned with their content hash."""
+        cache = ManifestCache()
+        body = entry_body()
+        cache.put(DID, AIManifest.model_validate_json(body), body, etag='"v1"')
+
+        entry = cache.get(DID)
+        assert entry is not None
+        assert entry.content_hash == AIManifest.model_validate_json(body).content_hash
+        assert entry.validator == '"v1"'
+        assert cache.size == len(body)
+
+    def test_entries_expire_but_stay_available(self):
+        """Expired entries are stale, not dropped."""
+        clock = FakeClock()
+        cache = ManifestCache(ttl=10, clock=clock)
+        body = entry_body()
+        cache.put(DID, AIManifest.model_validate_json(body), body)
+
+        clock.now += 11
+        entry = cache.get(DID)
+        assert entry is not None
+        assert not entry.is_fresh(clock())
+
+        cache.refresh(DID)
+        assert entry.is_fresh(clock())
+
+    def test_lru_eviction_by_count(self):
+        """The least recently used entry is evicted first."""
+        cache = ManifestCache(max_entries=2)
+        for name in ("a", "b"):
+            did = f"did:aims:web:example.com:{name}"
+            cache.put(did, AIManifest(did=did), entry_body(did))
+        cache.get("did:aims:web:example.com:a")
+        cache.put("did:aims:web:example.com:c", AIManifest(did=DID), entry_body())
+
+        assert "did:aims:web:example.com:a" in cache
+        assert "did:aims:web:example.com:b" not in cache
+        assert len(cache) == 2
+
+    def test_eviction_by_size(self):
+        """Entries are evicted to stay under the byte budget."""
+        body = entry_body()
+        cache = ManifestCache(max_bytes=len(body) * 2)
+        for name in ("a", "b", "c"):
+            cache.put(f"did:aims:web:example.com:{name}", AIManifest(did=DID), body)
+
+        assert len(cache) == 2
+        assert cache.size <= cache.max_bytes
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new cache over the same directory starts warm."""
+        body = entry_body()
+        ManifestCache(disk_path=tmp_path).put(DID, AIManifest(did=DID), body, etag='"v1"')
+
+        restarted = ManifestCache(disk_path=tmp_path)
+        entry = restarted.get(DID)
+        assert entry is not None
+        assert entry.manifest.did == DID
+        assert entry.etag == '"v1"'
+
+        restarted.invalidate(DID)
+        assert ManifestCache(disk_path=tmp_path).get(DID) is None
+
+
+class TestCachedResolve:
+    """Tests for ManifestStore.resolve with a cache."""
+
+    def make_store(self, clock: FakeClock, requests: list[httpx.Request]) -> ManifestStore:
+        body = self.body = entry_body()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=body, headers={"ETag": '"v1"'})
+
+        return ManifestStore(
+            "https://store.test",
+            transport=httpx.MockTransport(handler),
+            cache=ManifestCache(ttl=60, clock=clock),
+        )
+
+    async def test_fresh_entry_skips_network(self):
+        """Fresh entries are served without a request."""
+        requests: list[httpx.Request] = []
+        store = self.make_store(FakeClock(), requests)
+
+        first = await store.resolve(DID)
+        second = await store.resolve(DID)
+
+        assert first is second
+        assert len(requests) == 1
+
+    async def test_stale_entry_is_revalidated(self):
+        """Stale entries are revalidated with If-None-Match and reused on 304."""
+        clock = FakeClock()
+        requests: list[httpx.Request] = []
+        store = self.make_store(clock, requests)
+
+        first = await store.resolve(DID)
+        clock.now += 61
+        second = await store.resolve(DID)
+
+        assert second is first
+        assert requests[-1].headers["If-None-Match"] == '"v1"'
+        assert store.cache.get(DID).is_fresh(clock())
+
+    async def test_matching_attested_hash_uses_stale_copy(self):
+        """A cached copy matching the attested hash is used even when stale."""
+        clock = FakeClock()
+        requests: list[httpx.Request] = []
+        store = self.make_store(clock, requests)
+
+        await store.resolve(DID)
+        clock.now += 3600
+        await store.resolve(
+            DID, expected_hash=AIManifest.model_validate_json(self.body).content_hash
+        )
+
+        assert len(requests) == 1
+
+    async def test_mismatched_attested_hash_refetches(self):
+        """A different attested hash forces an unconditional fetch."""
+        requests: list[httpx.Request] = []
+        store = self.make_store(FakeClock(), requests)
+
+        await store.resolve(DID)
+        await store.resolve(DID, expected_hash="sha256:other")
+
+        assert len(requests) == 2
+        assert "If-None-Match" not in requests[-1].headers
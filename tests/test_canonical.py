@@ -0,0 +1,124 @@
+"""Tests for canonical encoding and content hashing."""
+
+import json
+
+import pytest
+
+from openattribution.aims import AIManifest
+from openattribution.aims.canonical import canonical_json, canonical_model_json, content_hash
+from openattribution.aims.layers import ContentAccessLayer, DeploymentLayer, FoundationLayer
+from openattribution.aims.layers.content_access import LicensedSource
+from openattribution.aims.layers.deployment import BrandAffiliation
+from openattribution.aims.layers.foundation import DatasetReference
+
+DID = "did:aims:web:example.com:agent"
+
+
+def full_manifest() -> AIManifest:
+    return AIManifest(
+        did=DID,
+        foundation=FoundationLayer(
+            training_datasets=["dataset:a"],
+            dataset_details=[DatasetReference(identifier="dataset:a", license="MIT")],
+        ),
+        deployment=DeploymentLayer(
+            operator="Exämple   Inc.",
+            brand_affiliations=[BrandAffiliation(brand="Acme", relationship="owner")],
+        ),
+        content_access=ContentAccessLayer(
+            source_details=[LicensedSource(identifier="source:x", license_type="granted")],
+        ),
+    )
+
+
+class TestCanonicalJson:
+    """Tests for canonical_json."""
+
+    def test_sorted_compact_output(self):
+        """Keys are sorted recursively and whitespace is dropped."""
+        assert canonical_json({"b": [{"d": 1, "c": None}], "a": True}) == (
+            b'{"a":true,"b":[{"c":null,"d":1}]}'
+        )
+
+    def test_key_order_independent(self):
+        """Input key order does not affect the output."""
+        assert canonical_json({"x": 1, "y": 2}) == canonical_json({"y": 2, "x": 1})
+
+    def test_string_escaping(self):
+        """Only mandatory escapes are applied; other characters stay raw UTF-8."""
+        encoded = canonical_json({"s": 'q"\\\n\x01é/'})
+
+        assert encoded == '{"s":"q\\"\\\\\\n\\u0001é/"}'.encode()
+
+    def test_utf16_key_order(self):
+        """Keys sort by UTF-16 code units, as JCS requires."""
+        encoded = canonical_json({"\U0001f600": 1, "ﬁ": 2})
+
+        assert list(json.loads(encoded)) == ["\U0001f600", "ﬁ"]
+
+    def test_integral_floats_become_integers(self):
+        """Integral floats are encoded as integers; others are rejected."""
+        assert canonical_json([1.0, 2]) == b"[1,2]"
+        with pytest.raises(ValueError, match="Non-integral"):
+            canonical_json([1.5])
+
+
+class TestManifestCanonicalForm:
+    """Tests for AIManifest canonical encoding and content hash."""
+
+    def test_model_fast_path_matches_generic_encoder(self):
+        """The precompiled model encoder agrees with the generic one."""
+        manifest = full_manifest()
+        expected = canonical_json(manifest.model_dump(mode="json", exclude={"signature"}))
+
+        assert canonical_model_json(manifest, exclude={"signature"}) == expected
+        assert manifest.canonical_json() == expected
+
+    def test_hash_survives_round_trip(self):
+        """Serialization round trips preserve the content hash."""
+        manifest = full_manifest()
+        restored = AIManifest.model_validate_json(manifest.model_dump_json())
+
+        assert restored.content_hash == manifest.content_hash
+        assert manifest.content_hash == content_hash(manifest.canonical_json())
+        assert manifest.content_hash.startswith("sha256:")
+
+    def test_signature_not_part_of_hash(self):
+        """Signing metadata does not change the content identity."""
+        manifest = full_manifest()
+        copy = manifest.model_copy(update={"signature": "ed25519:abc"})
+
+        assert copy.content_hash == manifest.content_hash
+
+    def test_hash_is_memoized(self, monkeypatch):
+        """The hash is computed once until the manifest changes."""
+        manifest = full_manifest()
+        first = manifest.content_hash
+        monkeypatch.setattr(AIManifest, "canonical_json", lambda self: pytest.fail("recomputed"))
+
+        assert manifest.content_hash == first
+
+    def test_assignment_invalidates_hash(self):
+        """Assigning a field invalidates the memoized hash."""
+        manifest = full_manifest()
+        before = manifest.content_hash
+        manifest.model_card_url = "https://example.com/card"
+
+        assert manifest.content_hash != before
+
+    def test_model_copy_update_invalidates_hash(self):
+        """Copies with updated fields get their own hash."""
+        manifest = full_manifest()
+        before = manifest.content_hash
+        copy = manifest.model_copy(update={"version": "2.0"})
+
+        assert copy.content_hash != before
+
+    def test_in_place_change_needs_explicit_invalidation(self):
+        """Nested in-place edits are picked up after invalidate_content_hash."""
+        manifest = full_manifest()
+        before = manifest.content_hash
+        manifest.content_access.licensed_sources.append("source:new")
+        manifest.invalidate_content_hash()
+
+        assert manifest.content_hash != before
@@ -0,0 +1,121 @@
+"""Tests for the aims command line interface."""
+
+import base64
+import json
+
+import pytest
+
+from openattribution.aims import AIManifest
+from openattribution.aims.canonical import canonical_model_json
+from openattribution.aims.cli import EXIT_FAILED, EXIT_OK, EXIT_USAGE, load_key, main
+from openattribution.aims.crypto import generate_keypair
+from openattribution.aims.resolution import encode_ed25519_multikey
+
+PRIVATE_KEY, PUBLIC_KEY = generate_keypair()
+
+
+def write_manifests(directory, count: int = 3) -> list:
+    """Write ``count`` valid manifests under ``directory`` and return their paths."""
+    paths = []
+    for i in range(count):
+        path = directory / f"sub{i % 2}" / f"m{i}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(AIManifest(did=f"did:aims:web:example{i}.com:agent").model_dump_json())
+        paths.append(path)
+    return paths
+
+
+def records(capsys) -> list[dict]:
+    """Parse the NDJSON written to stdout."""
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+class TestCli:
+    """Tests for the aims subcommands."""
+
+    def test_validate_reports_each_file(self, tmp_path, capsys):
+        """Valid files pass, invalid ones fail with a reason and exit code 1."""
+        write_manifests(tmp_path)
+        (tmp_path / "bad.json").write_text('{"model_card_url": "x"}')
+
+        assert main(["validate", str(tmp_path), "-j", "1"]) == EXIT_FAILED
+        output = records(capsys)
+        assert [record["ok"] for record in output] == [False, True, True, True]
+        assert "did: Field required" in output[0]["error"]
+
+    def test_hash_matches_library(self, tmp_path, capsys):
+        """Hashes are the manifests' content hashes."""
+        (path,) = write_manifests(tmp_path, 1)
+
+        assert main(["hash", str(path)]) == EXIT_OK
+        (record,) = records(capsys)
+        assert record["hash"] == AIManifest.model_validate_json(path.read_bytes()).content_hash
+
+    def test_sign_then_verify(self, tmp_path, capsys):
+        """Signed output verifies against the public key and fails against another."""
+        write_manifests(tmp_path / "in")
+        key_file = tmp_path / "signing.key"
+        key_file.write_bytes(PRIVATE_KEY)
+        out = tmp_path / "out"
+
+        assert main(["sign", str(tmp_path / "in"), "--key", str(key_file), "-o", str(out)]) == 0
+        assert all(record["written"].startswith(str(out)) for record in records(capsys))
+
+        assert main(["verify", str(out), "--public-key", PUBLIC_KEY.hex()]) == EXIT_OK
+        assert all(record["signed"] for record in records(capsys))
+        other = generate_keypair()[1].hex()
+        assert main(["verify", str(out), "--public-key", other]) == EXIT_FAILED
+        assert all(record["error"] == "Invalid signature" for record in records(capsys))
+
+    def test_verify_unsigned(self, tmp_path, capsys):
+        """Unsigned manifests fail unless explicitly allowed."""
+        write_manifests(tmp_path, 1)
+        key = PUBLIC_KEY.hex()
+
+        assert main(["verify", str(tmp_path), "--public-key", key]) == EXIT_FAILED
+        assert main(["verify", str(tmp_path), "--public-key", key, "--allow-unsigned"]) == 0
+
+    def test_canonicalize_in_place(self, tmp_path, capsys):
+        """Files are rewritten in canonical form, signature field included."""
+        (path,) = write_manifests(tmp_path, 1)
+        manifest = AIManifest.model_validate_json(path.read_bytes())
+
+        assert main(["canonicalize", str(path), "--in-place"]) == EXIT_OK
+        assert path.read_bytes() == canonical_model_json(manifest)
+
+    def test_process_pool_keeps_order(self, tmp_path, capsys):
+        """Chunks processed by worker processes are reported in input order."""
+        paths = write_manifests(tmp_path, 7)
+
+        assert main(["hash", str(tmp_path), "-j", "2", "--chunk-size", "2", "--progress"]) == 0
+        captured = capsys.readouterr()
+        output = [json.loads(line) for line in captured.out.splitlines()]
+        assert [record["path"] for record in output] == sorted(str(path) for path in paths)
+        assert "7/7 files, 0 failed" in captured.err
+
+    def test_usage_errors(self, tmp_path, capsys):
+        """Missing inputs and bad keys exit with code 2."""
+        assert main(["validate", str(tmp_path / "missing")]) == EXIT_USAGE
+        assert main(["validate", str(tmp_path)]) == EXIT_USAGE
+        write_manifests(tmp_path, 1)
+        assert main(["sign", str(tmp_path), "--key", "not-a-key"]) == EXIT_USAGE
+        with pytest.raises(SystemExit) as exc:
+            main(["frobnicate"])
+        assert exc.value.code == EXIT_USAGE
+
+    def test_load_key_encodings(self, tmp_path):
+        """Raw, hex, base64url and multikey encodings decode to the same key."""
+        raw = tmp_path / "raw.key"
+        raw.write_bytes(PUBLIC_KEY)
+        encoded = tmp_path / "b64.key"
+        encoded.write_text(base64url(PUBLIC_KEY) + "\n")
+
+        assert load_key(str(raw)) == PUBLIC_KEY
+        assert load_key(str(encoded)) == PUBLIC_KEY
+        assert load_key(PUBLIC_KEY.hex()) == PUBLIC_KEY
+        assert load_key(encode_ed25519_multikey(PUBLIC_KEY)) == PUBLIC_KEY
+
+
+def base64url(data: bytes) -> str:
+    """Unpadded base64url text."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
@@ -0,0 +1,134 @@
+"""Tests for AIMS signing and verification."""
+
+from openattribution.aims import AIManifest
+from openattribution.aims.crypto import (
+    ManifestVerifier,
+    default_verifier,
+    generate_keypair,
+    sign_bytes,
+    verify_bytes,
+)
+
+DID = "did:aims:web:example.com:agent"
+
+
+class TestEd25519:
+    """Tests for the low-level Ed25519 helpers."""
+
+    def test_sign_and_verify_bytes(self):
+        """A signature verifies against the signing key only."""
+        private_key, public_key = generate_keypair()
+        _, other_key = generate_keypair()
+        signature = sign_bytes(b"payload", private_key)
+
+        assert signature.startswith("ed25519:")
+        assert verify_bytes(b"payload", signature, public_key)
+        assert not verify_bytes(b"tampered", signature, public_key)
+        assert not verify_bytes(b"payload", signature, other_key)
+
+    def test_malformed_signature_is_invalid(self):
+        """Garbage and foreign schemes fail verification instead of raising."""
+        _, public_key = generate_keypair()
+
+        assert not verify_bytes(b"payload", "ed25519:not-base64!", public_key)
+        assert not verify_bytes(b"payload", "rsa:abcd", public_key)
+
+
+class TestManifestSigning:
+    """Tests for AIManifest.sign and AIManifest.verify."""
+
+    def test_sign_and_verify(self):
+        """A signed manifest verifies with the matching public key."""
+        private_key, public_key = generate_keypair()
+        manifest = AIManifest(did=DID)
+        manifest.sign(private_key)
+
+        assert manifest.signature.startswith("ed25519:")
+        assert manifest.verify(public_key) is True
+
+    def test_tampered_manifest_fails(self):
+        """Changing signed content invalidates the signature."""
+        private_key, public_key = generate_keypair()
+        manifest = AIManifest(did=DID)
+        manifest.sign(private_key)
+        manifest.content_access.licensed_sources.append("source:injected")
+
+        assert manifest.verify(public_key) is False
+
+    def test_signed_manifest_without_key_fails(self):
+        """A signature can't be trusted without a key to check it."""
+        private_key, _ = generate_keypair()
+        manifest = AIManifest(did="did:aims:web:example.com:unregistered")
+        manifest.sign(private_key)
+
+        assert manifest.verify() is False
+
+    def test_registered_key_is_used(self):
+        """Keys registered for a DID are used by default."""
+        private_key, public_key = generate_keypair()
+        did = "did:aims:web:example.com:registered"
+        default_verifier.keys.register(did, public_key)
+        try:
+            manifest = AIManifest(did=did)
+            manifest.sign(private_key)
+            assert manifest.verify() is True
+        finally:
+            default_verifier.keys.remove(did)
+
+    def test_signature_survives_serialization(self):
+        """A manifest still verifies after a JSON round trip."""
+        private_key, public_key = generate_keypair()
+        manifest = AIManifest(did=DID)
+        manifest.sign(private_key)
+
+        restored = AIManifest.model_validate_json(manifest.model_dump_json())
+
+        assert restored.verify(public_key) is True
+
+
+class TestManifestVerifier:
+    """Tests for ManifestVerifier caching and batching."""
+
+    def test_verified_digests_are_cached(self, monkeypatch):
+        """A manifest verified once is not checked cryptographically again."""
+        from openattribution.aims.crypto import ed25519
+
+        private_key, public_key = generate_keypair()
+        manifest = AIManifest(did=DID)
+        manifest.sign(private_key)
+        verifier = ManifestVerifier()
+        calls = []
+        real = ed25519.verify_bytes
+        monkeypatch.setattr(ed25519, "verify_bytes", lambda *a: calls.append(a) or real(*a))
+
+        assert verifier.verify(manifest, public_key)
+        assert verifier.verify(manifest, public_key)
+        assert len(calls) == 1
+        assert len(verifier.verified) == 1
+
+    def test_failed_verification_is_not_cached(self):
+        """Invalid signatures are never remembered as verified."""
+        private_key, _ = generate_keypair()
+        _, wrong_key = generate_keypair()
+        manifest = AIManifest(did=DID)
+        manifest.sign(private_key)
+        verifier = ManifestVerifier()
+
+        assert not verifier.verify(manifest, wrong_key)
+        assert len(verifier.verified) == 0
+
+    def test_verify_batch(self):
+        """Batch results line up with their inputs."""
+        private_key, public_key = generate_keypair()
+        _, wrong_key = generate_keypair()
+        manifests = [AIManifest(did=f"did:aims:web:example.com:agent-{i}") for i in range(8)]
+        for manifest in manifests:
+            manifest.sign(private_key)
+        verifier = ManifestVerifier(max_workers=4)
+        try:
+            keys = [public_key if i % 2 == 0 else wrong_key for i in range(8)]
+            results = verifier.verify_batch(zip(manifests, keys, strict=True))
+        finally:
+            verifier.close()
+
+        assert results == [i % 2 == 0 for i in range(8)]
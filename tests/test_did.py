@@ -73,3 +73,9 @@ class TestAIMSDID:
 
         with pytest.raises(AttributeError):
             did.method = "key"  # type: ignore
+
+    def test_parse_is_memoized(self):
+        """Parsing the same DID twice returns the same instance."""
+        did_string = "did:aims:web:example.com:memo-agent"
+
+        assert AIMSDID.parse(did_string) is AIMSDID.parse(did_string)
@@ -0,0 +1,112 @@
+"""Tests for federated multi-store resolution."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from openattribution.aims import AIManifest, FederatedResolver, ManifestStore, ManifestStoreConfig
+
+DID = "did:aims:web:example.com:agent"
+
+
+def store_backend(delay: float = 0.0, status: int = 200, did: str = DID) -> httpx.MockTransport:
+    """A stand-in store answering every resolve after ``delay`` seconds."""
+    body = AIManifest(did=did).model_dump_json()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        handler.calls += 1
+        await asyncio.sleep(delay)
+        return httpx.Response(status, content=body if status == 200 else b"")
+
+    handler.calls = 0
+    transport = httpx.MockTransport(handler)
+    transport.handler = handler
+    return transport
+
+
+def make_resolver(backends: dict[str, httpx.MockTransport], **options) -> FederatedResolver:
+    priorities = {name: len(backends) - i for i, name in enumerate(backends)}
+    configs = [
+        ManifestStoreConfig(url=f"https://{name}.test", name=name, priority=priorities[name])
+        for name in backends
+    ]
+    return FederatedResolver(
+        configs,
+        store_factory=lambda config: ManifestStore(config.url, transport=backends[config.name]),
+        **options,
+    )
+
+
+class TestFederatedResolver:
+    """Tests for FederatedResolver class."""
+
+    def test_requires_a_store(self):
+        """An empty federation is rejected."""
+        with pytest.raises(ValueError):
+            FederatedResolver([])
+
+    async def test_prefers_highest_priority(self):
+        """The highest-priority store answers when it is fast."""
+        primary, secondary = store_backend(), store_backend()
+        async with make_resolver({"primary": primary, "secondary": secondary}) as resolver:
+            manifest = await resolver.resolve(DID)
+
+        assert manifest.did == DID
+        assert primary.handler.calls == 1
+        assert secondary.handler.calls == 0
+
+    async def test_hedges_to_next_store_when_slow(self):
+        """A slow primary triggers a hedged request whose answer wins."""
+        primary, secondary = store_backend(delay=1.0), store_backend()
+        resolver = make_resolver({"primary": primary, "secondary": secondary}, hedge_delay=0.01)
+
+        async with resolver:
+            manifest = await asyncio.wait_for(resolver.resolve(DID), timeout=0.5)
+
+        assert manifest.did == DID
+        assert secondary.handler.calls == 1
+
+    async def test_not_found_falls_through(self):
+        """A 404 from one store moves on to the next immediately."""
+        backends = {"primary": store_backend(status=404), "secondary": store_backend()}
+        async with make_resolver(backends, hedge_delay=10) as resolver:
+            manifest = await asyncio.wait_for(resolver.resolve(DID), timeout=1)
+
+        assert manifest.did == DID
+
+    async def test_not_found_everywhere_returns_none(self):
+        """None is returned when every store reports not-found."""
+        backends = {"a": store_backend(status=404), "b": store_backend(status=404)}
+        async with make_resolver(backends) as resolver:
+            assert await resolver.resolve(DID) is None
+
+    async def test_all_failures_raise(self):
+        """The last error propagates when no store answers."""
+        backends = {"a": store_backend(status=500), "b": store_backend(status=503)}
+        async with make_resolver(backends) as resolver:
+            with pytest.raises(httpx.HTTPStatusError):
+                await resolver.resolve(DID)
+
+    async def test_mismatched_did_is_rejected(self):
+        """An answer for the wrong DID is not accepted."""
+        backends = {
+            "liar": store_backend(did="did:aims:web:evil.com:agent"),
+            "honest": store_backend(),
+        }
+        async with make_resolver(backends) as resolver:
+            manifest = await resolver.resolve(DID)
+
+        assert manifest.did == DID
+
+    async def test_failing_store_is_demoted(self):
+        """Consecutive failures push a store behind healthy ones."""
+        backends = {"flaky": store_backend(status=500), "steady": store_backend()}
+        async with make_resolver(backends, failure_threshold=2) as resolver:
+            for _ in range(2):
+                await resolver.resolve(DID)
+            assert [s.config.name for s in resolver.ranked()] == ["steady", "flaky"]
+
+            await resolver.resolve(DID)
+
+        assert backends["flaky"].handler.calls == 2
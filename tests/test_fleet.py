@@ -0,0 +1,265 @@
+"""Tests for columnar fleet snapshots."""
+
+import json
+import struct
+import sys
+from array import array
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from openattribution.aims import AIManifest
+from openattribution.aims.fleet import SCHEMA, FleetSnapshot
+from openattribution.aims.layers import ContentAccessLayer, DeploymentLayer, FoundationLayer
+from openattribution.aims.layers.content_access import LicensedSource, RedistributionPolicy
+from openattribution.aims.layers.deployment import BrandAffiliation
+from openattribution.aims.layers.foundation import DatasetReference
+
+NOW = datetime(2030, 1, 1, tzinfo=UTC)
+
+
+def make_manifest(
+    index: int,
+    *,
+    rsl: bool = True,
+    policy: RedistributionPolicy = RedistributionPolicy.ATTRIBUTED,
+    expires: str | None = "2031-01-01T00:00:00Z",
+    operator: str = "Acme",
+) -> AIManifest:
+    """A manifest with one detailed source, one bare source, datasets and a brand."""
+    return AIManifest(
+        did=f"did:aims:web:example{index}.com:agent",
+        foundation=FoundationLayer(
+            training_datasets=["dataset:web", "dataset:books"],
+            dataset_details=[DatasetReference(identifier="dataset:web", rsl_compliant=rsl)],
+            rsl_compliance=rsl,
+        ),
+        deployment=DeploymentLayer(
+            operator=operator,
+            brand_affiliations=[
+                BrandAffiliation(brand="Shop", relationship="owner", influence_type="exclusive")
+            ],
+        ),
+        content_access=ContentAccessLayer(
+            licensed_sources=["source:wire", "source:archive"],
+            source_details=[
+                LicensedSource(identifier="source:wire", license_type="granted", expires_at=expires)
+            ],
+            redistribution_policy=policy,
+        ),
+    )
+
+
+def make_fleet() -> list[AIManifest]:
+    """Five systems, one risky and two with licenses near expiry."""
+    return [
+        make_manifest(0),
+        make_manifest(1, rsl=False, policy=RedistributionPolicy.UNRESTRICTED, operator="Beta"),
+        make_manifest(2, rsl=False, policy=RedistributionPolicy.NONE),
+        make_manifest(3, expires="2030-01-15"),
+        make_manifest(4, expires="2030-01-20T12:00:00+00:00", operator="Beta"),
+    ]
+
+
+def did(index: int) -> str:
+    return f"did:aims:web:example{index}.com:agent"
+
+
+def swap_byte_order(path) -> None:
+    """Rewrite a snapshot as a machine of the other byte order would have saved it."""
+    data = bytearray(path.read_bytes())
+    header = struct.Struct(">8sQ")
+    _, meta_size = header.unpack_from(data)
+    layout = json.loads(data[header.size : header.size + meta_size])
+    base = -(-(header.size + meta_size) // 8) * 8
+
+    def swap(offset: int, typecode: str, count: int) -> None:
+        column = array(typecode)
+        start = base + offset
+        column.frombytes(data[start : start + count * column.itemsize])
+        column.byteswap()
+        data[start : start + len(column) * column.itemsize] = column.tobytes()
+
+    swap(layout["strings"]["offsets"], "Q", layout["strings"]["count"] + 1)
+    for table, kinds in SCHEMA.items():
+        placed = layout["tables"][table]
+        for name, kind in kinds.items():
+            typecode = {"time": "d", "enum": "B", "bool": "B"}.get(kind, "I")
+            swap(placed["columns"][name], typecode, placed["rows"])
+        for offset in placed["orders"].values():
+            swap(offset, "I", placed["rows"])
+    layout["byteorder"] = "big" if sys.byteorder == "little" else "little"
+    meta = json.dumps(layout).encode()
+    padding = -(header.size + len(meta)) % 8
+    path.write_bytes(header.pack(b"AIMSFLT1", len(meta)) + meta + b"\0" * padding + data[base:])
+
+
+def compliance_report(snapshot: FleetSnapshot) -> dict:
+    """The queries a compliance run asks, as plain values."""
+    systems, sources = snapshot.systems, snapshot.sources
+    risky = systems.eq("rsl_compliance", False) & systems.eq(
+        "redistribution_policy", "unrestricted"
+    )
+    expiring = sources.between("expires_at", NOW, NOW + timedelta(days=30))
+    return {
+        "risky": systems.values("did", risky),
+        "expiring": sources.values("system", expiring),
+        "operators": systems.count_by("operator"),
+        "sources": sources.count(),
+    }
+
+
+class TestQueries:
+    """Tests for filters, aggregates and joins."""
+
+    def test_compliance_queries(self):
+        """The §11.3-style questions come back from column filters."""
+        snapshot = FleetSnapshot.from_manifests(make_fleet())
+
+        assert compliance_report(snapshot) == {
+            "risky": [did(1)],
+            "expiring": [did(3), did(4)],
+            "operators": {"Acme": 3, "Beta": 2},
+            "sources": 10,
+        }
+
+    def test_masks_combine(self):
+        """&, | and ~ combine masks row by row."""
+        systems = FleetSnapshot.from_manifests(make_fleet()).systems
+        beta = systems.eq("operator", "Beta")
+        compliant = systems.eq("rsl_compliance", True)
+
+        assert (beta & compliant).indices() == [4]
+        assert (beta | compliant).indices() == [0, 1, 3, 4]
+        assert (~beta).indices() == [0, 2, 3]
+        assert systems.isin("redistribution_policy", ["none", "unrestricted"]).count() == 2
+
+    def test_unknown_values_match_nothing(self):
+        """Filtering on a string no manifest holds selects no rows."""
+        systems = FleetSnapshot.from_manifests(make_fleet()).systems
+
+        assert systems.eq("operator", "Nobody").count() == 0
+        assert systems.eq("parent_model", None).count() == 5
+
+    def test_bare_entries_and_missing_expiry(self):
+        """Bare list entries become rows; missing expiries never expire."""
+        snapshot = FleetSnapshot.from_manifests([make_manifest(0, expires=None)])
+
+        rows = snapshot.sources.records()
+        assert [row["identifier"] for row in rows] == ["source:wire", "source:archive"]
+        assert rows[1]["license_type"] is None
+        assert snapshot.sources.between("expires_at", high=datetime(9000, 1, 1)).count() == 0
+        assert snapshot.datasets.count_by("rsl_compliant") == {True: 1, None: 1}
+
+    def test_unparseable_expiry_has_expired(self):
+        """An unparseable expiry sorts before every date, as in the policy engine."""
+        snapshot = FleetSnapshot.from_manifests([make_manifest(0, expires="soon")])
+
+        assert snapshot.sources.between("expires_at", high=NOW).count() == 1
+
+    def test_joins(self):
+        """Child rows join to their systems in both directions."""
+        snapshot = FleetSnapshot.from_manifests(make_fleet())
+        beta = snapshot.systems.eq("operator", "Beta")
+        expiring = snapshot.sources.between("expires_at", NOW, NOW + timedelta(days=30))
+
+        assert snapshot.sources.of_systems(beta).count() == 4
+        assert snapshot.sources.systems(expiring).indices() == [3, 4]
+        assert snapshot.affiliations.eq("system", did(2)).count() == 1
+
+    def test_masks_from_other_tables_are_rejected(self):
+        """Combining masks over different tables is an error."""
+        snapshot = FleetSnapshot.from_manifests(make_fleet())
+
+        with pytest.raises(ValueError):
+            snapshot.systems.all() & snapshot.sources.all()
+        with pytest.raises(KeyError):
+            snapshot.systems.eq("missing", 1)
+
+
+class TestAppend:
+    """Tests for incremental appends."""
+
+    def test_newer_manifest_supersedes(self):
+        """A new version replaces the DID's rows in every query."""
+        snapshot = FleetSnapshot.from_manifests(make_fleet())
+        updated = make_manifest(1, rsl=True, operator="Gamma")
+
+        assert snapshot.append(updated)
+
+        assert len(snapshot) == 5
+        assert len(snapshot.systems) == 6
+        assert compliance_report(snapshot)["risky"] == []
+        assert snapshot.systems.count_by("operator") == {"Acme": 3, "Beta": 1, "Gamma": 1}
+        assert snapshot.sources.count() == 10
+
+    def test_range_filters_see_appended_rows(self):
+        """Rows appended after a range query still match later ones."""
+        snapshot = FleetSnapshot.from_manifests(make_manifest(i) for i in range(20))
+        window = (NOW, NOW + timedelta(days=30))
+        assert snapshot.sources.between("expires_at", *window).count() == 0
+
+        snapshot.append(make_manifest(20, expires="2030-01-10"))
+
+        expiring = snapshot.sources.between("expires_at", *window)
+        assert snapshot.sources.values("system", expiring) == [did(20)]
+        assert snapshot.sources.between("expires_at", low=NOW).count() == 42
+
+    def test_unchanged_manifest_is_skipped(self):
+        """Re-appending the current version adds no rows."""
+        fleet = make_fleet()
+        snapshot = FleetSnapshot.from_manifests(fleet)
+
+        assert snapshot.extend(fleet) == 0
+        assert len(snapshot.systems) == 5
+
+
+class TestPersistence:
+    """Tests for save and load."""
+
+    def test_round_trip(self, tmp_path):
+        """A loaded snapshot answers queries exactly as the one saved."""
+        snapshot = FleetSnapshot.from_manifests(make_fleet())
+        snapshot.append(make_manifest(1, operator="Gamma"))
+        snapshot.save(tmp_path / "fleet.snap")
+
+        with FleetSnapshot.load(tmp_path / "fleet.snap") as loaded:
+            assert compliance_report(loaded) == compliance_report(snapshot)
+            assert loaded.systems.records() == snapshot.systems.records()
+            assert did(3) in loaded
+
+    def test_loaded_columns_are_mapped(self, tmp_path):
+        """Columns are views into the file until the first append copies them."""
+        FleetSnapshot.from_manifests(make_fleet()).save(tmp_path / "fleet.snap")
+        loaded = FleetSnapshot.load(tmp_path / "fleet.snap")
+
+        assert isinstance(loaded.sources.column("expires_at"), memoryview)
+
+        assert loaded.append(make_manifest(5))
+        assert not isinstance(loaded.sources.column("expires_at"), memoryview)
+        loaded.save(tmp_path / "fleet.snap")
+        with FleetSnapshot.load(tmp_path / "fleet.snap") as reloaded:
+            assert len(reloaded) == 6
+            assert reloaded.systems.values("did", reloaded.systems.eq("did", did(5))) == [did(5)]
+
+    def test_other_byte_order(self, tmp_path):
+        """Snapshots written on a machine of the other byte order are swapped on load."""
+        snapshot = FleetSnapshot.from_manifests(make_fleet())
+        snapshot.save(tmp_path / "fleet.snap")
+        swap_byte_order(tmp_path / "fleet.snap")
+
+        with FleetSnapshot.load(tmp_path / "fleet.snap") as loaded:
+            assert not isinstance(loaded.sources.column("expires_at"), memoryview)
+            assert compliance_report(loaded) == compliance_report(snapshot)
+
+    def test_rejects_other_files(self, tmp_path):
+        """Empty, foreign and truncated files are not snapshots."""
+        FleetSnapshot.from_manifests(make_fleet()).save(tmp_path / "fleet.snap")
+        data = (tmp_path / "fleet.snap").read_bytes()
+        (tmp_path / "empty").write_bytes(b"")
+        (tmp_path / "foreign").write_bytes(b"not a snapshot at all")
+        (tmp_path / "truncated").write_bytes(data[: len(data) // 2])
+
+        for name in ("empty", "foreign", "truncated"):
+            with pytest.raises(ValueError):
+                FleetSnapshot.load(tmp_path / name)
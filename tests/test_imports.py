@@ -0,0 +1,70 @@
+"""Tests for lazy package imports."""
+
+import subprocess
+import sys
+
+import pytest
+
+import openattribution.aims as aims
+from openattribution.aims import crypto, layers
+
+HEAVY = ("pydantic", "httpx", "cryptography")
+
+
+def loaded_after(statement: str) -> set[str]:
+    """The heavy dependencies a fresh interpreter has imported after ``statement``."""
+    code = f"import sys\n{statement}\nprint(*[m for m in {HEAVY!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return set(result.stdout.split())
+
+
+class TestLazyImports:
+    """Tests for the module-level __getattr__ exports."""
+
+    @pytest.mark.parametrize(
+        ("statement", "expected"),
+        [
+            ("import openattribution.aims", set()),
+            ("from openattribution.aims import AIMSDID", set()),
+            ("from openattribution.aims.layers import FoundationLayer", {"pydantic"}),
+            ("from openattribution.aims import AIManifest", {"pydantic"}),
+            ("from openattribution.aims.crypto import merkle_root", set()),
+            ("from openattribution.aims import ManifestStore", {"pydantic", "httpx"}),
+            ("import openattribution.aims.cli", set()),
+        ],
+    )
+    def test_dependencies_load_on_first_use(self, statement, expected):
+        """Each export pulls in only the dependencies it needs."""
+        assert loaded_after(statement) == expected
+
+    def test_signing_loads_crypto_backend(self):
+        """The crypto backend is imported when a manifest is first signed."""
+        statement = (
+            "from openattribution.aims import AIManifest\n"
+            "manifest = AIManifest(did='did:aims:web:example.com:agent')\n"
+            "assert 'cryptography' not in sys.modules\n"
+            "from openattribution.aims.crypto import generate_keypair\n"
+            "manifest.sign(generate_keypair()[0])"
+        )
+        assert loaded_after(statement) == {"pydantic", "cryptography"}
+
+    @pytest.mark.parametrize("package", [aims, layers, crypto])
+    def test_public_api_unchanged(self, package):
+        """Every name in __all__ resolves and is listed by dir()."""
+        for name in package.__all__:
+            assert getattr(package, name) is not None
+        assert set(package.__all__) <= set(dir(package))
+
+    def test_exports_are_the_defining_objects(self):
+        """Lazy exports are the same objects as in their modules."""
+        from openattribution.aims.crypto.ed25519 import default_verifier
+        from openattribution.aims.manifest import AIManifest
+
+        assert aims.AIManifest is AIManifest
+        assert crypto.default_verifier is default_verifier
+
+    def test_unknown_attribute(self):
+        """Unknown names still raise AttributeError."""
+        with pytest.raises(AttributeError, match="Missing"):
+            _ = aims.Missing
@@ -0,0 +1,165 @@
+"""Tests for instrumentation hooks and sinks."""
+
+import httpx
+import pytest
+
+from openattribution.aims import AIManifest, ManifestCache, ManifestStore, instrumentation
+from openattribution.aims.crypto import generate_keypair
+from openattribution.aims.instrumentation import (
+    CACHE_HIT,
+    CACHE_MISS,
+    DECODE,
+    PAYLOAD_BYTES,
+    TRANSFER,
+    VALIDATE,
+    VERIFY,
+    Histogram,
+    InMemorySink,
+    OpenTelemetrySink,
+)
+from openattribution.aims.revocation import RevocationList
+from openattribution.aims.wire import CBOR_MEDIA_TYPE, encode_manifest
+
+DID = "did:aims:web:example.com:agent"
+URL = "http://store.test"
+
+
+@pytest.fixture
+def sink():
+    """An in-memory sink registered for the duration of a test."""
+    sink = InMemorySink()
+    instrumentation.add_sink(sink)
+    yield sink
+    instrumentation.remove_sink(sink)
+
+
+def make_store(body: bytes, content_type: str = "application/json", **options) -> ManifestStore:
+    """A store whose transport always serves ``body``."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"Content-Type": content_type})
+
+    return ManifestStore(URL, transport=httpx.MockTransport(handler), **options)
+
+
+class TestHooks:
+    """Tests for the metrics emitted by the library."""
+
+    async def test_resolve_phases(self, sink):
+        """A network resolve records transfer, size, decode and validate per store."""
+        body = AIManifest(did=DID).model_dump_json().encode()
+        async with make_store(body) as store:
+            assert (await store.resolve(DID)).did == DID
+
+        assert sink.histogram(TRANSFER, store=URL).count == 1
+        assert sink.histogram(PAYLOAD_BYTES, store=URL).max == len(body)
+        assert sink.histogram(DECODE, store=URL).count == 1
+        assert sink.histogram(VALIDATE, store=URL).count == 1
+
+    async def test_binary_resolve_phases(self, sink):
+        """Binary bodies are timed through the same decode and validate phases."""
+        manifest = AIManifest(did=DID)
+        async with make_store(encode_manifest(manifest), CBOR_MEDIA_TYPE, binary=True) as store:
+            resolved = await store.resolve(DID)
+
+        assert resolved.content_hash == manifest.content_hash
+        assert sink.histogram(DECODE, store=URL).count == 1
+
+    async def test_revocation_sync_is_timed(self, sink):
+        """Revocation syncs are recorded like any other store request."""
+        body = b'{"version": 0, "full": true, "added": ""}'
+        async with make_store(body, revocations=RevocationList()) as store:
+            assert await store.sync_revocations() == 0
+
+        assert sink.histogram(TRANSFER, store=URL).count == 1
+        assert sink.histogram(PAYLOAD_BYTES, store=URL).max == len(body)
+
+    async def test_cache_counters(self, sink):
+        """Cache lookups count hits and misses."""
+        body = AIManifest(did=DID).model_dump_json().encode()
+        async with make_store(body, cache=ManifestCache()) as store:
+            await store.resolve(DID)
+            await store.resolve(DID)
+
+        assert sink.counter(CACHE_MISS) == 1
+        assert sink.counter(CACHE_HIT) == 1
+
+    def test_verify_is_timed(self, sink):
+        """Signature checks are timed; a verified manifest is not checked twice."""
+        private_key, public_key = generate_keypair()
+        manifest = AIManifest(did=DID)
+        manifest.sign(private_key)
+
+        assert manifest.verify(public_key)
+        assert manifest.verify(public_key)
+        assert sink.histogram(VERIFY).count == 1
+
+    def test_disabled_records_nothing(self):
+        """Without sinks, span() returns the shared no-op and nothing is kept."""
+        sink = InMemorySink()
+        instrumentation.add_sink(sink)
+        instrumentation.remove_sink(sink)
+
+        assert not instrumentation.enabled()
+        with instrumentation.span(DECODE) as first, instrumentation.span(DECODE) as second:
+            pass
+        instrumentation.count(CACHE_HIT)
+        assert first is second
+        assert not sink.histograms and not sink.counters
+
+
+class TestSinks:
+    """Tests for Histogram and the sink implementations."""
+
+    def test_histogram_percentiles(self):
+        """Percentiles report bucket bounds, clamped to the maximum."""
+        histogram = Histogram()
+        for _ in range(99):
+            histogram.record(0.0015)
+        histogram.record(0.3)
+
+        assert histogram.count == 100
+        assert histogram.percentile(0.5) == 0.002
+        assert histogram.percentile(1.0) == 0.3
+        assert histogram.mean == pytest.approx((99 * 0.0015 + 0.3) / 100)
+
+    def test_opentelemetry_adapter(self):
+        """Metrics map onto meter histograms and counters, created once."""
+        meter = FakeMeter()
+        sink = OpenTelemetrySink(meter)
+
+        sink.observe(TRANSFER, 0.25, {"store": URL})
+        sink.observe(TRANSFER, 0.5, {"store": URL})
+        sink.add(CACHE_HIT, 1, {})
+
+        assert meter.created == [(TRANSFER, "s"), (CACHE_HIT, "1")]
+        assert meter.instruments[TRANSFER].values == [(0.25, {"store": URL}), (0.5, {"store": URL})]
+        assert meter.instruments[CACHE_HIT].values == [(1, {})]
+
+
+class FakeInstrument:
+    """Records values passed to an OpenTelemetry instrument."""
+
+    def __init__(self):
+        self.values = []
+
+    def record(self, value, attributes=None):
+        self.values.append((value, attributes))
+
+    def add(self, amount, attributes=None):
+        self.values.append((amount, attributes))
+
+
+class FakeMeter:
+    """The subset of the OpenTelemetry Meter API the adapter uses."""
+
+    def __init__(self):
+        self.created = []
+        self.instruments = {}
+
+    def _create(self, name, unit="", description=""):
+        self.created.append((name, unit))
+        return self.instruments.setdefault(name, FakeInstrument())
+
+    create_histogram = _create
+    create_counter = _create
@@ -0,0 +1,159 @@
+"""Tests for lazy manifest views."""
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from openattribution.aims import AIManifest, ManifestCache, ManifestStore
+from openattribution.aims.layers import ContentAccessLayer, FoundationLayer
+from openattribution.aims.layers.content_access import RedistributionPolicy
+from openattribution.aims.layers.foundation import DatasetReference
+from openattribution.aims.lazy import InternPool, LazyManifest, _Header
+from openattribution.aims.server import create_app
+from openattribution.aims.wire import CBOR_MEDIA_TYPE, encode_manifest
+
+DID = "did:aims:web:example.com:agent"
+
+
+def make_manifest(did: str = DID) -> AIManifest:
+    """A manifest with a shared dataset reference and a non-default policy."""
+    return AIManifest(
+        did=did,
+        foundation=FoundationLayer(
+            training_datasets=["dataset:books"],
+            dataset_details=[DatasetReference(identifier="dataset:books", license="MIT")],
+        ),
+        content_access=ContentAccessLayer(redistribution_policy=RedistributionPolicy.NONE),
+    )
+
+
+class TestLazyManifest:
+    """Tests for LazyManifest."""
+
+    def test_hot_path_validates_no_layers(self):
+        """did and the redistribution policy are read without validating a layer."""
+        view = LazyManifest(make_manifest().model_dump_json().encode())
+
+        assert view.did == DID
+        assert view.redistribution_policy is RedistributionPolicy.NONE
+        assert view.version == "1.0"
+        assert view.validated_layers == frozenset()
+
+    def test_layers_validate_once_on_access(self):
+        """Each layer is validated on first access and then reused."""
+        view = LazyManifest(make_manifest().model_dump_json().encode())
+
+        foundation = view.foundation
+        assert foundation.dataset_details[0].license == "MIT"
+        assert view.foundation is foundation
+        assert view.validated_layers == {"foundation"}
+
+    def test_invalid_layer_fails_only_when_read(self):
+        """A malformed layer surfaces as a ValidationError on access."""
+        body = make_manifest().model_dump_json().replace('"license":"MIT"', '"license":7')
+        view = LazyManifest(body.encode())
+
+        assert view.did == DID
+        with pytest.raises(ValidationError):
+            _ = view.foundation
+
+    def test_to_manifest_matches_full_validation(self):
+        """to_manifest() and content_hash agree with AIManifest, also from binary bodies."""
+        manifest = make_manifest()
+        view = LazyManifest(encode_manifest(manifest), CBOR_MEDIA_TYPE)
+
+        assert view.to_manifest().model_dump() == manifest.model_dump()
+        assert view.content_hash == manifest.content_hash
+        assert view.to_manifest() is not view.to_manifest()
+
+    def test_unknown_attribute(self):
+        """Only AIManifest's top-level fields are exposed."""
+        view = LazyManifest(make_manifest().model_dump_json().encode())
+
+        with pytest.raises(AttributeError):
+            _ = view.missing
+
+
+class TestInternPool:
+    """Tests for InternPool."""
+
+    def test_identical_layers_are_shared(self):
+        """Equal sub-objects from different manifests become one instance."""
+        pool = InternPool()
+        first = LazyManifest(make_manifest().model_dump_json().encode(), pool=pool)
+        other = make_manifest("did:aims:web:other.com:agent")
+        second = LazyManifest(other.model_dump_json().encode(), pool=pool)
+
+        assert first.foundation is second.foundation
+        assert first.foundation.dataset_details[0] is second.foundation.dataset_details[0]
+        assert pool.hits >= 1
+
+    def test_different_values_are_not_shared(self):
+        """Sub-objects that differ in any field stay distinct."""
+        pool = InternPool()
+        first = pool.intern(DatasetReference(identifier="dataset:a", license="MIT"))
+        second = pool.intern(DatasetReference(identifier="dataset:a", license="CC0-1.0"))
+
+        assert first is not second
+        assert pool.intern(DatasetReference(identifier="dataset:a", license="MIT")) is first
+
+    def test_entries_are_released(self):
+        """The pool holds entries weakly."""
+        pool = InternPool()
+        view = LazyManifest(make_manifest().model_dump_json().encode(), pool=pool)
+        _ = view.foundation
+        assert len(pool) > 0
+
+        del view, _
+        assert len(pool) == 0
+
+
+class TestLazyResolve:
+    """Tests for ManifestStore.resolve_lazy and lazily parsed cache entries."""
+
+    async def test_resolve_lazy_skips_full_validation(self):
+        """A lazy resolve caches the body unvalidated and reuses one view per entry."""
+        app, manifest = create_app(), make_manifest()
+        app.repository.publish(manifest)
+        app.repository.publish(make_manifest("did:aims:web:other.com:agent"))
+        cache = ManifestCache()
+        store = ManifestStore(
+            "http://store.test", transport=httpx.ASGITransport(app=app), cache=cache
+        )
+
+        async with store:
+            view = await store.resolve_lazy(DID)
+            again = await store.resolve_lazy(DID)
+            other = await store.resolve_lazy("did:aims:web:other.com:agent")
+            missing = await store.resolve_lazy("did:aims:web:missing.com:agent")
+
+            assert cache.peek(DID).parsed is None
+            assert view is again
+            assert view.redistribution_policy is RedistributionPolicy.NONE
+            assert view.foundation.dataset_details[0] is other.foundation.dataset_details[0]
+            assert (await store.resolve(DID)).content_hash == manifest.content_hash
+        assert missing is None
+
+    async def test_invalid_body_is_not_cached(self):
+        """A body that fails validation is dropped from the cache, lazily or not."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"name": "no did"})
+
+        cache = ManifestCache()
+        async with ManifestStore(
+            "http://store.test", transport=httpx.MockTransport(handler), cache=cache
+        ) as store:
+            with pytest.raises(ValidationError):
+                await store.resolve(DID)
+            assert DID not in cache
+            with pytest.raises(ValidationError):
+                await store.resolve_lazy(DID)
+            assert DID not in cache
+
+    def test_header_tracks_manifest_fields(self):
+        """The eager header model has every top-level AIManifest field."""
+        assert set(_Header.model_fields) == set(AIManifest.model_fields) - {
+            "foundation",
+            "deployment",
+        }
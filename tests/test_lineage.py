@@ -0,0 +1,151 @@
+"""Tests for the lineage index."""
+
+import threading
+
+import httpx
+
+from openattribution.aims import AIManifest
+from openattribution.aims.layers import FoundationLayer
+from openattribution.aims.layers.foundation import DatasetReference
+from openattribution.aims.lineage import LineageIndex
+from openattribution.aims.server import create_app
+
+BASE = "did:aims:web:meta.com:llama"
+TUNED = "did:aims:web:example.com:assistant"
+SHOP = "did:aims:web:shop.com:agent"
+
+
+def make_manifest(did: str, datasets=(), details=(), parent: str | None = None) -> AIManifest:
+    """Build a manifest with the given foundation lineage."""
+    return AIManifest(
+        did=did,
+        foundation=FoundationLayer(
+            training_datasets=list(datasets),
+            dataset_details=[DatasetReference(identifier=d) for d in details],
+            parent_model=parent,
+            derivation_type="fine-tune" if parent else None,
+        ),
+    )
+
+
+def make_chain() -> list[AIManifest]:
+    """A base model, a fine-tune of it, and a fine-tune of the fine-tune."""
+    return [
+        make_manifest(BASE, ["dataset:books"], ["dataset:web"]),
+        make_manifest(TUNED, ["dataset:reviews"], parent=BASE),
+        make_manifest(SHOP, ["dataset:catalog"], parent=TUNED),
+    ]
+
+
+class TestLineageIndex:
+    """Tests for LineageIndex queries and updates."""
+
+    def test_direct_and_transitive_users(self):
+        """Dataset users include derivatives only when transitive."""
+        index = LineageIndex()
+        index.add_many(make_chain())
+
+        assert index.systems_using("dataset:web", transitive=False) == {BASE}
+        assert index.systems_using("dataset:web") == {BASE, TUNED, SHOP}
+        assert index.systems_using("dataset:reviews") == {TUNED, SHOP}
+        assert index.systems_using("dataset:unknown") == set()
+
+    def test_ancestry(self):
+        """Parent chains, descendants and inherited datasets follow the graph."""
+        index = LineageIndex()
+        index.add_many(make_chain())
+
+        assert index.ancestors(SHOP) == [TUNED, BASE]
+        assert index.descendants(BASE) == {TUNED, SHOP}
+        assert index.datasets_of(SHOP) == {
+            "dataset:books",
+            "dataset:web",
+            "dataset:reviews",
+            "dataset:catalog",
+        }
+        assert index.datasets_of(SHOP, transitive=False) == {"dataset:catalog"}
+
+    def test_replacing_a_manifest_updates_postings(self):
+        """A newer manifest for a DID replaces its datasets and parent."""
+        index = LineageIndex()
+        index.add_many(make_chain())
+        replacement = make_manifest(TUNED, ["dataset:licensed-reviews"])
+
+        assert index.add(replacement)
+        assert not index.add(replacement)
+        assert index.systems_using("dataset:reviews") == set()
+        assert index.systems_using("dataset:web") == {BASE}
+        assert index.ancestors(SHOP) == [TUNED]
+
+    def test_cycles_terminate(self):
+        """A cyclic parent chain does not loop forever."""
+        index = LineageIndex()
+        index.add(make_manifest(BASE, ["dataset:a"], parent=TUNED))
+        index.add(make_manifest(TUNED, ["dataset:b"], parent=BASE))
+
+        assert index.ancestors(BASE) == [TUNED]
+        assert index.systems_using("dataset:a") == {BASE, TUNED}
+
+    def test_persists_across_restarts(self, tmp_path):
+        """A reopened index answers queries without re-adding manifests."""
+        path = tmp_path / "lineage.db"
+        chain = make_chain()
+        with LineageIndex(path) as index:
+            index.add_many(chain)
+            index.remove(SHOP)
+
+        with LineageIndex(path) as reopened:
+            assert len(reopened) == 2
+            assert reopened.systems_using("dataset:web") == {BASE, TUNED}
+            assert reopened.parent(TUNED) == BASE
+            assert not reopened.add(chain[0])
+
+
+class TestLineageServer:
+    """Tests for the server's lineage hook and route."""
+
+    async def test_publish_updates_index(self):
+        """Published manifests are indexed and queryable over HTTP."""
+        app = create_app(lineage_path=":memory:")
+        for manifest in make_chain():
+            app.repository.publish(manifest)
+        transport = httpx.ASGITransport(app=app)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://store.test") as client:
+            response = await client.get("/datasets/dataset:reviews/systems")
+            direct = await client.get(
+                "/datasets/dataset:reviews/systems", params={"transitive": "false"}
+            )
+
+        assert response.json()["systems"] == sorted([TUNED, SHOP])
+        assert direct.json()["systems"] == [TUNED]
+
+    def test_concurrent_publishes_index_latest_version(self):
+        """A slow lineage update cannot land after a later version's."""
+        repository = create_app(lineage_path=":memory:").repository
+        lineage = repository.lineage
+        first = make_manifest(BASE, ["dataset:old"])
+        second = make_manifest(BASE, ["dataset:new"])
+        indexing, release = threading.Event(), threading.Event()
+        add = lineage.add
+
+        def slow_add(manifest):
+            if manifest is first:
+                indexing.set()
+                release.wait(timeout=5)
+            return add(manifest)
+
+        lineage.add = slow_add
+        publisher = threading.Thread(target=repository.publish, args=(first,))
+        publisher.start()
+        indexing.wait(timeout=5)
+        later = threading.Thread(target=repository.publish, args=(second,))
+        later.start()
+        later.join(timeout=0.2)
+        release.set()
+        publisher.join()
+        later.join()
+
+        assert repository.latest(BASE).version == 2
+        assert lineage.systems_using("dataset:new") == {BASE}
+        assert lineage.systems_using("dataset:old") == set()
@@ -0,0 +1,117 @@
+"""Tests for Merkle commitments and inclusion proofs."""
+
+import hashlib
+
+import pytest
+
+from openattribution.aims.crypto import (
+    MerkleIndex,
+    MerkleProof,
+    build_index,
+    merkle_root,
+    verify_proof,
+)
+
+
+def write_records(path, records: list[bytes]) -> None:
+    path.write_bytes(b"".join(record + b"\n" for record in records))
+
+
+class TestMerkleRoot:
+    """Tests for in-memory roots."""
+
+    def test_single_record_root_is_its_leaf(self):
+        """A one-leaf tree's root is the leaf hash."""
+        expected = "sha256:" + hashlib.sha256(b"\x00record").hexdigest()
+        assert merkle_root([b"record"]) == expected
+
+    def test_root_depends_on_order(self):
+        """Reordering records changes the root."""
+        assert merkle_root([b"a", b"b", b"c"]) != merkle_root([b"b", b"a", b"c"])
+
+    def test_empty_raises(self):
+        """Zero records have no root."""
+        with pytest.raises(ValueError):
+            merkle_root([])
+
+
+class TestMerkleIndex:
+    """Tests for build_index, MerkleIndex and verify_proof."""
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 7, 8, 33])
+    def test_index_matches_in_memory_root(self, tmp_path, count):
+        """Streaming builds agree with the in-memory root for odd and even sizes."""
+        records = [f"record-{i}".encode() for i in range(count)]
+        write_records(tmp_path / "records.txt", records)
+
+        with build_index([tmp_path / "records.txt"], tmp_path / "tree.idx", workers=1) as index:
+            assert index.leaf_count == count
+            assert index.root == merkle_root(records)
+
+    def test_process_pool_and_chunking(self, tmp_path):
+        """Parallel, chunked, multi-file builds produce the same root."""
+        records = [f"record-{i}".encode() * (i % 5 + 1) for i in range(500)]
+        write_records(tmp_path / "a.txt", records[:200])
+        write_records(tmp_path / "b.txt", records[200:])
+
+        index = build_index(
+            [tmp_path / "a.txt", tmp_path / "b.txt"],
+            tmp_path / "tree.idx",
+            workers=2,
+            chunk_size=256,
+        )
+        with index:
+            assert index.root == merkle_root(records)
+
+    @pytest.mark.parametrize("count", [1, 5, 16, 21])
+    def test_every_proof_verifies(self, tmp_path, count):
+        """Proofs verify for every leaf, and only for the right record."""
+        records = [f"record-{i}".encode() for i in range(count)]
+        write_records(tmp_path / "records.txt", records)
+
+        with build_index([tmp_path / "records.txt"], tmp_path / "tree.idx", workers=1) as index:
+            for i, record in enumerate(records):
+                proof = index.proof(i)
+                assert verify_proof(record, proof, index.root)
+                assert not verify_proof(b"forged", proof, index.root)
+
+    def test_reopened_index_serves_proofs(self, tmp_path):
+        """Proofs come from the on-disk index without rebuilding."""
+        records = [f"record-{i}".encode() for i in range(10)]
+        write_records(tmp_path / "records.txt", records)
+        build_index([tmp_path / "records.txt"], tmp_path / "tree.idx", workers=1).close()
+
+        with MerkleIndex(tmp_path / "tree.idx") as index:
+            proof = MerkleProof.from_dict(index.proof(6).to_dict())
+            assert verify_proof(records[6], proof, index.root)
+            with pytest.raises(IndexError):
+                index.proof(10)
+
+    def test_tampered_proof_fails(self, tmp_path):
+        """Wrong positions and truncated sibling lists are rejected."""
+        records = [f"record-{i}".encode() for i in range(6)]
+        root = merkle_root(records)
+        write_records(tmp_path / "records.txt", records)
+
+        with build_index([tmp_path / "records.txt"], tmp_path / "tree.idx", workers=1) as index:
+            proof = index.proof(2)
+        moved = MerkleProof(3, proof.leaf_count, proof.siblings)
+        truncated = MerkleProof(2, proof.leaf_count, proof.siblings[:-1])
+
+        assert not verify_proof(records[2], moved, root)
+        assert not verify_proof(records[2], truncated, root)
+
+    def test_empty_files_raise(self, tmp_path):
+        """Building over no records fails and leaves no index behind."""
+        (tmp_path / "empty.txt").write_bytes(b"")
+
+        with pytest.raises(ValueError):
+            build_index([tmp_path / "empty.txt"], tmp_path / "tree.idx", workers=1)
+        assert not (tmp_path / "tree.idx").exists()
+
+    def test_rejects_foreign_files(self, tmp_path):
+        """Non-index files are rejected."""
+        (tmp_path / "junk.idx").write_bytes(b"x" * 64)
+
+        with pytest.raises(ValueError, match="Not a Merkle index"):
+            MerkleIndex(tmp_path / "junk.idx")
@@ -0,0 +1,113 @@
+"""Tests for JSON Patch diffs."""
+
+import copy
+
+import pytest
+
+from openattribution.aims import AIManifest
+from openattribution.aims.layers import ContentAccessLayer
+from openattribution.aims.patch import PatchError, apply_patch, diff
+
+
+def round_trip(old, new) -> list[dict]:
+    """Diff two documents, check the patch reproduces ``new``, and return it."""
+    patch = diff(old, new)
+    assert apply_patch(copy.deepcopy(old), patch) == new
+    return patch
+
+
+class TestDiff:
+    """Tests for diff()."""
+
+    def test_equal_documents(self):
+        """Equal documents give an empty patch."""
+        assert diff({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}) == []
+
+    def test_object_members(self):
+        """Members are added, removed and replaced individually."""
+        patch = round_trip({"a": 1, "b": 2, "c": {"d": 3}}, {"a": 1, "c": {"d": 4}, "e": 5})
+
+        assert patch == [
+            {"op": "remove", "path": "/b"},
+            {"op": "replace", "path": "/c/d", "value": 4},
+            {"op": "add", "path": "/e", "value": 5},
+        ]
+
+    def test_list_append_and_insert(self):
+        """Appending or inserting one entry costs one operation."""
+        items = [{"id": i} for i in range(50)]
+
+        assert round_trip(items, [*items, {"id": 50}]) == [
+            {"op": "add", "path": "/50", "value": {"id": 50}}
+        ]
+        assert round_trip(items, [{"id": -1}, *items]) == [
+            {"op": "add", "path": "/0", "value": {"id": -1}}
+        ]
+        assert round_trip(items, items[:10] + items[11:]) == [{"op": "remove", "path": "/10"}]
+
+    def test_list_changes(self):
+        """Mixed list edits round-trip."""
+        round_trip([1, 2, 3, 4, 5], [1, 9, 8, 7, 5])
+        round_trip([1, 2, 3, 4, 5], [1, 5])
+        round_trip([], [1, 2])
+        round_trip([1, 2], [])
+
+    def test_types_are_distinguished(self):
+        """A value changing type is replaced even if it compares equal."""
+        assert diff({"a": 1}, {"a": True}) == [{"op": "replace", "path": "/a", "value": True}]
+
+    def test_escaped_keys(self):
+        """Keys containing / and ~ are escaped in paths."""
+        patch = round_trip({"a/b": 1, "c~d": 2}, {"a/b": 3, "c~d": 4})
+
+        assert [op["path"] for op in patch] == ["/a~1b", "/c~0d"]
+
+    def test_manifest_documents(self):
+        """Manifest dumps round-trip through a small patch."""
+        sources = [f"source:publisher-{i}" for i in range(100)]
+        manifest = AIManifest(
+            did="did:aims:web:example.com:agent",
+            content_access=ContentAccessLayer(licensed_sources=sources),
+        )
+        old = manifest.model_dump(mode="json")
+        new = copy.deepcopy(old)
+        new["content_access"]["licensed_sources"].append("source:new")
+        new["updated_at"] = "2030-01-01T00:00:00Z"
+
+        assert len(round_trip(old, new)) == 2
+
+
+class TestApplyPatch:
+    """Tests for apply_patch()."""
+
+    def test_move_copy_and_test(self):
+        """The remaining RFC 6902 operations apply."""
+        document = {"a": {"b": 1}, "list": [1, 2]}
+        patch = [
+            {"op": "test", "path": "/a/b", "value": 1},
+            {"op": "copy", "from": "/a", "path": "/c"},
+            {"op": "move", "from": "/list/0", "path": "/list/-"},
+            {"op": "replace", "path": "", "value": None},
+        ]
+
+        assert apply_patch(document, patch[:3]) == {"a": {"b": 1}, "c": {"b": 1}, "list": [2, 1]}
+        assert apply_patch(document, patch) is None
+
+    @pytest.mark.parametrize(
+        "patch",
+        [
+            {"op": "add"},
+            [{"op": "remove", "path": "/missing"}],
+            [{"op": "replace", "path": "/list/5", "value": 0}],
+            [{"op": "add", "path": "/list/01", "value": 0}],
+            [{"op": "add", "path": "list", "value": 0}],
+            [{"op": "test", "path": "/a", "value": 2}],
+            [{"op": "move", "from": "/b", "path": "/b/c"}],
+            [{"op": "frobnicate", "path": "/a"}],
+            [{"op": "add", "path": "/a/b", "value": 0}],
+        ],
+    )
+    def test_invalid_patches(self, patch):
+        """Malformed or inapplicable patches raise PatchError."""
+        with pytest.raises(PatchError):
+            apply_patch({"a": 1, "b": {}, "list": [1]}, patch)
@@ -0,0 +1,196 @@
+"""Tests for the trust-policy engine."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from openattribution.aims import AIManifest
+from openattribution.aims.layers import ContentAccessLayer, DeploymentLayer, FoundationLayer
+from openattribution.aims.layers.content_access import LicensedSource
+from openattribution.aims.layers.deployment import BrandAffiliation
+from openattribution.aims.policy import (
+    BaseRule,
+    HoldsLicense,
+    ManifestFacts,
+    MinRedistribution,
+    NoBrandAffiliation,
+    Policy,
+    parse_expiry,
+)
+
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def make_manifest(**content_access) -> AIManifest:
+    return AIManifest(
+        did="did:aims:web:example.com:agent",
+        foundation=FoundationLayer(training_datasets=["dataset:a"], rsl_compliance=True),
+        deployment=DeploymentLayer(
+            brand_affiliations=[
+                BrandAffiliation(brand="Acme", relationship="owner", influence_type="boost"),
+                BrandAffiliation(
+                    brand="Globex", relationship="sponsor", influence_type="exclusive"
+                ),
+            ]
+        ),
+        content_access=ContentAccessLayer(**content_access),
+    )
+
+
+class TestManifestFacts:
+    """Tests for precomputed manifest facts."""
+
+    def test_expiry_parsing(self):
+        """Expiry strings parse to aware datetimes; junk counts as expired."""
+        assert parse_expiry("2030-01-01").tzinfo is UTC
+        assert parse_expiry("2030-01-01T00:00:00Z") > NOW
+        assert parse_expiry(None) == datetime.max.replace(tzinfo=UTC)
+        assert parse_expiry("next tuesday") < NOW
+
+    def test_sources_and_latest_expiry(self):
+        """Sources come from both lists; detailed sources use their latest grant."""
+        facts = ManifestFacts.from_manifest(
+            make_manifest(
+                licensed_sources=["source:plain", "source:x"],
+                source_details=[
+                    LicensedSource(
+                        identifier="source:x", license_type="granted", expires_at="2025-01-01"
+                    ),
+                    LicensedSource(
+                        identifier="source:x", license_type="granted", expires_at="2027-01-01"
+                    ),
+                ],
+            )
+        )
+
+        assert facts.sources == {"source:plain", "source:x"}
+        assert facts.source_expiry["source:x"].year == 2027
+        assert facts.datasets == {"dataset:a"}
+
+    def test_unparseable_expiry_is_recorded_as_expired(self):
+        """A grant with a garbage expiry is held but expired, even if also listed bare."""
+        garbage = LicensedSource(identifier="source:x", license_type="granted", expires_at="soon")
+        listed = ManifestFacts.from_manifest(
+            make_manifest(licensed_sources=["source:x"], source_details=[garbage])
+        )
+        detailed = ManifestFacts.from_manifest(make_manifest(source_details=[garbage]))
+
+        for facts in (listed, detailed):
+            assert facts.sources == {"source:x"}
+            assert facts.source_expiry["source:x"] < NOW
+        assert not Policy(rules=[HoldsLicense(source="source:x")]).compile().allows(listed, NOW)
+        assert (
+            Policy(rules=[HoldsLicense(source="source:x", allow_expired=True)])
+            .compile()
+            .allows(detailed, NOW)
+        )
+
+
+class TestPolicy:
+    """Tests for Policy compilation and evaluation."""
+
+    def test_min_redistribution(self):
+        """Redistribution policies are compared by permissiveness."""
+        policy = Policy(rules=[MinRedistribution(policy="attributed")]).compile()
+
+        assert policy.allows(make_manifest(redistribution_policy="unrestricted"), NOW)
+        assert policy.allows(make_manifest(redistribution_policy="attributed"), NOW)
+        assert not policy.allows(make_manifest(redistribution_policy="summary_only"), NOW)
+
+    def test_holds_unexpired_license(self):
+        """Licenses must exist and not be expired."""
+        policy = Policy(rules=[HoldsLicense(source="source:x")]).compile()
+        expired = make_manifest(
+            source_details=[
+                LicensedSource(
+                    identifier="source:x", license_type="granted", expires_at="2025-06-01"
+                )
+            ]
+        )
+
+        assert policy.allows(make_manifest(licensed_sources=["source:x"]), NOW)
+        assert not policy.allows(make_manifest(), NOW)
+        assert not policy.allows(expired, NOW)
+        assert (
+            Policy(rules=[HoldsLicense(source="source:x", allow_expired=True)])
+            .compile()
+            .allows(expired, NOW)
+        )
+
+    def test_naive_now_is_utc(self):
+        """A naive evaluation time is taken as UTC, like naive expiry timestamps."""
+        policy = Policy(rules=[HoldsLicense(source="source:x")]).compile()
+        manifest = make_manifest(
+            source_details=[
+                LicensedSource(
+                    identifier="source:x",
+                    license_type="granted",
+                    expires_at="2026-01-01T12:00:00+00:00",
+                )
+            ]
+        )
+
+        assert policy.allows(manifest, datetime(2026, 1, 1, 11))
+        assert not policy.evaluate(manifest, datetime(2026, 1, 1, 13)).allowed
+        assert [d.allowed for d in policy.evaluate_many([manifest], datetime(2026, 1, 1))] == [True]
+
+    def test_rules_must_implement_describe_and_predicate(self):
+        """BaseRule is abstract; a rule missing a method cannot be instantiated."""
+
+        class Incomplete(BaseRule):
+            def describe(self) -> str:
+                return "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_brand_affiliation_rules(self):
+        """Affiliations can be rejected by influence type, brand, or the pair."""
+        manifest = make_manifest()
+
+        def allows(**rule) -> bool:
+            return Policy(rules=[NoBrandAffiliation(**rule)]).compile().allows(manifest, NOW)
+
+        assert not allows(influence_type="exclusive")
+        assert allows(influence_type="paid")
+        assert not allows(brand="Acme")
+        assert allows(brand="Acme", influence_type="exclusive")
+        assert not allows(brand="Globex", influence_type="exclusive")
+        assert not allows()
+
+    def test_evaluate_reports_every_violation(self):
+        """Decisions list all failing rules."""
+        policy = Policy(
+            rules=[
+                MinRedistribution(policy="unrestricted"),
+                HoldsLicense(source="source:x"),
+                NoBrandAffiliation(influence_type="boost"),
+            ]
+        ).compile()
+
+        decision = policy.evaluate(make_manifest(licensed_sources=["source:x"]), NOW)
+
+        assert not decision.allowed
+        assert decision.violations == (
+            "redistribution_policy >= unrestricted",
+            "no brand affiliation with influence_type=boost",
+        )
+
+    def test_policy_loads_from_config(self):
+        """Policies are declarative and can be parsed from JSON."""
+        policy = Policy.model_validate_json(
+            '{"rules": [{"rule": "min_redistribution", "policy": "attributed"},'
+            ' {"rule": "rsl_compliance"}, {"rule": "excludes_dataset", "dataset": "dataset:b"}]}'
+        ).compile()
+
+        assert policy.evaluate(make_manifest(redistribution_policy="attributed"), NOW).allowed
+
+    def test_evaluate_many_shares_facts(self):
+        """Batch evaluation builds facts once per manifest version."""
+        policy = Policy(rules=[MinRedistribution(policy="summary_only")]).compile()
+        manifests = [make_manifest(), make_manifest(redistribution_policy="none")]
+
+        decisions = policy.evaluate_many(manifests * 3, NOW)
+
+        assert [d.allowed for d in decisions] == [True, False] * 3
+        assert len(policy.facts_cache) == 2
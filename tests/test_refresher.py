@@ -0,0 +1,195 @@
+"""Tests for the background manifest refresher."""
+
+import asyncio
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+
+from openattribution.aims import AIManifest, ManifestCache, ManifestStore
+from openattribution.aims.layers import ContentAccessLayer
+from openattribution.aims.layers.content_access import LicensedSource
+from openattribution.aims.policy import parse_expiry
+from openattribution.aims.refresher import ManifestRefresher, license_deadlines
+from openattribution.aims.server import create_app
+
+DID = "did:aims:web:example.com:agent"
+OTHER = "did:aims:web:other.com:agent"
+START = datetime(2030, 1, 1, tzinfo=UTC).timestamp()
+
+
+class Clock:
+    """A manually advanced wall clock."""
+
+    def __init__(self, now: float = START):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_store(app, clock: Clock, ttl: float = 60.0) -> ManifestStore:
+    """A caching store client wired to an in-process server."""
+    return ManifestStore(
+        "http://store.test",
+        transport=httpx.ASGITransport(app=app),
+        cache=ManifestCache(ttl=ttl, clock=clock),
+    )
+
+
+def version(n: int, did: str = DID, **content_access) -> AIManifest:
+    """A distinguishable manifest version."""
+    return AIManifest(
+        did=did,
+        model_card_url=f"https://example.com/v{n}",
+        content_access=ContentAccessLayer(**content_access),
+    )
+
+
+async def drain(refresher: ManifestRefresher) -> None:
+    """Wait for every pending background refresh."""
+    while refresher._pending:
+        await asyncio.gather(*refresher._pending.values())
+
+
+class TestManifestRefresher:
+    """Tests for ManifestRefresher."""
+
+    async def test_serves_stale_and_refreshes_in_background(self):
+        """A recently expired copy is returned at once and replaced in the background."""
+        app, clock = create_app(), Clock()
+        app.repository.publish(version(1))
+        async with make_store(app, clock) as store:
+            refresher = ManifestRefresher(store)
+            assert (await refresher.resolve(DID)).model_card_url.endswith("v1")
+
+            app.repository.publish(version(2))
+            clock.now += 61
+            assert (await refresher.resolve(DID)).model_card_url.endswith("v1")
+            await drain(refresher)
+            assert (await refresher.resolve(DID)).model_card_url.endswith("v2")
+            assert refresher.refreshes == 1
+
+    async def test_too_stale_waits_for_the_store(self):
+        """Copies beyond max_stale are not served."""
+        app, clock = create_app(), Clock()
+        app.repository.publish(version(1))
+        async with make_store(app, clock) as store:
+            refresher = ManifestRefresher(store, max_stale=10)
+            await refresher.resolve(DID)
+
+            app.repository.publish(version(2))
+            clock.now += 71
+            assert (await refresher.resolve(DID)).model_card_url.endswith("v2")
+            assert not refresher._pending
+
+    async def test_refreshes_hot_entries_ahead_of_expiry(self):
+        """Only the hottest DIDs close to expiry are revalidated in a round."""
+        app, clock = create_app(), Clock()
+        app.repository.publish(version(1))
+        app.repository.publish(version(1, did=OTHER))
+        async with make_store(app, clock) as store:
+            refresher = ManifestRefresher(store, hot_size=1, lead=30)
+            for _ in range(5):
+                await refresher.resolve(DID)
+            await refresher.resolve(OTHER)
+            assert await refresher.run_once() == 0
+
+            clock.now += 45
+            assert refresher.hot() == [DID]
+            assert await refresher.run_once() == 1
+            assert store.cache.peek(DID).expires_at == clock.now + 60
+            assert store.cache.peek(OTHER).expires_at == START + 60
+
+    async def test_license_deadline_triggers_refresh(self):
+        """A passed source expiry refreshes a fresh entry once."""
+        app, clock = create_app(), Clock()
+        deadline = "2030-01-01T00:00:20+00:00"
+        source = LicensedSource(identifier="source:a", license_type="granted", expires_at=deadline)
+        app.repository.publish(version(1, source_details=[source]))
+        async with make_store(app, clock) as store:
+            refresher = ManifestRefresher(store)
+            await refresher.resolve(DID)
+            assert refresher.due() == []
+
+            app.repository.publish(version(2))
+            clock.now += 30
+            assert refresher.due() == [DID]
+            assert (await refresher.resolve(DID)).model_card_url.endswith("v1")
+            await drain(refresher)
+            assert (await refresher.resolve(DID)).model_card_url.endswith("v2")
+            assert refresher.due() == []
+
+    async def test_concurrency_cap(self):
+        """At most ``concurrency`` refreshes run at once."""
+        app, clock = create_app(), Clock()
+        async with make_store(app, clock) as store:
+            active = peak = 0
+
+            async def slow_refresh(did: str) -> None:
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.001)
+                active -= 1
+
+            store.refresh = slow_refresh
+            refresher = ManifestRefresher(store, concurrency=2)
+            for i in range(10):
+                refresher.schedule(f"did:aims:web:host{i}.com:agent")
+            await drain(refresher)
+
+        assert peak == 2
+        assert refresher.refreshes == 10
+
+    async def test_start_and_stop(self):
+        """The background task runs inside the context manager only."""
+        app, clock = create_app(), Clock()
+        async with make_store(app, clock) as store:
+            async with ManifestRefresher(store, interval=0.001) as refresher:
+                await asyncio.sleep(0.01)
+                assert refresher.running
+            assert not refresher.running
+
+    def test_requires_cache(self):
+        """A store without a cache cannot be refreshed."""
+        with pytest.raises(ValueError):
+            ManifestRefresher(ManifestStore("http://store.test"))
+
+    def test_license_deadlines(self):
+        """Expiries are read as the policy engine reads them, then sorted."""
+        sources = [
+            LicensedSource(identifier="a", license_type="granted", expires_at="2031-01-01"),
+            LicensedSource(identifier="b", license_type="granted", expires_at="soon"),
+            LicensedSource(identifier="c", license_type="granted", expires_at="2030-06-01T00:00Z"),
+            LicensedSource(identifier="d", license_type="granted"),
+        ]
+        deadlines = license_deadlines(version(1, source_details=sources))
+
+        assert deadlines == [
+            parse_expiry("soon").timestamp(),
+            datetime(2030, 6, 1, tzinfo=UTC).timestamp(),
+            datetime(2031, 1, 1, tzinfo=UTC).timestamp(),
+            parse_expiry(None).timestamp(),
+        ]
+
+    async def test_scores_are_bounded_by_cache(self):
+        """Access counts are kept only for DIDs the cache still holds."""
+        app, clock = create_app(), Clock()
+        dids = [f"did:aims:web:example{i}.com:agent" for i in range(10)]
+        for did in dids:
+            app.repository.publish(version(1, did))
+        store = ManifestStore(
+            "http://store.test",
+            transport=httpx.ASGITransport(app=app),
+            cache=ManifestCache(max_entries=2, clock=clock),
+        )
+
+        async with store:
+            refresher = ManifestRefresher(store)
+            for did in dids:
+                await refresher.resolve(did)
+
+        assert refresher.max_tracked == 2
+        assert len(refresher._scores) <= 4
+        assert set(dids[-2:]) <= set(refresher._scores)
@@ -0,0 +1,196 @@
+"""Tests for DID resolution."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from openattribution.aims import AIManifest
+from openattribution.aims.crypto import PublicKeyCache, generate_keypair
+from openattribution.aims.resolution import (
+    DIDDocument,
+    DIDResolutionError,
+    DIDResolver,
+    base58_decode,
+    base58_encode,
+    decode_ed25519_multikey,
+    encode_ed25519_multikey,
+)
+
+DID = "did:aims:web:example.com:agent"
+
+
+def make_document(did: str, public_key: bytes) -> dict:
+    """Build a DID Document with one multikey verification method."""
+    return {
+        "id": did,
+        "verificationMethod": [
+            {
+                "id": f"{did}#key-1",
+                "type": "Ed25519VerificationKey2020",
+                "controller": did,
+                "publicKeyMultibase": encode_ed25519_multikey(public_key),
+            }
+        ],
+        "assertionMethod": [f"{did}#key-1"],
+    }
+
+
+def make_transport(
+    documents: dict[str, dict], calls: list[httpx.Request], cache_control: str | None = None
+) -> httpx.MockTransport:
+    """Serve DID Documents by .well-known URL."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await asyncio.sleep(0)
+        document = documents.get(str(request.url))
+        if document is None:
+            return httpx.Response(404)
+        headers = {"Cache-Control": cache_control} if cache_control else {}
+        return httpx.Response(200, json=document, headers=headers)
+
+    return httpx.MockTransport(handler)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMultibase:
+    """Tests for the key encodings."""
+
+    def test_base58_round_trip(self):
+        """Leading zero bytes survive base58 encoding."""
+        data = b"\0\0hello world"
+
+        assert base58_decode(base58_encode(data)) == data
+
+    def test_multikey_round_trip(self):
+        """Ed25519 keys encode to z6Mk multikeys and back."""
+        _, public_key = generate_keypair()
+        multikey = encode_ed25519_multikey(public_key)
+
+        assert multikey.startswith("z6Mk")
+        assert decode_ed25519_multikey(multikey) == public_key
+
+    def test_invalid_multikey(self):
+        """Non-Ed25519 and malformed values are rejected."""
+        with pytest.raises(ValueError):
+            decode_ed25519_multikey("z0OIl")
+        with pytest.raises(ValueError):
+            decode_ed25519_multikey("m" + "A" * 44)
+
+
+class TestDIDResolver:
+    """Tests for DIDResolver."""
+
+    async def test_web_resolution_extracts_key(self):
+        """A did:web document is fetched and its key decoded and registered."""
+        _, public_key = generate_keypair()
+        url = "https://example.com/.well-known/aims/agent.json"
+        keys = PublicKeyCache()
+        resolver = DIDResolver(
+            transport=make_transport({url: make_document(DID, public_key)}, []), keys=keys
+        )
+
+        async with resolver:
+            resolved = await resolver.resolve(DID)
+
+        assert resolved.public_key == public_key
+        assert resolved.public_keys == {f"{DID}#key-1": public_key}
+        assert keys.get(DID) == public_key
+
+    async def test_concurrent_resolutions_share_one_fetch(self):
+        """Many concurrent resolves of one DID download the document once."""
+        _, public_key = generate_keypair()
+        calls: list[httpx.Request] = []
+        url = "https://example.com/.well-known/aims/agent.json"
+        resolver = DIDResolver(
+            transport=make_transport({url: make_document(DID, public_key)}, calls)
+        )
+
+        async with resolver:
+            results = await asyncio.gather(*(resolver.public_key(DID) for _ in range(20)))
+            await resolver.resolve(DID)
+
+        assert results == [public_key] * 20
+        assert len(calls) == 1
+
+    async def test_max_age_and_no_store(self):
+        """Cache-Control max-age sets the lifetime; no-store disables caching."""
+        _, public_key = generate_keypair()
+        url = "https://example.com/.well-known/aims/agent.json"
+        documents = {url: make_document(DID, public_key)}
+        clock = FakeClock()
+        calls: list[httpx.Request] = []
+        resolver = DIDResolver(
+            transport=make_transport(documents, calls, "max-age=10"), clock=clock, ttl=1000
+        )
+
+        async with resolver:
+            await resolver.resolve(DID)
+            clock.now = 9
+            await resolver.resolve(DID)
+            clock.now = 11
+            await resolver.resolve(DID)
+        assert len(calls) == 2
+
+        calls.clear()
+        resolver = DIDResolver(transport=make_transport(documents, calls, "no-store"))
+        async with resolver:
+            await resolver.resolve(DID)
+            await resolver.resolve(DID)
+        assert len(calls) == 2
+
+    async def test_key_method_needs_no_network(self):
+        """did:aims:key documents are derived from the embedded multikey."""
+        _, public_key = generate_keypair()
+        did = f"did:aims:key:{encode_ed25519_multikey(public_key)}:agent"
+        transport = httpx.MockTransport(lambda request: pytest.fail("unexpected request"))
+
+        async with DIDResolver(transport=transport) as resolver:
+            assert await resolver.public_key(did) == public_key
+
+    async def test_resolved_key_verifies_manifest(self):
+        """The resolved key checks a manifest signed by the DID's owner."""
+        private_key, public_key = generate_keypair()
+        did = f"did:aims:key:{encode_ed25519_multikey(public_key)}:agent"
+        manifest = AIManifest(did=did)
+        manifest.sign(private_key)
+
+        async with DIDResolver() as resolver:
+            assert manifest.verify(await resolver.public_key(did))
+
+    async def test_resolution_errors(self):
+        """Missing documents, mismatched ids and unknown methods raise."""
+        _, public_key = generate_keypair()
+        url = "https://example.com/.well-known/aims/agent.json"
+        documents = {url: make_document("did:aims:web:evil.com:agent", public_key)}
+
+        async with DIDResolver(transport=make_transport(documents, [])) as resolver:
+            with pytest.raises(DIDResolutionError, match="not"):
+                await resolver.resolve(DID)
+            with pytest.raises(DIDResolutionError, match="No DID Document"):
+                await resolver.resolve("did:aims:web:example.com:other")
+            with pytest.raises(DIDResolutionError, match="Unsupported DID method"):
+                await resolver.resolve("did:aims:ion:example.com:agent")
+
+    async def test_custom_method(self):
+        """Registered methods take over resolution for their DID method."""
+        _, public_key = generate_keypair()
+        did = "did:aims:test:example.com:agent"
+        resolver = DIDResolver()
+
+        async def resolve_test(resolver, parsed):
+            return DIDDocument.model_validate(make_document(str(parsed), public_key)), None
+
+        resolver.register("test", resolve_test)
+
+        assert await resolver.public_key(did) == public_key
@@ -0,0 +1,137 @@
+"""Tests for revocation sync."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from openattribution.aims import AIManifest, ManifestCache, ManifestStore
+from openattribution.aims.revocation import (
+    RevocationList,
+    RevocationSync,
+    decode_digests,
+    encode_digests,
+    revocation_digest,
+)
+from openattribution.aims.server import create_app
+
+DID = "did:aims:web:example.com:agent"
+OTHER = "did:aims:web:other.com:agent"
+
+
+def make_store(app, **options) -> ManifestStore:
+    """A store client wired to an in-process server with a revocation list."""
+    return ManifestStore(
+        "http://store.test",
+        transport=httpx.ASGITransport(app=app),
+        revocations=RevocationList(),
+        **options,
+    )
+
+
+class TestRevocationList:
+    """Tests for RevocationList."""
+
+    def test_digest_encoding_round_trip(self):
+        """Digests survive the base64url wire encoding, including the top bit."""
+        digests = [0, 1, 2**63, 2**64 - 1, revocation_digest(DID)]
+
+        assert decode_digests(encode_digests(digests)) == sorted(digests)
+        with pytest.raises(ValueError):
+            decode_digests("AAAA")
+
+    def test_apply_delta_and_full(self):
+        """Deltas add and remove entries; full snapshots replace the set."""
+        revocations = RevocationList()
+        revocations.apply(
+            {"version": 1, "full": True, "added": encode_digests([revocation_digest(DID)])}
+        )
+        assert revocations.is_revoked(DID)
+
+        changed = revocations.apply(
+            {
+                "version": 2,
+                "added": encode_digests([revocation_digest(OTHER)]),
+                "removed": encode_digests([revocation_digest(DID)]),
+            }
+        )
+
+        assert changed == 2
+        assert revocations.version == 2
+        assert not revocations.is_revoked(DID)
+        assert OTHER in revocations
+
+    def test_content_hash_revocation(self):
+        """A revoked manifest version is caught by its content hash."""
+        manifest = AIManifest(did=DID)
+        revocations = RevocationList()
+        revocations.revoke(manifest.content_hash)
+
+        assert revocations.is_revoked(DID, manifest.content_hash)
+        assert not revocations.is_revoked(DID)
+
+
+class TestRevocationServer:
+    """Tests for the reference server's revocation log."""
+
+    def test_delta_since_version(self):
+        """Only changes after the given version are sent, folded per entry."""
+        app = create_app()
+        repository = app.repository
+        first = repository.revoke(DID)
+        repository.revoke(OTHER)
+        repository.revoke(OTHER, revoked=False)
+
+        full = repository.revocations_since(0)
+        delta = repository.revocations_since(first)
+
+        assert full["full"] and decode_digests(full["added"]) == [revocation_digest(DID)]
+        assert not delta["full"]
+        assert decode_digests(delta["added"]) == []
+        assert decode_digests(delta["removed"]) == [revocation_digest(OTHER)]
+
+    async def test_store_sync_and_verify(self):
+        """verify() turns False once a revocation of the cached version is synced."""
+        app = create_app()
+        manifest = AIManifest(did=DID)
+        app.repository.publish(manifest)
+        cache = ManifestCache()
+        calls = []
+        store = make_store(app, cache=cache)
+        store.client.event_hooks["request"].append(lambda request: _record(calls, request))
+
+        async with store:
+            assert await store.sync_revocations() == 0
+            assert await store.verify(DID)
+            response = await store.client.post(
+                "http://store.test/revocations", json={"entry": manifest.content_hash}
+            )
+            assert response.status_code == 201
+            assert await store.sync_revocations() == 1
+            assert not await store.verify(DID)
+            assert await store.sync_revocations() == 0
+
+        gets = [c for c in calls if c.method == "GET" and c.url.path.startswith("/manifests")]
+        assert len(gets) == 2  # the revoked cache entry was dropped and refetched once
+        syncs = [c for c in calls if c.method == "GET" and c.url.path == "/revocations"]
+        assert [c.url.params["since"] for c in syncs] == ["0", "0", "1"]
+
+    async def test_background_sync(self):
+        """RevocationSync applies new revocations on its schedule."""
+        app = create_app()
+        store = make_store(app)
+
+        async with store, RevocationSync(store, interval=0.01) as sync:
+            app.repository.revoke(DID)
+            for _ in range(100):
+                if store.revocations.is_revoked(DID):
+                    break
+                await asyncio.sleep(0.01)
+            assert sync.running
+
+        assert store.revocations.is_revoked(DID)
+        assert not sync.running
+
+
+async def _record(calls: list, request: httpx.Request) -> None:
+    calls.append(request)
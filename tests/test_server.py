@@ -0,0 +1,280 @@
+"""Tests for the reference manifest store server."""
+
+import asyncio
+import threading
+
+import httpx
+
+from openattribution.aims import AIManifest, ManifestCache, ManifestStore
+from openattribution.aims.server import ManifestRepository, ManifestStoreApp, create_app
+
+DID = "did:aims:web:example.com:agent"
+
+
+def make_client(app: ManifestStoreApp) -> httpx.AsyncClient:
+    """Build an HTTP client that talks to the app in-process."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://store.test")
+
+
+class TestManifestRepository:
+    """Tests for ManifestRepository storage."""
+
+    def test_versions_are_appended_on_change(self):
+        """Each changed publish adds a version; history keeps the old ones."""
+        repository = ManifestRepository()
+        first = repository.publish(AIManifest(did=DID, model_card_url="https://example.com/v1"))
+        second = repository.publish(AIManifest(did=DID, model_card_url="https://example.com/v2"))
+
+        assert (first.version, second.version) == (1, 2)
+        assert repository.latest(DID) == second
+        assert repository.version(DID, 1) == first
+        assert [v.hash for v in repository.history(DID)] == [first.hash, second.hash]
+
+    def test_republishing_same_content_is_idempotent(self):
+        """Publishing the current content again does not add a version."""
+        repository = ManifestRepository()
+        manifest = AIManifest(did=DID)
+        first = repository.publish(manifest)
+
+        assert repository.publish(manifest) == first
+        assert len(repository.history(DID)) == 1
+
+    def test_identical_content_is_stored_once(self):
+        """Blobs are deduplicated by content hash."""
+        repository = ManifestRepository()
+        manifest = AIManifest(did=DID, model_card_url="https://example.com/v1")
+        repository.publish(manifest)
+        repository.publish(AIManifest(did=DID, model_card_url="https://example.com/v2"))
+        repository.publish(manifest)
+
+        connection = repository._connection()
+        assert connection.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 2
+        assert connection.execute("SELECT COUNT(*) FROM versions").fetchone()[0] == 3
+        assert repository.by_hash(manifest.content_hash).version == 1
+
+    def test_signature_change_is_a_new_version(self):
+        """Adding a signature to unchanged content appends a version holding it."""
+        repository = ManifestRepository()
+        manifest = AIManifest(did=DID)
+        unsigned = repository.publish(manifest)
+        signed = manifest.model_copy(update={"signature": "ed25519:c2lnbmF0dXJl"})
+
+        stored = repository.publish(signed)
+
+        assert stored.version == 2
+        assert stored.hash == unsigned.hash
+        assert stored.body_hash != unsigned.body_hash
+        assert AIManifest.model_validate_json(repository.latest(DID).body).signature == (
+            signed.signature
+        )
+        assert repository.publish(signed) == stored
+
+    def test_read_racing_a_publish_does_not_cache_stale_version(self):
+        """A read that fetched before a publish committed cannot reinstate the old version."""
+        repository = ManifestRepository()
+        repository.publish(AIManifest(did=DID, model_card_url="https://example.com/v1"))
+        repository._hot.clear()
+        fetch = repository._fetch
+
+        def fetch_then_publish(where, params):
+            stored = fetch(where, params)
+            repository._fetch = fetch
+            repository.publish(AIManifest(did=DID, model_card_url="https://example.com/v2"))
+            return stored
+
+        repository._fetch = fetch_then_publish
+
+        assert repository.latest(DID).version == 1
+        assert repository.latest(DID).version == 2
+
+    def test_lru_can_be_disabled(self):
+        """With hot_entries=0 every read goes to the database."""
+        repository = ManifestRepository(hot_entries=0)
+        repository.publish(AIManifest(did=DID))
+
+        assert repository.latest(DID).version == 1
+        assert not repository._hot
+
+    def test_on_disk_database_persists(self, tmp_path):
+        """A file-backed repository is readable after reopening, from any thread."""
+        path = tmp_path / "store.db"
+        stored = ManifestRepository(path).publish(AIManifest(did=DID))
+        reopened = ManifestRepository(path)
+        results = []
+
+        thread = threading.Thread(target=lambda: results.append(reopened.latest(DID)))
+        thread.start()
+        thread.join()
+
+        assert results == [stored]
+        assert reopened._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+class TestManifestStoreApp:
+    """Tests for the ASGI routes."""
+
+    async def test_store_client_round_trip(self):
+        """ManifestStore publishes to and resolves from the app."""
+        app = create_app()
+        store = ManifestStore("http://store.test", transport=httpx.ASGITransport(app=app))
+        manifest = AIManifest(did=DID, model_card_url="https://example.com/card")
+
+        async with store:
+            assert await store.publish(manifest) == DID
+            resolved = await store.resolve(DID)
+
+        assert resolved is not None
+        assert resolved.content_hash == manifest.content_hash
+
+    async def test_etag_revalidation(self):
+        """Cached clients revalidate with If-None-Match and get a 304."""
+        app = create_app()
+        app.repository.publish(AIManifest(did=DID))
+        cache = ManifestCache(ttl=0)
+        store = ManifestStore(
+            "http://store.test", transport=httpx.ASGITransport(app=app), cache=cache
+        )
+
+        async with store:
+            first = await store.resolve(DID)
+            second = await store.resolve(DID)
+
+        assert second == first
+        assert cache.get(DID) is not None
+
+    async def test_not_modified(self):
+        """A matching If-None-Match returns 304 without a body."""
+        app = create_app()
+        stored = app.repository.publish(AIManifest(did=DID))
+
+        async with make_client(app) as client:
+            response = await client.get(
+                f"/manifests/{DID}", headers={"If-None-Match": f'"{stored.body_hash}"'}
+            )
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    async def test_versions_and_hash_routes(self):
+        """History, specific versions and hash lookups are served."""
+        app = create_app()
+        first = app.repository.publish(AIManifest(did=DID, model_card_url="https://example.com/v1"))
+        app.repository.publish(AIManifest(did=DID, model_card_url="https://example.com/v2"))
+
+        async with make_client(app) as client:
+            history = (await client.get(f"/manifests/{DID}/versions")).json()
+            version = await client.get(f"/manifests/{DID}/versions/1")
+            by_hash = await client.get(f"/hashes/{first.hash}")
+            missing = await client.get(f"/manifests/{DID}/versions/3")
+
+        assert [v["version"] for v in history["versions"]] == [1, 2]
+        assert version.json()["model_card_url"] == "https://example.com/v1"
+        assert version.headers["x-aims-version"] == "1"
+        assert by_hash.content == first.body
+        assert missing.status_code == 404
+
+    async def test_concurrent_reads_leave_event_loop_free(self):
+        """Repository reads run in worker threads, so concurrent GETs overlap."""
+        app = create_app()
+        app.repository.publish(AIManifest(did=DID))
+        both_reading = threading.Barrier(2, timeout=5)
+        latest = app.repository.latest
+
+        def blocking_latest(did):
+            both_reading.wait()
+            return latest(did)
+
+        app.repository.latest = blocking_latest
+
+        async with make_client(app) as client:
+            responses = await asyncio.gather(
+                client.get(f"/manifests/{DID}"), client.get(f"/manifests/{DID}")
+            )
+
+        assert [r.status_code for r in responses] == [200, 200]
+
+    async def test_invalid_manifest_rejected(self):
+        """Bodies that are not valid manifests get a 422."""
+        app = create_app()
+
+        async with make_client(app) as client:
+            response = await client.post("/manifests", json={"name": "no did"})
+            missing = await client.get(f"/manifests/{DID}")
+
+        assert response.status_code == 422
+        assert missing.status_code == 404
+
+
+class TestPatchRoutes:
+    """Tests for delta publishing and version patches."""
+
+    async def patch(self, client, ops, base: str | None, **headers) -> httpx.Response:
+        """PATCH the test DID with ``ops`` against ``base``."""
+        headers = {"content-type": "application/json-patch+json", **headers}
+        if base is not None:
+            headers["if-match"] = f'"{base}"'
+        return await client.patch(f"/manifests/{DID}", json=ops, headers=headers)
+
+    async def test_patch_appends_version(self):
+        """A patch against the latest version is applied and stored as a new version."""
+        app = create_app()
+        first = app.repository.publish(AIManifest(did=DID))
+        ops = [{"op": "replace", "path": "/model_card_url", "value": "https://example.com/v2"}]
+
+        async with make_client(app) as client:
+            response = await self.patch(client, ops, first.body_hash)
+
+        latest = app.repository.latest(DID)
+        assert response.status_code == 200
+        assert response.json() == {"did": DID, "version": 2, "hash": latest.hash}
+        assert AIManifest.model_validate_json(latest.body).model_card_url.endswith("/v2")
+
+    async def test_patch_preconditions(self):
+        """Stale bases, missing If-Match, bad hashes and broken patches are refused."""
+        app = create_app()
+        first = app.repository.publish(AIManifest(did=DID))
+        app.repository.publish(AIManifest(did=DID, model_card_url="https://example.com/v2"))
+        current = app.repository.latest(DID).body_hash
+        ops = [{"op": "replace", "path": "/model_card_url", "value": "https://example.com/v3"}]
+
+        async with make_client(app) as client:
+            stale = await self.patch(client, ops, first.body_hash)
+            unconditional = await self.patch(client, ops, None)
+            wrong_hash = await self.patch(client, ops, current, **{"x-aims-entity-hash": "x"})
+            broken = await self.patch(client, [{"op": "remove", "path": "/nope"}], current)
+            invalid = await self.patch(client, [{"op": "remove", "path": "/did"}], current)
+            unknown = await client.patch(
+                "/manifests/did:aims:web:other.com:agent",
+                json=ops,
+                headers={"content-type": "application/json-patch+json", "if-match": "*"},
+            )
+            wrong_type = await client.patch(f"/manifests/{DID}", json=ops)
+
+        assert stale.status_code == 412
+        assert unconditional.status_code == 428
+        assert wrong_hash.status_code == 409
+        assert broken.status_code == 409
+        assert invalid.status_code == 422
+        assert unknown.status_code == 404
+        assert wrong_type.status_code == 415
+        assert app.repository.latest(DID).version == 2
+
+    async def test_version_patch_and_since(self):
+        """Version patches reproduce the later version; since filters history."""
+        app = create_app()
+        manifest = AIManifest(did=DID)
+        first = app.repository.publish(manifest)
+        second = app.repository.publish(
+            manifest.model_copy(update={"model_card_url": "https://example.com/v2"})
+        )
+
+        async with make_client(app) as client:
+            delta = (await client.get(f"/manifests/{DID}/versions/2/patch?from=1")).json()
+            since = (await client.get(f"/manifests/{DID}/versions?since=1")).json()
+
+        assert delta["hash"] == second.hash
+        assert delta["patch"] == [
+            {"op": "replace", "path": "/model_card_url", "value": "https://example.com/v2"}
+        ]
+        assert [v["version"] for v in since["versions"]] == [2]
+        assert first.version == 1
@@ -0,0 +1,301 @@
+"""Tests for the manifest store client."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from openattribution.aims import AIManifest, ManifestStore
+from openattribution.aims.layers import ContentAccessLayer
+from openattribution.aims.server import create_app
+from openattribution.aims.wire import CBOR_MEDIA_TYPE
+
+DID = "did:aims:web:example.com:agent"
+
+
+def make_transport(manifests: dict[str, dict], calls: list[httpx.Request]) -> httpx.MockTransport:
+    """Build an in-process stand-in store backed by a dict."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.method == "POST" and request.url.path == "/manifests":
+            data = json.loads(request.content)
+            manifests[data["did"]] = data
+            return httpx.Response(201, json={"did": data["did"]})
+        did = request.url.path.removeprefix("/manifests/")
+        if did in manifests:
+            return httpx.Response(200, json=manifests[did])
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+class TestManifestStore:
+    """Tests for ManifestStore class."""
+
+    async def test_publish_and_resolve(self):
+        """Published manifests resolve back from the store."""
+        calls: list[httpx.Request] = []
+        store = ManifestStore("https://store.test/", transport=make_transport({}, calls))
+
+        async with store:
+            assert await store.publish(AIManifest(did=DID)) == DID
+            manifest = await store.resolve(DID)
+
+        assert manifest is not None
+        assert manifest.did == DID
+        assert [c.method for c in calls] == ["POST", "GET"]
+
+    async def test_resolve_missing_returns_none(self):
+        """Unknown DIDs resolve to None."""
+        store = ManifestStore("https://store.test", transport=make_transport({}, []))
+
+        async with store:
+            assert await store.resolve(DID) is None
+            assert await store.verify(DID) is False
+
+    async def test_resolve_server_error_raises(self):
+        """Non-404 errors propagate as HTTP errors."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(500))
+        store = ManifestStore("https://store.test", transport=transport)
+
+        async with store:
+            with pytest.raises(httpx.HTTPStatusError):
+                await store.resolve(DID)
+
+    async def test_client_is_shared_across_calls(self):
+        """Every request goes through one pooled client."""
+        manifests = {DID: AIManifest(did=DID).model_dump(mode="json")}
+        store = ManifestStore("https://store.test", transport=make_transport(manifests, []))
+
+        async with store:
+            client = store.client
+            await store.resolve(DID)
+            await store.verify(DID)
+            assert store.client is client
+
+    async def test_context_manager_closes_pool(self):
+        """Leaving the context closes the pool; the store can be reopened."""
+        store = ManifestStore("https://store.test", transport=make_transport({}, []))
+
+        async with store:
+            client = store.client
+        assert client.is_closed
+
+        assert await store.resolve(DID) is None
+        assert store.client is not client
+        await store.aclose()
+
+
+class TestBulkOperations:
+    """Tests for resolve_many, publish_many and request coalescing."""
+
+    async def test_concurrent_resolves_are_coalesced(self):
+        """Simultaneous resolves of one DID share a single request."""
+        calls: list[httpx.Request] = []
+        body = AIManifest(did=DID).model_dump_json()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, content=body)
+
+        async with ManifestStore(
+            "https://store.test", transport=httpx.MockTransport(handler)
+        ) as store:
+            results = await asyncio.gather(*(store.resolve(DID) for _ in range(20)))
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    async def test_resolve_many_reports_errors_per_did(self):
+        """A failing DID does not abort the batch."""
+        manifests = {DID: AIManifest(did=DID).model_dump(mode="json")}
+        transport = make_transport(manifests, [])
+        broken = "did:aims:web:example.com:broken"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("broken"):
+                return httpx.Response(500)
+            return transport.handle_request(request)
+
+        missing = "did:aims:web:example.com:missing"
+        async with ManifestStore(
+            "https://store.test", transport=httpx.MockTransport(handler)
+        ) as store:
+            results = {r.did: r async for r in store.resolve_many([DID, broken, missing])}
+
+        assert results[DID].ok and results[DID].manifest.did == DID
+        assert results[missing].ok and results[missing].manifest is None
+        assert not results[broken].ok
+        assert isinstance(results[broken].error, httpx.HTTPStatusError)
+
+    async def test_resolve_many_bounds_concurrency(self):
+        """No more than `concurrency` requests are in flight."""
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return httpx.Response(404)
+
+        dids = [f"did:aims:web:example.com:agent-{i}" for i in range(50)]
+        async with ManifestStore(
+            "https://store.test", transport=httpx.MockTransport(handler)
+        ) as store:
+            results = [r async for r in store.resolve_many(dids, concurrency=4)]
+
+        assert len(results) == 50
+        assert peak == 4
+
+    async def test_publish_many(self):
+        """Manifests are published in bulk."""
+        manifests: dict[str, dict] = {}
+        store = ManifestStore("https://store.test", transport=make_transport(manifests, []))
+        batch = [AIManifest(did=f"did:aims:web:example.com:agent-{i}") for i in range(10)]
+
+        async with store:
+            results = [r async for r in store.publish_many(batch, concurrency=3)]
+
+        assert all(r.ok for r in results)
+        assert set(manifests) == {m.did for m in batch}
+
+    async def test_invalid_concurrency_raises(self):
+        """Concurrency must be positive."""
+        store = ManifestStore("https://store.test", transport=make_transport({}, []))
+
+        with pytest.raises(ValueError, match="concurrency"):
+            async for _ in store.resolve_many([DID], concurrency=0):
+                pass
+
+
+class TestDeltaPublishing:
+    """Tests for publish_delta and version history against the reference server."""
+
+    @staticmethod
+    def large_manifest() -> AIManifest:
+        """A manifest big enough that a one-source patch is worth sending."""
+        sources = [f"source:publisher-{i}" for i in range(200)]
+        return AIManifest(did=DID, content_access=ContentAccessLayer(licensed_sources=sources))
+
+    @staticmethod
+    def recording_store(app, calls: list[httpx.Request], **options) -> ManifestStore:
+        """A store client over the app that records every request."""
+        transport = httpx.ASGITransport(app=app)
+
+        class Recording(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request):
+                calls.append(request)
+                return await transport.handle_async_request(request)
+
+        return ManifestStore("http://store.test", transport=Recording(), **options)
+
+    async def test_sends_patch_after_publish(self):
+        """An edit after a publish is sent as a small patch and stored in full."""
+        app, calls = create_app(), []
+        manifest = self.large_manifest()
+        async with self.recording_store(app, calls) as store:
+            await store.publish(manifest)
+            manifest.content_access.licensed_sources.append("source:new")
+            manifest.invalidate_content_hash()
+            await store.publish_delta(manifest)
+
+        assert [c.method for c in calls] == ["POST", "PATCH"]
+        assert len(calls[1].content) < len(calls[0].content) / 20
+        latest = app.repository.latest(DID)
+        assert (latest.version, latest.hash) == (2, manifest.content_hash)
+
+    async def test_signature_only_patch(self):
+        """A delta that only adds a signature is stored as a new version."""
+        app, calls = create_app(), []
+        manifest = self.large_manifest()
+        signed = manifest.model_copy(update={"signature": "ed25519:c2lnbmF0dXJl"})
+        async with self.recording_store(app, calls) as store:
+            await store.publish(manifest)
+            await store.publish_delta(signed)
+            await store.publish_delta(signed.model_copy(update={"signature": "ed25519:b3RoZXI="}))
+
+        assert [c.method for c in calls] == ["POST", "PATCH", "PATCH"]
+        assert calls[2].headers["if-match"] == f'"{signed.entity_hash}"'
+        latest = app.repository.latest(DID)
+        assert (latest.version, latest.hash) == (3, manifest.content_hash)
+        assert AIManifest.model_validate_json(latest.body).signature == "ed25519:b3RoZXI="
+
+    async def test_conflict_falls_back_to_full_publish(self):
+        """A patch against a superseded version is replaced by a full publish."""
+        app, calls = create_app(), []
+        stale = self.large_manifest()
+        app.repository.publish(stale.model_copy(update={"model_card_url": "https://other.com"}))
+        manifest = stale.model_copy(update={"model_card_url": "https://example.com/v2"})
+
+        async with self.recording_store(app, calls) as store:
+            await store.publish_delta(manifest, base=stale)
+            with pytest.raises(httpx.HTTPStatusError):
+                await store.publish_delta(
+                    manifest.model_copy(update={"version": "2"}), base=stale, fallback=False
+                )
+
+        assert [(c.method, c.url.path) for c in calls] == [
+            ("PATCH", f"/manifests/{DID}"),
+            ("POST", "/manifests"),
+            ("PATCH", f"/manifests/{DID}"),
+        ]
+        assert app.repository.latest(DID).hash == manifest.content_hash
+
+    async def test_unsupported_store_publishes_in_full(self):
+        """A store without PATCH support is detected once."""
+        calls: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(405 if request.method == "PATCH" else 201, json={})
+
+        manifest = self.large_manifest()
+        async with ManifestStore(
+            "http://store.test", transport=httpx.MockTransport(handler)
+        ) as store:
+            await store.publish(manifest)
+            await store.publish_delta(manifest.model_copy(update={"version": "2"}))
+            await store.publish_delta(manifest.model_copy(update={"version": "3"}))
+
+        assert [c.method for c in calls] == ["POST", "PATCH", "POST", "POST"]
+
+    async def test_resolve_history_uses_patches(self):
+        """Later versions are fetched as patches and match the stored versions."""
+        app, calls = create_app(), []
+        manifest = self.large_manifest()
+        for i in range(3):
+            manifest = manifest.model_copy(update={"model_card_url": f"https://example.com/v{i}"})
+            app.repository.publish(manifest)
+
+        async with self.recording_store(app, calls) as store:
+            chain = [item async for item in store.resolve_history(DID)]
+            versions = await store.history(DID, since=2)
+            second = await store.resolve_version(DID, 2)
+            missing = await store.resolve_version(DID, 9)
+
+        assert [(v.version, m.content_hash) for v, m in chain] == [
+            (v.version, v.hash) for v in app.repository.history(DID)
+        ]
+        assert [c.url.path.endswith("/patch") for c in calls[1:4]] == [False, True, True]
+        assert [v.version for v in versions] == [3]
+        assert second.model_card_url == "https://example.com/v1"
+        assert missing is None
+
+    async def test_resolve_history_negotiates_binary(self):
+        """Full versions in a history walk are fetched and decoded like resolves."""
+        app, calls = create_app(), []
+        manifest = self.large_manifest()
+        for i in range(2):
+            manifest = manifest.model_copy(update={"model_card_url": f"https://example.com/v{i}"})
+            app.repository.publish(manifest)
+
+        async with self.recording_store(app, calls, binary=True) as store:
+            chain = [item async for item in store.resolve_history(DID)]
+
+        assert calls[1].headers["accept"].startswith(CBOR_MEDIA_TYPE)
+        assert [m.content_hash for _, m in chain] == [v.hash for v in app.repository.history(DID)]
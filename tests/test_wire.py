@@ -0,0 +1,246 @@
+"""Tests for the binary wire format and content negotiation."""
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from openattribution.aims import AIManifest, ManifestCache, ManifestStore
+from openattribution.aims.crypto import generate_keypair
+from openattribution.aims.layers import ContentAccessLayer, FoundationLayer
+from openattribution.aims.layers.content_access import LicensedSource, RedistributionPolicy
+from openattribution.aims.layers.foundation import DatasetReference
+from openattribution.aims.server import create_app
+from openattribution.aims.wire import (
+    CBOR_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MAX_NESTING,
+    STRING_TABLE_V1,
+    WireFormatError,
+    decode_manifest,
+    decode_value,
+    encode_manifest,
+    encode_value,
+    negotiate,
+)
+
+DID = "did:aims:web:example.com:agent"
+PRIVATE_KEY, PUBLIC_KEY = generate_keypair()
+
+
+def make_manifest() -> AIManifest:
+    """A signed manifest with detailed lists and non-ASCII text."""
+    manifest = AIManifest(
+        did=DID,
+        foundation=FoundationLayer(
+            training_datasets=["dataset:books"],
+            dataset_details=[DatasetReference(identifier="dataset:books", license="CC-BY-4.0")],
+            licensing_summary="Licensed corpora — naïve résumé ✓",
+        ),
+        content_access=ContentAccessLayer(
+            source_details=[
+                LicensedSource(identifier=f"source:{i}", license_type="granted", scope="full")
+                for i in range(30)
+            ],
+            redistribution_policy=RedistributionPolicy.ATTRIBUTED,
+        ),
+    )
+    manifest.sign(PRIVATE_KEY)
+    return manifest
+
+
+def _field_names(model: type[BaseModel]) -> set[str]:
+    names = set(model.model_fields)
+    for field in model.model_fields.values():
+        for arg in (field.annotation, *getattr(field.annotation, "__args__", ())):
+            if isinstance(arg, type) and issubclass(arg, BaseModel):
+                names |= _field_names(arg)
+    return names
+
+
+class TestCodec:
+    """Tests for encoding and decoding."""
+
+    def test_manifest_round_trip_keeps_hash_and_signature(self):
+        """Decoding yields the same data model, content hash and valid signature."""
+        manifest = make_manifest()
+        decoded = decode_manifest(encode_manifest(manifest))
+
+        assert decoded.model_dump(mode="json") == manifest.model_dump(mode="json")
+        assert decoded.content_hash == manifest.content_hash
+        assert decoded.verify(PUBLIC_KEY)
+
+    def test_smaller_than_json(self):
+        """Interned keys and values make the binary form smaller than JSON."""
+        manifest = make_manifest()
+
+        assert len(encode_manifest(manifest)) < len(manifest.model_dump_json()) * 0.7
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            0,
+            23,
+            24,
+            255,
+            65_536,
+            2**64 - 1,
+            -1,
+            -(2**64),
+            1.5,
+            True,
+            False,
+            None,
+            "",
+            "x" * 300,
+            "summary_only",
+            [],
+            {"scope": "full", "custom": ["a", {"b": None}]},
+        ],
+    )
+    def test_value_round_trip(self, value):
+        """Every JSON value kind round-trips, with and without interning."""
+        assert decode_value(encode_value(value)) == value
+
+    def test_every_schema_field_is_interned(self):
+        """All manifest field names and enum values are in the string table."""
+        table = set(STRING_TABLE_V1)
+
+        assert _field_names(AIManifest) <= table
+        assert {policy.value for policy in RedistributionPolicy} <= table
+        assert len(table) == len(STRING_TABLE_V1)
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            b"",
+            b"\x81\x01",
+            b"\x82\x02\xf6",
+            b"\x82\x01\x63ab",
+            b"\x82\x01\xc6\x18\xff",
+            b"\x82\x01\xf6\x00",
+        ],
+    )
+    def test_malformed_payloads(self, payload):
+        """Truncation, unknown tables and trailing bytes raise WireFormatError."""
+        with pytest.raises(WireFormatError):
+            decode_value(payload)
+
+    def test_nesting_limit(self):
+        """Nesting up to MAX_NESTING decodes; deeper payloads raise WireFormatError."""
+        value = None
+        for _ in range(MAX_NESTING):
+            value = [value]
+
+        assert decode_value(encode_value(value)) == value
+        with pytest.raises(WireFormatError, match="nested too deeply"):
+            decode_value(encode_value([value]))
+        with pytest.raises(WireFormatError, match="nested too deeply"):
+            decode_value(b"\x82\x01" + b"\xa1\x00" * 100_000 + b"\xf6")
+
+
+class TestNegotiation:
+    """Tests for Accept header negotiation."""
+
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            (None, JSON_MEDIA_TYPE),
+            ("*/*", JSON_MEDIA_TYPE),
+            (CBOR_MEDIA_TYPE, CBOR_MEDIA_TYPE),
+            (f"{CBOR_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.5", CBOR_MEDIA_TYPE),
+            (f"{CBOR_MEDIA_TYPE};q=0.2, {JSON_MEDIA_TYPE}", JSON_MEDIA_TYPE),
+            (f"{CBOR_MEDIA_TYPE};q=0", JSON_MEDIA_TYPE),
+        ],
+    )
+    def test_negotiate(self, accept, expected):
+        """Binary is chosen only when explicitly preferred."""
+        assert negotiate(accept) == expected
+
+
+class TestBinaryStore:
+    """Tests for ManifestStore and the server speaking the binary format."""
+
+    async def test_publish_and_resolve(self):
+        """A binary client publishes and resolves without touching JSON."""
+        app = create_app()
+        manifest = make_manifest()
+        calls = []
+
+        async def record(response: httpx.Response) -> None:
+            calls.append((response.request.headers.get("content-type"), response.headers))
+
+        async with ManifestStore(
+            "http://store.test", transport=httpx.ASGITransport(app=app), binary=True
+        ) as store:
+            store.client.event_hooks["response"].append(record)
+            await store.publish(manifest)
+            resolved = await store.resolve(DID)
+
+        assert resolved.content_hash == manifest.content_hash
+        assert resolved.verify(PUBLIC_KEY)
+        assert calls[0][0] == CBOR_MEDIA_TYPE
+        assert calls[1][1]["content-type"] == CBOR_MEDIA_TYPE
+        assert app.repository.latest(DID).hash == manifest.content_hash
+
+    async def test_json_server_fallback(self):
+        """Against a JSON-only store, publish retries as JSON and resolve parses JSON."""
+        manifest = make_manifest()
+        posts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                posts.append(request.headers["content-type"])
+                if request.headers["content-type"] != JSON_MEDIA_TYPE:
+                    return httpx.Response(415)
+                return httpx.Response(201)
+            return httpx.Response(200, content=manifest.model_dump_json())
+
+        async with ManifestStore(
+            "http://store.test", transport=httpx.MockTransport(handler), binary=True
+        ) as store:
+            await store.publish(manifest)
+            await store.publish(manifest)
+            resolved = await store.resolve(DID)
+
+        assert posts == [CBOR_MEDIA_TYPE, JSON_MEDIA_TYPE, JSON_MEDIA_TYPE]
+        assert resolved.content_hash == manifest.content_hash
+
+    async def test_disk_cache_keeps_binary_bodies(self, tmp_path):
+        """Binary responses are cached on disk and reload after a restart."""
+        app = create_app()
+        manifest = make_manifest()
+        app.repository.publish(manifest)
+        transport = httpx.ASGITransport(app=app)
+
+        cache = ManifestCache(disk_path=tmp_path)
+        async with ManifestStore(
+            "http://store.test", transport=transport, cache=cache, binary=True
+        ) as store:
+            await store.resolve(DID)
+        assert cache.get(DID).media_type == CBOR_MEDIA_TYPE
+
+        entry = ManifestCache(disk_path=tmp_path).get(DID)
+        assert entry.media_type == CBOR_MEDIA_TYPE
+        assert entry.content_hash == manifest.content_hash
+
+    async def test_server_rejects_unknown_media_type(self):
+        """The server answers 415 for bodies it cannot parse and 400 for bad or deep CBOR."""
+        app = create_app()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://store.test"
+        ) as client:
+            unsupported = await client.post(
+                "/manifests", content=b"x", headers={"content-type": "text/plain"}
+            )
+            malformed = await client.post(
+                "/manifests", content=b"\x82\x01", headers={"content-type": CBOR_MEDIA_TYPE}
+            )
+            nested = await client.post(
+                "/manifests",
+                content=b"\x82\x01" + b"\x81" * 100_000 + b"\xf6",
+                headers={"content-type": CBOR_MEDIA_TYPE},
+            )
+
+        assert unsupported.status_code == 415
+        assert malformed.status_code == 400
+        assert nested.status_code == 400